@@ -0,0 +1,129 @@
+"""Batch processing of saved articles, spread over a pool of processes.
+
+Usage (from the repository's root directory):
+    python -m articles_processor.batch_processor INPUT [INPUT ...] [--output-dir DIR] [--workers N]
+
+Each INPUT is either an HTML file or a directory (all its `*.htm` / `*.html` files are processed);
+`@list.txt` reads the inputs from a file (one per line). For each article `DIR/<stem>.txt` is written
+(the same as `processor.py` writes), followed by a summary of the `DataError`s in `DIR/summary.txt`.
+Parsed articles are cached in `DIR/cache` (see `ResultCache`), so re-exporting the same pages is fast.
+"""
+import argparse
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+from articles_processor.parser_types import DataError
+from articles_processor.parsers.base_parser import Tokenizer
+from articles_processor.processing import format_article, load_template, parse_file
+from articles_processor.result_cache import ResultCache
+
+input_suffixes: Set[str] = {'.htm', '.html'}
+
+
+@dataclass
+class ArticleResult:
+    input_file_path: Path
+    output_file_path: Optional[Path] = None
+    errors: Set[DataError] = field(default_factory=set)
+    failure: Optional[str] = None
+    "The exception which prevented processing the article (if any)."
+
+
+def gather_input_files(inputs: Iterable[Path]) -> List[Path]:
+    input_file_paths: List[Path] = []
+    for input_path in inputs:
+        if input_path.is_dir():
+            input_file_paths.extend(sorted(p for p in input_path.iterdir() if p.suffix.lower() in input_suffixes))
+        else:
+            input_file_paths.append(input_path)
+    return input_file_paths
+
+
+def process_article(input_file_path: Path, output_dir: Path, template: str, early_exit: bool = False,
+                    cache_dir: Optional[Path] = None, tokenizer: Tokenizer = Tokenizer.HTML_PARSER) -> ArticleResult:
+    try:
+        cache = ResultCache(cache_dir) if cache_dir is not None else None
+        output = parse_file(input_file_path, early_exit=early_exit, cache=cache, tokenizer=tokenizer)
+
+        output_file_path = output_dir / f"{input_file_path.stem}.txt"
+        with open(output_file_path, "w", encoding="UTF-8") as f:
+            f.write(format_article(output, template))
+    except Exception as e:
+        return ArticleResult(input_file_path=input_file_path, failure=f"{type(e).__name__}: {e}")
+
+    return ArticleResult(input_file_path=input_file_path, output_file_path=output_file_path,
+                         errors=set(output.errors))
+
+
+def init_worker(log_level: int) -> None:
+    # Workers started with the spawn / forkserver method don't inherit the parent's logging configuration.
+    logging.getLogger().setLevel(log_level)
+
+
+def process_articles(input_file_paths: List[Path], output_dir: Path, workers: Optional[int] = None,
+                     early_exit: bool = False, cache_dir: Optional[Path] = None,
+                     tokenizer: Tokenizer = Tokenizer.HTML_PARSER,
+                     log_level: int = logging.CRITICAL) -> List[ArticleResult]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    template = load_template()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(log_level,)) as executor:
+        return list(executor.map(process_article, input_file_paths, repeat(output_dir), repeat(template),
+                                 repeat(early_exit), repeat(cache_dir), repeat(tokenizer)))
+
+
+def summarize(results: List[ArticleResult], elapsed: float) -> str:
+    error_counts: Counter = Counter(error for result in results for error in result.errors)
+    failures = [result for result in results if result.failure]
+
+    lines = [
+        f"Articles: {len(results)} (processed: {len(results) - len(failures)}, failed: {len(failures)})",
+        f"Time: {elapsed:.2f} s ({len(results) / elapsed if elapsed else 0:.1f} articles/s)",
+        "",
+        "Data errors:",
+    ]
+    lines += [f"  {error.name}: {error_counts[error]}" for error in DataError if error_counts[error]] or ["  --"]
+    lines += ["", "Articles with data errors:"]
+    lines += [f"  {result.input_file_path.name}: {', '.join(sorted(e.name for e in result.errors))}"
+              for result in results if result.errors] or ["  --"]
+    lines += ["", "Failed articles:"]
+    lines += [f"  {result.input_file_path.name}: {result.failure}" for result in failures] or ["  --"]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arg_parser = argparse.ArgumentParser(prog='batch_processor', fromfile_prefix_chars='@',
+                                         description="Process saved articles in parallel.")
+    arg_parser.add_argument('inputs', nargs='+', type=Path, help="HTML files or directories with HTML files")
+    arg_parser.add_argument('--output-dir', type=Path, default=Path("output"))
+    arg_parser.add_argument('--workers', type=int, default=None, help="number of processes (default: CPU count)")
+    arg_parser.add_argument('--early-exit', action='store_true',
+                            help="stop parsing each page once its content has been gathered")
+    arg_parser.add_argument('--cache-dir', type=Path, default=None, help="default: <output-dir>/cache")
+    arg_parser.add_argument('--no-cache', dest='use_cache', action='store_false')
+    arg_parser.add_argument('--tokenizer', choices=[t.name.lower() for t in Tokenizer],
+                            default=Tokenizer.HTML_PARSER.name.lower())
+    args = arg_parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    cache_dir: Optional[Path] = (args.cache_dir or args.output_dir / "cache") if args.use_cache else None
+
+    input_file_paths = gather_input_files(args.inputs)
+    start_time = time.perf_counter()
+    results = process_articles(input_file_paths, args.output_dir, workers=args.workers, early_exit=args.early_exit,
+                               cache_dir=cache_dir, tokenizer=Tokenizer[args.tokenizer.upper()])
+    summary = summarize(results, elapsed=time.perf_counter() - start_time)
+
+    with open(args.output_dir / "summary.txt", "w", encoding="UTF-8") as f:
+        f.write(summary + "\n")
+    print(summary)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Detection of the page's charset from its raw bytes (so that the page is decoded exactly once).
+
+The sources are checked in the order of precedence defined by the HTML standard: byte order mark, HTTP
+`Content-Type` header, `<meta>` declaration within the first `sniff_size` bytes and, finally, the default charset
+(UTF-8, unless the bytes are not valid UTF-8).
+"""
+import codecs
+import re
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Optional, Pattern, Tuple
+
+sniff_size: int = 8 * 1024
+"Number of leading bytes searched for the `<meta>` charset declaration."
+
+default_charset: str = 'utf-8'
+fallback_charset: str = 'iso-8859-2'
+"Charset assumed for undeclared pages which are not valid UTF-8."
+
+boms: Tuple[Tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+meta_charset_pattern: Pattern = re.compile(rb"""<meta\s[^>]*?charset\s*=\s*["']?\s*(?P<charset>[\w\-.:]+)""",
+                                           re.IGNORECASE)
+header_charset_pattern: Pattern = re.compile(r"""charset\s*=\s*["']?(?P<charset>[\w\-.:]+)""", re.IGNORECASE)
+
+
+class CharsetSource(Enum):
+    BOM = auto()
+    HTTP_HEADER = auto()
+    META = auto()
+    DEFAULT = auto()
+
+
+@dataclass(frozen=True)
+class DetectedCharset:
+    charset: str
+    source: CharsetSource
+    bom_length: int = 0
+    "Number of leading bytes taken by the byte order mark (to be skipped when decoding)."
+
+
+def normalize_charset(charset: str) -> Optional[str]:
+    """Lowercase name of the charset (`None` if Python has no codec for it)."""
+    charset = charset.strip().lower()
+    try:
+        codecs.lookup(charset)
+    except LookupError:
+        return None
+    return charset
+
+
+def is_valid_utf8_prefix(data: bytes) -> bool:
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(data, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def detect_charset(head: bytes, content_type: Optional[str] = None) -> DetectedCharset:
+    """Charset of the page, given its first (at least `sniff_size`) bytes and the HTTP `Content-Type` header."""
+    for bom, charset in boms:
+        if head.startswith(bom):
+            return DetectedCharset(charset, CharsetSource.BOM, bom_length=len(bom))
+
+    if content_type and (m := header_charset_pattern.search(content_type)):
+        if charset := normalize_charset(m.group('charset')):
+            return DetectedCharset(charset, CharsetSource.HTTP_HEADER)
+
+    for m in meta_charset_pattern.finditer(head, 0, sniff_size):
+        if charset := normalize_charset(m.group('charset').decode('ascii')):
+            # A page declaring UTF-16 in ASCII-compatible bytes can't really be UTF-16.
+            return DetectedCharset('utf-8' if charset.startswith('utf-16') else charset, CharsetSource.META)
+
+    charset = default_charset if is_valid_utf8_prefix(head) else fallback_charset
+    return DetectedCharset(charset, CharsetSource.DEFAULT)
+
+
+def decode_page(data: bytes, content_type: Optional[str] = None) -> Tuple[str, DetectedCharset]:
+    """Decode the whole page (once) with the detected charset.
+
+    An undeclared page which is valid UTF-8 only within the first `sniff_size` bytes is decoded with the fallback
+    charset.
+    """
+    detected = detect_charset(data[:sniff_size], content_type=content_type)
+    try:
+        return str(data[detected.bom_length:], detected.charset), detected
+    except UnicodeDecodeError:
+        if detected.source is not CharsetSource.DEFAULT or detected.charset == fallback_charset:
+            raise
+        detected = DetectedCharset(fallback_charset, CharsetSource.DEFAULT)
+        return str(data, fallback_charset), detected
@@ -0,0 +1,223 @@
+"""Fetching pages over HTTP(S).
+
+- connections are kept alive and reused (one per host) by a `Fetcher`,
+- compressed responses (`gzip`, `deflate` and - if the `brotli` module is installed - `br`) are decompressed,
+- responses are cached on disk and revalidated with conditional requests (`If-None-Match` / `If-Modified-Since`),
+- the fetched bytes are kept, so decoding them with another charset never requires downloading the page again.
+"""
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import os
+import ssl
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from articles_processor.charset import decode_page
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+default_user_agent: str = "Magic Browser"
+accept_encoding: str = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+redirect_statuses = {301, 302, 303, 307, 308}
+
+ConnectionKey = Tuple[str, str, int]
+"(scheme, host, port)"
+
+
+class FetchError(Exception):
+    def __init__(self, url: str, status: int, reason: str = ""):
+        super().__init__(f"HTTP {status}{f' {reason}' if reason else ''} for {url}")
+        self.url: str = url
+        self.status: int = status
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    "The final URL (after redirects)."
+    status: int
+    headers: Dict[str, str]
+    "Response headers (with lowercase names)."
+    content: bytes
+    "The body (decompressed)."
+    from_cache: bool = False
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return self.headers.get('content-type')
+
+    def decode(self, charset: Optional[str] = None) -> str:
+        """The page decoded with the given charset or the detected one (see `detect_charset()`)."""
+        if charset is not None:
+            return self.content.decode(charset)
+        return decode_page(self.content, content_type=self.content_type)[0]
+
+    def open(self) -> BinaryIO:
+        return io.BytesIO(self.content)
+
+
+def decompress(content: bytes, content_encoding: Optional[str]) -> bytes:
+    if not content_encoding:
+        return content
+    # Encodings are listed in the order they were applied.
+    for encoding in reversed([e.strip().lower() for e in content_encoding.split(",")]):
+        if encoding in ('gzip', 'x-gzip'):
+            content = gzip.decompress(content)
+        elif encoding == 'deflate':
+            try:
+                content = zlib.decompress(content)
+            except zlib.error:
+                # Some servers send a raw deflate stream (without the zlib header).
+                content = zlib.decompress(content, -zlib.MAX_WBITS)
+        elif encoding == 'br' and brotli is not None:
+            content = brotli.decompress(content)
+        elif encoding not in ('', 'identity'):
+            raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
+    return content
+
+
+class HttpCache:
+    """Fetched pages stored on disk: `<key>.json` (URL, status and headers) and `<key>.body` (the content)."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir: Path = cache_dir
+
+    def get_entry_paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def load(self, url: str) -> Optional[FetchedPage]:
+        meta_path, body_path = self.get_entry_paths(url)
+        try:
+            with open(meta_path, encoding="UTF-8") as f:
+                meta = json.load(f)
+            content = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return FetchedPage(url=meta['url'], status=meta['status'], headers=meta['headers'], content=content,
+                           from_cache=True)
+
+    def store(self, requested_url: str, page: FetchedPage) -> None:
+        meta_path, body_path = self.get_entry_paths(requested_url)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for path, data in [(body_path, page.content),
+                           (meta_path, json.dumps({'url': page.url, 'status': page.status,
+                                                   'headers': page.headers}).encode("UTF-8"))]:
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+
+class Fetcher:
+    """HTTP(S) client keeping one persistent connection per host.
+
+    Use as a context manager (or call `close()`) to close the connections.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, user_agent: str = default_user_agent, timeout: float = 30,
+                 max_redirects: int = 5):
+        self.cache: Optional[HttpCache] = HttpCache(cache_dir) if cache_dir is not None else None
+        "Cache of the fetched pages (no caching if `None`)."
+        self.user_agent: str = user_agent
+        self.timeout: float = timeout
+        self.max_redirects: int = max_redirects
+        self.connections: Dict[ConnectionKey, http.client.HTTPConnection] = {}
+        self.ssl_context: ssl.SSLContext = ssl.create_default_context()
+
+    def get_connection(self, key: ConnectionKey) -> Tuple[http.client.HTTPConnection, bool]:
+        """The connection for the host and whether it has already been used."""
+        if (connection := self.connections.get(key)) is not None:
+            return connection, True
+
+        scheme, host, port = key
+        if scheme == 'https':
+            connection = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self.ssl_context)
+        elif scheme == 'http':
+            connection = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        else:
+            raise ValueError(f"Unsupported URL scheme: {scheme}")
+        self.connections[key] = connection
+        return connection, False
+
+    def drop_connection(self, key: ConnectionKey) -> None:
+        if (connection := self.connections.pop(key, None)) is not None:
+            connection.close()
+
+    def request(self, url: str, headers: Dict[str, str]) -> Tuple[int, str, Dict[str, str], bytes]:
+        parts = urlsplit(url)
+        key: ConnectionKey = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        while True:
+            connection, is_reused = self.get_connection(key)
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.drop_connection(key)
+                if is_reused:
+                    # The server has closed the idle connection - retry once with a new one.
+                    continue
+                raise
+            except Exception:
+                self.drop_connection(key)
+                raise
+            break
+
+        if response.will_close:
+            self.drop_connection(key)
+        return (response.status, response.reason,
+                {name.lower(): value for name, value in response.getheaders()}, body)
+
+    def fetch(self, url: str) -> FetchedPage:
+        cached: Optional[FetchedPage] = self.cache.load(url) if self.cache is not None else None
+
+        headers = {'User-Agent': self.user_agent, 'Accept-Encoding': accept_encoding}
+        if cached is not None:
+            if etag := cached.headers.get('etag'):
+                headers['If-None-Match'] = etag
+            if last_modified := cached.headers.get('last-modified'):
+                headers['If-Modified-Since'] = last_modified
+
+        current_url = url
+        for _ in range(self.max_redirects + 1):
+            status, reason, response_headers, body = self.request(current_url, headers)
+            if status in redirect_statuses and 'location' in response_headers:
+                current_url = urljoin(current_url, response_headers['location'])
+                continue
+            break
+        else:
+            raise FetchError(url, status, "too many redirects")
+
+        if status == 304 and cached is not None:
+            return cached
+        if status >= 400:
+            raise FetchError(current_url, status, reason)
+
+        content = decompress(body, response_headers.pop('content-encoding', None))
+        response_headers.pop('content-length', None)
+        response_headers.pop('transfer-encoding', None)
+        page = FetchedPage(url=current_url, status=status, headers=response_headers, content=content)
+        if self.cache is not None and status == 200:
+            self.cache.store(url, page)
+        return page
+
+    def close(self) -> None:
+        for key in list(self.connections):
+            self.drop_connection(key)
+
+    def __enter__(self) -> 'Fetcher':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,159 @@
+"""Tokenising with libxml2's HTML parser (via `lxml`) instead of `html.parser.HTMLParser`.
+
+The parser events are translated to the `HTMLParser` callbacks (`handle_starttag()`, `handle_startendtag()`,
+`handle_endtag()` and `handle_data()`), so that the same handlers process the document the same way:
+- a void element (`<br>`, `<img>`, `<meta>`, ...) is reported as `HTMLParser` reports it - as a start-end tag
+  if written as `<tag/>` and as a start tag (never closed) otherwise. libxml2 doesn't tell these apart, so
+  the void elements' tags are found in the document itself (see `VoidTagScanner`),
+- text is reported once per text node (libxml2 reports it in pieces), a comment separating two nodes.
+
+Unlike `HTMLParser`, libxml2 reports a well-formed tree: unclosed tags are closed and stray end tags are dropped.
+"""
+import re
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+from commons_lib.html_parser import void_elements
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+attrs_pattern: str = r"""(?:[^>"']|"[^"]*"|'[^']*')*"""
+
+
+class VoidTagScanner:
+    """Finds the void elements' tags in the (incrementally fed) document: their names and whether they are written
+    as `<tag/>`. Comments and the content of `<script>` / `<style>` (no tags for `HTMLParser`) are skipped.
+    """
+
+    start_pattern: re.Pattern = re.compile(
+        rf"<(?:!--|(?:script|style|{'|'.join(sorted(void_elements))})(?=[\s/>]))", re.IGNORECASE)
+    "Start of a comment, a raw-text element or a void element's tag."
+    construct_pattern: re.Pattern = re.compile(
+        rf"<!--.*?-->"
+        rf"|<(?P<raw>script|style){attrs_pattern}>.*?</(?P=raw)\s*>"
+        rf"|<(?P<void>{'|'.join(sorted(void_elements))})(?P<attrs>{attrs_pattern})>",
+        re.IGNORECASE | re.DOTALL)
+    unquoted_value_pattern: re.Pattern = re.compile(r"=\s*(?:[^\s\"'>][^\s>]*)?$")
+    "The end of an unquoted attribute value (`HTMLParser` takes a `/` ending it for a part of the value)."
+    max_partial_length: int = 8
+    "A `<` this close to the end of the fed data may start a tag whose name isn't complete yet."
+
+    def __init__(self):
+        self.buffer: str = ""
+        self.tags: Deque[Tuple[str, bool]] = deque()
+        "The tags found (and not taken yet): `(name, is_self_closing)`."
+
+    @classmethod
+    def is_self_closing(cls, attrs: str) -> bool:
+        attrs = attrs.rstrip()
+        return attrs.endswith('/') and not cls.unquoted_value_pattern.search(attrs, 0, len(attrs) - 1)
+
+    def feed(self, data: str, final: bool = False) -> None:
+        buffer = self.buffer + data
+        position = 0
+        while start := self.start_pattern.search(buffer, position):
+            if not (construct := self.construct_pattern.match(buffer, start.start())):
+                if not final:
+                    # Incomplete - wait for the rest.
+                    break
+                position = start.end()
+                continue
+            if (name := construct.group('void')) is not None:
+                self.tags.append((name.lower(), self.is_self_closing(construct.group('attrs'))))
+            position = construct.end()
+        else:
+            position = max(position, buffer.rfind('<', max(len(buffer) - self.max_partial_length, 0)))
+            if final:
+                position = len(buffer)
+        self.buffer = buffer[position:]
+
+    def take(self, name: str) -> bool:
+        """Whether the next tag of the void element (as reported by libxml2) is written as `<tag/>`."""
+        tags = self.tags
+        for i in range(min(len(tags), 8)):
+            if tags[i][0] == name:
+                for _ in range(i):
+                    tags.popleft()
+                return tags.popleft()[1]
+        # Not found (e.g., a tag inserted by libxml2).
+        return False
+
+
+class HTMLParserTarget:
+    """lxml parser target calling the `HTMLParser` callbacks of the handler."""
+
+    def __init__(self, handler, void_tags: VoidTagScanner):
+        self.handler = handler
+        self.void_tags: VoidTagScanner = void_tags
+        self.data_chunks: List[str] = []
+
+    def flush_data(self) -> None:
+        if self.data_chunks:
+            data = "".join(self.data_chunks)
+            self.data_chunks = []
+            self.handler.handle_data(data)
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        self.flush_data()
+        if tag in void_elements and self.void_tags.take(tag):
+            self.handler.handle_startendtag(tag, list(attrib.items()))
+        else:
+            self.handler.handle_starttag(tag, list(attrib.items()))
+
+    def end(self, tag: str) -> None:
+        self.flush_data()
+        if tag not in void_elements:
+            self.handler.handle_endtag(tag)
+
+    def data(self, data: str) -> None:
+        self.data_chunks.append(data)
+
+    def comment(self, text: str) -> None:
+        self.flush_data()
+
+    def close(self) -> None:
+        self.flush_data()
+
+
+class LxmlTokenizer:
+    """Feeds the document (incrementally) to libxml2, which drives the handler's callbacks."""
+
+    max_pending_length: int = 16
+    "A `<` this close to the end of the fed data may start an incomplete tag (`</script` and `</style` are shorter)."
+
+    def __init__(self, handler):
+        if etree is None:
+            raise ImportError("The `lxml` tokenizer requires the `lxml` package")
+        self.void_tags: VoidTagScanner = VoidTagScanner()
+        # The document is already decoded - any charset it declares must be ignored.
+        self.parser = etree.HTMLParser(target=HTMLParserTarget(handler, self.void_tags), encoding='utf-8')
+        self.is_empty: bool = True
+        self.pending: str = ""
+        "The end of the fed data held back, as it may be an incomplete tag."
+
+    def feed(self, data: str) -> None:
+        if data:
+            self.is_empty = False
+            # The tags must be scanned before libxml2 reports them.
+            self.void_tags.feed(data)
+            data = self.pending + data
+            # libxml2 misses the end of a `<script>` / `<style>` if `</script>` is split between two chunks (and takes
+            # the rest of the document for the script), so a short incomplete tag is fed with the next chunk.
+            position = data.rfind('<', max(len(data) - self.max_pending_length, 0))
+            if position < 0 or '>' in data[position:]:
+                position = len(data)
+            self.pending = data[position:]
+            if position:
+                self.parser.feed(data[:position].encode('utf-8'))
+
+    def close(self) -> None:
+        # libxml2 fails on an empty document.
+        if not self.is_empty:
+            self.void_tags.feed("", final=True)
+            if self.pending:
+                self.parser.feed(self.pending.encode('utf-8'))
+                self.pending = ""
+            self.parser.close()
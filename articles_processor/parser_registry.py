@@ -0,0 +1,113 @@
+"""Choosing the parser of a page based on the declarations found in its `<head>`.
+
+Each site parser declares the hosts (`site_hosts`) and/or application names (`site_application_names`) of its pages
+and is registered in `default_parser_registry`; the page's `<head>` is scanned once and the extracted values are
+looked up in the registry's tables.
+"""
+import html
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Pattern, Type
+from urllib.parse import urlsplit
+
+from articles_processor.parsers.agora_parser import WyborczaHTMLParser, WysokieObcasyHTMLParser
+from articles_processor.parsers.base_parser import ArticleHTMLParser
+from articles_processor.parsers.okopress_parser import OKOPressHTMLParser
+from articles_processor.parsers.onet_parser import OnetHTMLParser
+from articles_processor.parsers.pap_parser import PapHTMLParser
+from articles_processor.parsers.polityka_parser import PolitykaHTMLParser
+from articles_processor.parsers.rzeczpospolita_parser import RzeczpospolitaHTMLParser
+from articles_processor.parsers.wiez_parser import WiezHTMLParser
+
+head_tag_pattern: Pattern = re.compile(r"<(?:(?P<tag>link|meta)\s(?P<attrs>[^>]*)>|/head\s*>)", re.IGNORECASE)
+attr_pattern: Pattern = re.compile(r"""(?P<name>[\w\-:]+)\s*=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\s"'>]+))""")
+refresh_url_pattern: Pattern = re.compile(r"url\s*=\s*['\"]?(?P<url>[^'\"\s]+)", re.IGNORECASE)
+
+
+@dataclass
+class HeadInfo:
+    """Declarations from the `<head>` identifying the page."""
+    canonical_url: Optional[str] = None
+    refresh_url: Optional[str] = None
+    "Target of `<meta http-equiv=\"Refresh\">` (e.g., on pages redirecting to the full article)."
+    application_name: Optional[str] = None
+
+
+def parse_head_attrs(attrs_str: str) -> Dict[str, str]:
+    return {m.group('name').lower(): html.unescape(m.group('dq') or m.group('sq') or m.group('bare') or "")
+            for m in attr_pattern.finditer(attrs_str)}
+
+
+def sniff_head(page: str) -> HeadInfo:
+    """Extract `HeadInfo` in a single pass over `<link>` and `<meta>` tags, stopping at `</head>`."""
+    head_info = HeadInfo()
+    for m in head_tag_pattern.finditer(page):
+        tag = m.group('tag')
+        if tag is None:
+            break
+
+        attrs = parse_head_attrs(m.group('attrs'))
+        if tag.lower() == 'link':
+            if head_info.canonical_url is None and attrs.get('rel', "").lower() == 'canonical':
+                head_info.canonical_url = attrs.get('href')
+        elif attrs.get('name', "").lower() == 'application-name':
+            head_info.application_name = head_info.application_name or attrs.get('content')
+        elif attrs.get('http-equiv', "").lower() == 'refresh':
+            if head_info.refresh_url is None and (m_url := refresh_url_pattern.search(attrs.get('content', ""))):
+                head_info.refresh_url = m_url.group('url')
+    return head_info
+
+
+class ParserRegistry:
+    """Parser classes indexed by their sites' hosts and application names."""
+
+    def __init__(self, parser_classes: Iterable[Type[ArticleHTMLParser]] = ()):
+        self.parsers_by_host: Dict[str, Type[ArticleHTMLParser]] = {}
+        self.parsers_by_application_name: Dict[str, Type[ArticleHTMLParser]] = {}
+        for parser_class in parser_classes:
+            self.register(parser_class)
+
+    def register(self, parser_class: Type[ArticleHTMLParser]) -> Type[ArticleHTMLParser]:
+        for host in parser_class.site_hosts:
+            if (registered := self.parsers_by_host.get(host.lower())) is not None:
+                raise ValueError(f"Host `{host}` already registered for {registered.__name__}")
+            self.parsers_by_host[host.lower()] = parser_class
+        for application_name in parser_class.site_application_names:
+            if (registered := self.parsers_by_application_name.get(application_name)) is not None:
+                raise ValueError(f"Application name `{application_name}` already registered for {registered.__name__}")
+            self.parsers_by_application_name[application_name] = parser_class
+        return parser_class
+
+    def find_by_url(self, url: Optional[str]) -> Optional[Type[ArticleHTMLParser]]:
+        """Parser registered for the URL's host or for any of its parent domains."""
+        if not url:
+            return None
+        host: str = (urlsplit(url.strip()).hostname or "").lower()
+        while host:
+            if (parser_class := self.parsers_by_host.get(host)) is not None:
+                return parser_class
+            host = host.partition('.')[2]
+        return None
+
+    def find(self, head_info: HeadInfo) -> Optional[Type[ArticleHTMLParser]]:
+        return (self.find_by_url(head_info.canonical_url)
+                or self.find_by_url(head_info.refresh_url)
+                or self.parsers_by_application_name.get(head_info.application_name))
+
+    def get_parser_class(self, page: str) -> Type[ArticleHTMLParser]:
+        """Parser class for the page (only its `<head>` is scanned)."""
+        if (parser_class := self.find(sniff_head(page))) is None:
+            raise NotImplementedError("No parser matching the content!")
+        return parser_class
+
+
+default_parser_registry = ParserRegistry([
+    WyborczaHTMLParser,
+    WysokieObcasyHTMLParser,
+    PolitykaHTMLParser,
+    OKOPressHTMLParser,
+    WiezHTMLParser,
+    RzeczpospolitaHTMLParser,
+    PapHTMLParser,
+    OnetHTMLParser,
+])
@@ -2,7 +2,9 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime, date
 from enum import Enum, auto
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set
+
+from articles_processor.profiling import ProfileReport
 
 dummy_date = date(9999, 1, 1)
 
@@ -14,6 +16,46 @@ class DataError(Enum):
     NO_PUB_DATE = auto()
 
 
+class ContentBuffer:
+    """Article's content built from chunks, which are joined only when the whole text is needed."""
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.last_char: str = ""
+        "The last character of the content (an empty string if there is no content yet)."
+
+    def append(self, s: str) -> None:
+        if s:
+            self.chunks.append(s)
+            self.last_char = s[-1]
+
+    def __iadd__(self, s: str) -> 'ContentBuffer':
+        self.append(s)
+        return self
+
+    def __bool__(self) -> bool:
+        return bool(self.last_char)
+
+    def endswith(self, suffix: str) -> bool:
+        if len(suffix) == 1:
+            return self.last_char == suffix
+
+        tail: str = ""
+        for chunk in reversed(self.chunks):
+            tail = chunk + tail
+            if len(tail) >= len(suffix):
+                break
+        return tail.endswith(suffix)
+
+    def getvalue(self) -> str:
+        value = "".join(self.chunks)
+        self.chunks = [value] if value else []
+        return value
+
+    def __str__(self):
+        return self.getvalue()
+
+
 @dataclass
 class OutputData:
     title: str = ""
@@ -29,6 +71,8 @@ class OutputData:
     "Kto jest autorem oryginalnej informacji?"
     content: str = ""
     "Content of the article"
+    content_buffer: ContentBuffer = field(default_factory=ContentBuffer, repr=False, compare=False)
+    "Content of the article while it is being built (joined into `content` once parsing is finished)."
     metadata: Dict[str, dict] = field(default_factory=dict)
     """A dictionary of <script type="application/ld+json"> tags.
     `@type` value is a key and the whole dictionary is the value.
@@ -37,6 +81,8 @@ class OutputData:
     "Article's URL."
     links: List[str] = field(default_factory=list)
     errors: Set[DataError] = field(default_factory=set)
+    profile: Optional[ProfileReport] = field(default=None, repr=False, compare=False)
+    "Timings of the parser's hooks (only if the parser was profiled, see `ParserProfiler`)."
 
     def print(self, full: bool) -> str:
         links_str: str = ''.join(
@@ -2,9 +2,9 @@ import json
 import re
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import ClassVar, List
+from typing import ClassVar, Tuple
 
-from articles_processor.parsers.base_parser import ArticleHTMLParser, TagData, TagStatus
+from articles_processor.parsers.base_parser import ArticleHTMLParser, TagData, TagStatus, heading_tags
 
 
 class AgoraHTMLParser(ArticleHTMLParser, ABC):
@@ -42,7 +42,7 @@ class AgoraHTMLParser(ArticleHTMLParser, ABC):
         raise NotImplementedError
 
     def is_header(self, tag_data: TagData) -> bool:
-        return (re.fullmatch(r"h\d", tag_data.tag)
+        return (tag_data.tag in heading_tags
                 and 'class' in tag_data.attrs
                 and self.get_header_class() in tag_data.attrs['class'])
 
@@ -73,18 +73,18 @@ class AgoraHTMLParser(ArticleHTMLParser, ABC):
         is_social_media_link: bool = (self.is_embedded_text()
                                       and current_tag.tag == 'a' and 'href' in current_tag.attrs)
         if is_social_media_link:
-            self.output.content += f"EMBED:\n{current_tag.attrs['href']}\n\n"
+            self.output.content_buffer += f"EMBED:\n{current_tag.attrs['href']}\n\n"
 
         if self.is_question(current_tag):
-            self.output.content += self.quote_marker
+            self.output.content_buffer += self.quote_marker
 
     def process_endtag(self):
         last_tag = self.tag_hierarchy[-1].td
         if self.is_content():
             if self.is_text_paragraph(last_tag) or self.is_question(last_tag):
-                self.output.content += '\n\n'
+                self.output.content_buffer += '\n\n'
             if self.is_block_quote(last_tag):
-                self.output.content += '\n'
+                self.output.content_buffer += '\n'
 
     def process_data(self):
         last_tag = self.tag_hierarchy[-1].td
@@ -93,57 +93,61 @@ class AgoraHTMLParser(ArticleHTMLParser, ABC):
 
         if self.is_content():
             if any(last_tag.data.startswith(s) for s in ['CZTAJ TAKŻE:', 'POLECAMY']):
-                self.tag_hierarchy[-1].status = TagStatus.IGNORED
+                self.set_tag_status(self.tag_hierarchy[-1], TagStatus.IGNORED)
                 return
 
             if self.is_text_paragraph(last_tag) or self.is_question(last_tag):
-                self.output.content += last_tag.cleaned_data
+                self.output.content_buffer += last_tag.cleaned_data
                 return
 
             if self.is_block_quote(last_tag):
-                self.output.content += re.sub(r"^\n\s+", "", last_tag.cleaned_data)
+                self.output.content_buffer += re.sub(r"^\n\s+", "", last_tag.cleaned_data)
                 return
 
             if self.is_header(last_tag):
                 # is_isolated_header: bool = last_tag.cleaned_data[-1] in ".?!"
                 # if is_isolated_header:
-                #     self.output.content += self.header_marker
-                self.output.content += self.header_marker
-                self.output.content += last_tag.cleaned_data.rstrip()
-                self.output.content += "\n\n"  # if is_isolated_header else " "
+                #     self.output.content_buffer += self.header_marker
+                self.output.content_buffer += self.header_marker
+                self.output.content_buffer += last_tag.cleaned_data.rstrip()
+                self.output.content_buffer += "\n\n"  # if is_isolated_header else " "
                 return
 
             if last_tag.tag == 'a':
                 if self.is_link_to_another_article(last_tag):
                     href: str = last_tag.attrs['href']
                     self.output.links.append(re.sub("#.*$", "", href))
-                    self.output.content += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
+                    self.output.content_buffer += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
                 else:
-                    self.output.content += last_tag.cleaned_data
+                    self.output.content_buffer += last_tag.cleaned_data
                 return
 
             self.check_ignored_tag(last_tag, last_tag.data)
 
-    tags_to_ignore_recursively: ClassVar[List[TagData]] = [
+    tags_to_ignore_recursively: ClassVar[Tuple[TagData, ...]] = (
         TagData(tag='span', attrs={'class': 'banLabel'}),
         TagData(tag='div', attrs={'id': '-ADBOARD-'}),
-    ]
+    )
 
-    tags_to_ignore_individually: ClassVar[List[TagData]] = [
+    tags_to_ignore_individually: ClassVar[Tuple[TagData, ...]] = (
         # TagData(tag='h2', attrs={}),
         # TagData(tag='div', attrs={'class': 'quote-socials'}),
-    ]
+    )
 
-    def get_tags_to_ignore(self) -> List[TagData]:
+    tags_with_suppressed_validation: ClassVar[Tuple[TagData, ...]] = (
+        TagData(tag='div', attrs={'class': 'article--content'}),
+        TagData(tag='div', attrs={'class': 'paywall'}),
+    )
+
+    @classmethod
+    def get_tags_to_ignore(cls) -> Tuple[TagData, ...]:
         return (super().get_tags_to_ignore()
                 + AgoraHTMLParser.tags_to_ignore_recursively
                 + AgoraHTMLParser.tags_to_ignore_individually)
 
-    def get_tags_with_suppressed_validation(self) -> List[TagData]:
-        return super().get_tags_with_suppressed_validation() + [
-            TagData(tag='div', attrs={'class': 'article--content'}),
-            TagData(tag='div', attrs={'class': 'paywall'}),
-        ]
+    @classmethod
+    def get_tags_with_suppressed_validation(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_with_suppressed_validation() + AgoraHTMLParser.tags_with_suppressed_validation
 
     def feed(self, data: str) -> None:
         super().feed(data)
@@ -162,6 +166,8 @@ class AgoraHTMLParser(ArticleHTMLParser, ABC):
 
 
 class WysokieObcasyHTMLParser(AgoraHTMLParser):
+    site_hosts: ClassVar[Tuple[str, ...]] = ('www.wysokieobcasy.pl',)
+
     @staticmethod
     def is_contnet_tag(tag_data: TagData) -> bool:
         return (tag_data.tag == 'div'
@@ -193,21 +199,26 @@ class WysokieObcasyHTMLParser(AgoraHTMLParser):
     def get_text_link_class() -> str:
         return 'art_link'
 
-    tags_to_ignore: ClassVar[List[TagData]] = [
+    tags_to_ignore: ClassVar[Tuple[TagData, ...]] = (
         TagData(tag='div', attrs={'id': 'adUnit-'}),
         TagData(tag='div', attrs={'class': 'art_embed'}),
         TagData(tag='span', attrs={'class': 'imageUOM'}),
-    ]
+    )
+
+    tags_with_suppressed_validation: ClassVar[Tuple[TagData, ...]] = (
+        TagData(tag='div', attrs={'id': 'wo_article_body'}),
+        TagData(tag='div', attrs={'class': 'paywall'}),
+        TagData(tag='section', attrs={'class': 'art_content', 'itemprop': 'articleSection'}),
+    )
 
-    def get_tags_to_ignore(self) -> List[TagData]:
+    @classmethod
+    def get_tags_to_ignore(cls) -> Tuple[TagData, ...]:
         return super().get_tags_to_ignore() + WysokieObcasyHTMLParser.tags_to_ignore
 
-    def get_tags_with_suppressed_validation(self) -> List[TagData]:
-        return super().get_tags_with_suppressed_validation() + [
-            TagData(tag='div', attrs={'id': 'wo_article_body'}),
-            TagData(tag='div', attrs={'class': 'paywall'}),
-            TagData(tag='section', attrs={'class': 'art_content', 'itemprop': 'articleSection'}),
-        ]
+    @classmethod
+    def get_tags_with_suppressed_validation(cls) -> Tuple[TagData, ...]:
+        return (super().get_tags_with_suppressed_validation()
+                + WysokieObcasyHTMLParser.tags_with_suppressed_validation)
 
     def should_stop_processing(self) -> bool:
         last_tag = self.tag_hierarchy[-1].td
@@ -217,6 +228,8 @@ class WysokieObcasyHTMLParser(AgoraHTMLParser):
 
 
 class WyborczaHTMLParser(AgoraHTMLParser):
+    site_hosts: ClassVar[Tuple[str, ...]] = ('wyborcza.pl',)
+
     @staticmethod
     def is_contnet_tag(tag_data: TagData) -> bool:
         return (tag_data.tag == 'div'
@@ -243,30 +256,34 @@ class WyborczaHTMLParser(AgoraHTMLParser):
     def get_text_link_class() -> str:
         return 'text--link'
 
-    tags_to_ignore_recursively: ClassVar[List[TagData]] = [
+    tags_to_ignore_recursively: ClassVar[Tuple[TagData, ...]] = (
         TagData(tag='div', attrs={'class': 'adview'}),
         TagData(tag='div', attrs={'class': 'text--embed'}),
         # TagData(tag='div', attrs={'class': 'text--photo'}),
         TagData(tag='div', attrs={'class': 'container mt+++'}),
-    ]
+    )
 
-    tags_to_ignore_individually: ClassVar[List[TagData]] = [
+    tags_to_ignore_individually: ClassVar[Tuple[TagData, ...]] = (
         # TagData(tag='h2', attrs={}),
         # TagData(tag='div', attrs={'class': 'quote-socials'}),
-    ]
+    )
+
+    tags_with_suppressed_validation: ClassVar[Tuple[TagData, ...]] = (
+        TagData(tag='div', attrs={'class': 'text--photo'}),
+        TagData(tag='figure', attrs={'class': 'a-image'}),
+        TagData(tag='span', attrs={'class': 'text--photo-title'}),
+        TagData(tag='span', attrs={'class': 'text--photo-author'}),
+    )
 
-    def get_tags_to_ignore(self) -> List[TagData]:
+    @classmethod
+    def get_tags_to_ignore(cls) -> Tuple[TagData, ...]:
         return (super().get_tags_to_ignore()
                 + WyborczaHTMLParser.tags_to_ignore_recursively
                 + WyborczaHTMLParser.tags_to_ignore_individually)
 
-    def get_tags_with_suppressed_validation(self) -> List[TagData]:
-        return super().get_tags_with_suppressed_validation() + [
-            TagData(tag='div', attrs={'class': 'text--photo'}),
-            TagData(tag='figure', attrs={'class': 'a-image'}),
-            TagData(tag='span', attrs={'class': 'text--photo-title'}),
-            TagData(tag='span', attrs={'class': 'text--photo-author'}),
-        ]
+    @classmethod
+    def get_tags_with_suppressed_validation(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_with_suppressed_validation() + WyborczaHTMLParser.tags_with_suppressed_validation
 
     def should_stop_processing(self) -> bool:
         last_tag = self.tag_hierarchy[-1].td
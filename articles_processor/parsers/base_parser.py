@@ -2,44 +2,26 @@ import json
 import logging
 import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
 from datetime import datetime, date
 from enum import Enum, auto
-from html.parser import HTMLParser
-from typing import List, Dict, Tuple, Optional, ClassVar, Pattern, Union
+from functools import cache
+from typing import Any, Dict, Tuple, Optional, ClassVar
 
+from articles_processor.lxml_tokenizer import LxmlTokenizer
 from articles_processor.parser_types import OutputData
+from articles_processor.postprocessing import ContentRule, ContentPipeline, default_content_rules
+from articles_processor.profiling import ParserProfiler
+# The tag types (and the class-token rules) are re-exported for the site parsers.
+from commons_lib.html_parser import (BasicHTMLParser, TagClass, TagData, TagEntry, TagStatus, TagTracer,
+                                     heading_tags, matches_any)
 
 
-# from articles_processor.proc_logger import logger
-
-def clean_text(s: str) -> str:
-    s = s.replace(chr(0xa0), " ")
-    return s
-
-
-@dataclass
-class TagData:
-    tag: str
-    attrs: Optional[dict]
-    data: Optional[str] = None
-
-    @property
-    def cleaned_data(self) -> str:
-        return clean_text(self.data) if self.data else ""
-
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class TagStatus(Enum):
-    IGNORED = auto()
-    PROCESSED = auto()
-
-
-@dataclass
-class TagEntry:
-    td: TagData
-    status: TagStatus
-    tag_no: int
-    level: int
+# from articles_processor.proc_logger import logger
 
 
 class ListType(Enum):
@@ -51,16 +33,57 @@ def get_individual_attr_pattern(s: str):
     return re.compile(f"(?:^| ){s}(?: |$)")
 
 
-class ArticleHTMLParser(HTMLParser, ABC):
-    def __init__(self):
-        super().__init__()
+class Tokenizer(Enum):
+    HTML_PARSER = auto()
+    "`html.parser.HTMLParser` (pure Python)."
+    LXML = auto()
+    "libxml2's HTML parser (requires `lxml`, see `LxmlTokenizer`)."
+
+
+class EarlyExit(Exception):
+    """Raised from the tag handlers to stop tokenising the rest of the document (see `ArticleHTMLParser.early_exit`)."""
+    pass
+
+
+class ArticleHTMLParser(BasicHTMLParser, ABC):
+    def __init__(self, tracer: Optional[TagTracer] = None, early_exit: bool = False,
+                 profiler: Optional[ParserProfiler] = None, tokenizer: Tokenizer = Tokenizer.HTML_PARSER,
+                 bibliography_only: bool = False):
+        super().__init__(tracer=tracer)
+        self.lxml_tokenizer: Optional[LxmlTokenizer] = LxmlTokenizer(self) if tokenizer == Tokenizer.LXML else None
+        "Tokenizer driving the handlers instead of `HTMLParser` (if any)."
+        self.profiler: Optional[ParserProfiler] = None
+        "Profiling of the parser's hooks (disabled if `None`, see `set_profiler()`)."
+        self.early_exit: bool = early_exit
+        """Stop tokenising the document once processing is stopped (see `should_stop_processing()`)
+        and all `required_output_fields` are filled."""
+        self.bibliography_only: bool = bibliography_only
+        """Only the bibliography record (title, author, publication date and URL) is needed: the JSON-LD metadata
+        is reduced to `bibliography_json_ld_keys` and, once it supplies the whole record, the rest of the document
+        is discarded (see `has_json_ld_bibliography()`)."""
+        self.exited_early: bool = False
+        "The rest of the document is discarded (further chunks need not be fed at all)."
+        self.closed: bool = False
+        self.pending_data: str = ""
+        "The end of the fed data (from the last `<`), held back until the next chunk completes it."
         self.output = OutputData()
-        self.level: int = 0
-        self.tag_no = 0
-        self.tag_hierarchy: List[TagEntry] = []
-        self.stop_processing: bool = False
-        "No further tags should be (actively) processed."
+        self.content_ancestors: int = 0
+        "Number of entries in `tag_hierarchy` being content tags."
         self.list_type: Optional[ListType] = None
+        if profiler is not None:
+            self.set_profiler(profiler)
+
+    def set_profiler(self, profiler: ParserProfiler) -> None:
+        """Profile the parser's hooks (the report is attached to the output as `OutputData.profile`)."""
+        if self.profiler is not None:
+            raise ValueError("The parser is already profiled")
+        self.profiler = profiler
+        profiler.instrument(self)
+
+    site_hosts: ClassVar[Tuple[str, ...]] = ()
+    "Hosts (including their subdomains) of the pages handled by the parser (see `ParserRegistry`)."
+    site_application_names: ClassVar[Tuple[str, ...]] = ()
+    "Values of `<meta name=\"application-name\">` of the pages handled by the parser."
 
     header_marker: ClassVar[str] = '[HEADER] '
     quote_marker: ClassVar[str] = '[QUOTE] '
@@ -70,25 +93,27 @@ class ArticleHTMLParser(HTMLParser, ABC):
         ListType.UNORDERED: '*',
     }
 
-    def get_tags_to_ignore(self) -> List[TagData]:
-        return [
-            TagData(tag='img', attrs={}),
-            TagData(tag='button', attrs={}),
-            TagData(tag='figcaption', attrs={}),
-            TagData(tag='script', attrs={'type': 'text/javascript'}),
-            TagData(tag='script', attrs=None),
-            TagData(tag='picture', attrs=None),
-        ]
-
-    def get_tags_with_suppressed_validation(self) -> List[TagData]:
-        """Tags for which no 'unhandled' error should be issued."""
-        return [
-            TagData(tag='i', attrs={}),
-        ]
+    content_rules_by_default: ClassVar[Tuple[ContentRule, ...]] = default_content_rules
 
-    @staticmethod
-    def parse_attrs(attrs_as_list: List[Tuple]) -> Dict[str, str]:
-        return {k: v for k, v in attrs_as_list}
+    @classmethod
+    def get_content_rules(cls) -> Tuple[ContentRule, ...]:
+        """Rules applied (in order) to the article's content once parsing is finished."""
+        return ArticleHTMLParser.content_rules_by_default
+
+    @classmethod
+    @cache
+    def get_content_pipeline(cls) -> ContentPipeline:
+        return ContentPipeline(cls.get_content_rules())
+
+    required_output_fields: ClassVar[Tuple[str, ...]] = ('url', 'charset')
+    "`OutputData` fields which may still be filled once processing is stopped."
+
+    def is_output_complete(self) -> bool:
+        return all(getattr(self.output, name) for name in self.required_output_fields)
+
+    def check_early_exit(self) -> None:
+        if self.early_exit and self.stop_processing and self.is_output_complete():
+            raise EarlyExit
 
     @staticmethod
     @abstractmethod
@@ -97,58 +122,41 @@ class ArticleHTMLParser(HTMLParser, ABC):
 
     def is_content(self) -> bool:
         """Check whether the currently processed tag belongs to the article's content."""
-        return any(self.is_contnet_tag(te.td) for te in self.tag_hierarchy)
+        return self.content_ancestors > 0
+
+    def push_tag(self, entry: TagEntry) -> None:
+        entry.is_content_tag = self.is_contnet_tag(entry.td)
+        if entry.is_content_tag:
+            self.content_ancestors += 1
+        super().push_tag(entry)
+
+    def pop_tag(self) -> TagEntry:
+        entry = super().pop_tag()
+        if entry.is_content_tag:
+            self.content_ancestors -= 1
+        return entry
 
     def try_extract_charset(self, tag: str, attrs: Dict):
         if tag == "meta":
             if charset := attrs.get('charset'):
                 self.output.charset = charset.lower()
 
-    def handle_startendtag(self, tag, attrs):
-        self.tag_no += 1
-
-        tabs: str = "".join(self.level * ['  '])
-        status_str: str = "P"
-        logging.debug(f"{tabs}{tag}(/) <{status_str}> {self.parse_attrs(attrs)}")
-
-        current_tag = TagData(tag=tag, attrs=self.parse_attrs(attrs))
+    def dispatch_startendtag(self, current_tag: TagData) -> None:
+        tag = current_tag.tag
         if tag == 'link' and current_tag.attrs.get('rel') == 'canonical':
             self.output.url = current_tag.attrs['href']
         self.try_extract_charset(tag, current_tag.attrs)
 
         if tag == 'br':
-            self.output.content += '\n'
+            self.output.content_buffer += '\n'
             return
 
         self.process_startendtag(current_tag)
 
-    def process_startendtag(self, tag: TagData) -> None:
-        pass
-
-    def handle_starttag(self, tag, attrs):
-        super().handle_starttag(tag, attrs)
-
-        if self.tag_hierarchy and self.tag_hierarchy[-1].td.tag == "img":
-            logging.warning("Closing tag: img")
-            self.tag_hierarchy.pop()
-            self.level -= 1
-
-        current_tag: TagData = TagData(tag=tag, attrs=self.parse_attrs(attrs))
-        status: TagStatus = TagStatus.IGNORED if self.is_ignored_tag(current_tag) else TagStatus.PROCESSED
-        tabs: str = "".join(self.level * ['  '])
-        status_str: str = f"{'I' if status == TagStatus.IGNORED else 'P'}{'+R' if self.is_ignored_in_hierarchy() else ''}"
-
-        logging.debug(f"{tabs}{tag} <{status_str}> {attrs}")
-
-        level = self.tag_hierarchy[-1].level + 1 if self.tag_hierarchy else 0
-        self.tag_no += 1
-        self.tag_hierarchy.append(TagEntry(td=current_tag,
-                                           status=status,
-                                           tag_no=self.tag_no,
-                                           level=level
-                                           ))
-        self.level += 1
+        if self.stop_processing:
+            self.check_early_exit()
 
+    def dispatch_starttag(self, current_tag: TagData) -> None:
         if current_tag.tag == 'link' and current_tag.attrs.get('rel') == 'canonical':
             self.output.url = current_tag.attrs['href']
 
@@ -157,6 +165,7 @@ class ArticleHTMLParser(HTMLParser, ABC):
             self.stop_processing = True
 
         if self.stop_processing:
+            self.check_early_exit()
             return
 
         # if current_tag.tag == 'div' and 'class' in current_tag.attrs and 'flex-row' in current_tag.attrs['class']:
@@ -169,7 +178,7 @@ class ArticleHTMLParser(HTMLParser, ABC):
             return
         # logging.warning(f"Processed: {current_tag}")
 
-        self.try_extract_charset(tag, current_tag.attrs)
+        self.try_extract_charset(current_tag.tag, current_tag.attrs)
 
         if self.is_content():
             if current_tag.tag == 'ol':
@@ -181,13 +190,13 @@ class ArticleHTMLParser(HTMLParser, ABC):
 
             # italics
             if current_tag.tag in {'i', 'em'}:
-                self.output.content += self.italics_marker
+                self.output.content_buffer += self.italics_marker
 
             # list item
             if current_tag.tag == 'li':
-                if self.output.content and self.output.content[-1] != '\n':
-                    self.output.content += '\n'
-                self.output.content += f"  {self.list_markers[self.list_type]} "
+                if self.output.content_buffer and self.output.content_buffer.last_char != '\n':
+                    self.output.content_buffer += '\n'
+                self.output.content_buffer += f"  {self.list_markers[self.list_type]} "
 
         self.process_starttag()
 
@@ -198,66 +207,42 @@ class ArticleHTMLParser(HTMLParser, ABC):
     def should_stop_processing(self) -> bool:
         return False
 
-    def handle_endtag(self, tag):
-        if not (self.stop_processing or self.is_ignored_in_hierarchy()):
-            self.process_endtag()
+    def dispatch_endtag(self, tag: str) -> None:
+        super().dispatch_endtag(tag)
 
         if not self.stop_processing and self.is_content():
             # italics
             if tag in {'i', 'em'}:
-                self.output.content += self.italics_marker
+                self.output.content_buffer += self.italics_marker
 
             if tag in {'ul', 'ol'}:
                 self.list_type = None
-                self.output.content += "\n"
-
-        self.level -= 1
-        tabs: str = "".join(self.level * ['  '])
-        logging.debug(f"{tabs}/{tag} {self.tag_hierarchy[-1].td.attrs}")
-        self.tag_hierarchy.pop()
+                self.output.content_buffer += "\n"
 
     @abstractmethod
     def process_endtag(self):
         raise NotImplementedError
 
-    def handle_data(self, data):
-        super().handle_data(data)
-        if not self.tag_hierarchy:
-            return
-        self.tag_hierarchy[-1].td.data = data
-
+    def dispatch_data(self, last_tag: TagData) -> None:
         if self.stop_processing or self.is_ignored_in_hierarchy():
             return
 
         # Handle some standard tags.
-        last_tag = self.tag_hierarchy[-1].td
-
         if last_tag.tag == "script" and 'application/ld+json' == last_tag.attrs.get('type'):
-            meta = json.loads(last_tag.data)
-            data_to_insert: Dict[str, dict] = {}
-            if key := meta.get('@type'):
-                data_to_insert[key] = meta
-            elif graph := meta.get('@graph'):
-                for item in graph:
-                    data_to_insert[item['@type']] = item
-            else:
-                raise NotImplementedError(f"Unknown meta format: {meta}")
-
-            for key, value in data_to_insert.items():
-                if key in self.output.metadata:
-                    logging.error(f'Duplicated <script type="application/ld+json"> key: {key}')
-                self.output.metadata[key] = value
+            self.process_json_ld(self.decode_json_ld(last_tag.data))
+            if self.bibliography_only and self.has_json_ld_bibliography():
+                raise EarlyExit
 
         # if (last_tag.tag == 'div' and 'class' in last_tag.attrs and 'cg_article_printed_info_details' in last_tag.attrs['class']):
         #     x = 1
 
         if self.is_content():
             # if self.is_text_paragraph(last_tag) or self.is_article_lead(last_tag):
-            #     self.output.content += last_tag.cleaned_data
+            #     self.output.content_buffer += last_tag.cleaned_data
             #     return
             #
             # if self.is_block_quote(last_tag):
-            #     self.output.content += re.sub(r"^\n\s+", "", last_tag.cleaned_data)
+            #     self.output.content_buffer += re.sub(r"^\n\s+", "", last_tag.cleaned_data)
             #     return
             #
             # if self.is_header(last_tag):
@@ -265,16 +250,16 @@ class ArticleHTMLParser(HTMLParser, ABC):
             #         # self.stop_processing = True
             #         return
             #
-            #     self.output.content += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
+            #     self.output.content_buffer += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
             #     return
             #
             # if last_tag.tag == 'a':
             #     if self.is_link_to_another_article(last_tag):
             #         href: str = last_tag.attrs['href']
             #         self.output.links.append(re.sub("#.*$", "", href))
-            #         self.output.content += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
+            #         self.output.content_buffer += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
             #     else:
-            #         self.output.content += last_tag.cleaned_data
+            #         self.output.content_buffer += last_tag.cleaned_data
             #     return
 
             if last_tag.tag in {'ol', 'ul'}:
@@ -282,95 +267,156 @@ class ArticleHTMLParser(HTMLParser, ABC):
 
                 # italics
             if last_tag.tag in {'i', 'em'}:
-                # self.output.content += f"//{last_tag.cleaned_data}//"
-                # self.output.content += last_tag.cleaned_data
+                # self.output.content_buffer += f"//{last_tag.cleaned_data}//"
+                # self.output.content_buffer += last_tag.cleaned_data
                 self.process_italics_data(last_tag)
                 return
 
             # bold
             if last_tag.tag in {'strong', 'b'}:
-                self.output.content += last_tag.cleaned_data
+                self.output.content_buffer += last_tag.cleaned_data
                 return
 
             # list item
             if last_tag.tag == 'li':
                 # if self.output.content[-1] != '\n':
-                #     self.output.content += '\n'
-                # self.output.content += f"  * {last_tag.cleaned_data}"
-                self.output.content += last_tag.cleaned_data
+                #     self.output.content_buffer += '\n'
+                # self.output.content_buffer += f"  * {last_tag.cleaned_data}"
+                self.output.content_buffer += last_tag.cleaned_data
                 if last_tag.cleaned_data.rstrip().endswith((';', '.')):
-                    self.output.content += '\n'
+                    self.output.content_buffer += '\n'
                 return
 
             # new line
             if last_tag.tag == 'br':
-                self.output.content += '\n'
+                self.output.content_buffer += '\n'
                 return
 
         self.process_data()
 
+    def decode_json_ld(self, data: str) -> Any:
+        """Decode the content of a `<script type="application/ld+json">` tag (with `orjson`, if installed)."""
+        if orjson is not None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # E.g., `NaN` or integers beyond 64 bits - accepted by `json`.
+                pass
+        return json.loads(data)
+
+    bibliography_json_ld_keys: ClassVar[Tuple[str, ...]] = (
+        '@type', 'name', 'author', 'headline', 'datePublished', 'dateModified', 'url', 'mainEntityOfPage',
+    )
+    "Keys of the JSON-LD entries read by `postprocess_metadata()` and `finalize_output()`."
+
+    def select_json_ld_keys(self, entry: dict) -> dict:
+        """The entry reduced to `bibliography_json_ld_keys` if only the bibliography record is needed."""
+        if not self.bibliography_only:
+            return entry
+        return {key: entry[key] for key in self.bibliography_json_ld_keys if key in entry}
+
+    def process_json_ld(self, meta: Any) -> None:
+        """Store the decoded JSON-LD entries in `output.metadata` (by their `@type`)."""
+        data_to_insert: Dict[str, dict] = {}
+        if key := meta.get('@type'):
+            data_to_insert[key] = meta
+        elif graph := meta.get('@graph'):
+            for item in graph:
+                data_to_insert[item['@type']] = item
+        else:
+            raise NotImplementedError(f"Unknown meta format: {meta}")
+
+        for key, value in data_to_insert.items():
+            if key in self.output.metadata:
+                logging.error(f'Duplicated <script type="application/ld+json"> key: {key}')
+            self.output.metadata[key] = self.select_json_ld_keys(value)
+
+    def has_json_ld_bibliography(self) -> bool:
+        """The JSON-LD entries supply the title, author, publication date and URL (see `postprocess_metadata()`)."""
+        metadata = self.output.metadata
+        articles = [entry for entry in (metadata.get('NewsArticle'), metadata.get('BlogPosting')) if entry]
+        news = metadata.get('NewsArticle') or {}
+
+        def is_iso_date(value) -> bool:
+            try:
+                datetime.fromisoformat(value)
+                return True
+            except (TypeError, ValueError):
+                return False
+
+        main_entity = news.get('mainEntityOfPage')
+        has_url = bool(self.output.url or news.get('url')
+                       or (isinstance(main_entity, str) and 'http' in main_entity)
+                       or (isinstance(main_entity, dict) and main_entity.get('url')))
+        return (any(entry.get('headline') for entry in articles)
+                and any(is_iso_date(entry.get('datePublished')) for entry in articles)
+                and bool(metadata.get('Person') or news.get('author'))
+                and has_url)
+
     def process_italics_data(self, tag_data: TagData) -> None:
-        self.output.content += tag_data.cleaned_data
+        self.output.content_buffer += tag_data.cleaned_data
 
     @abstractmethod
     def process_data(self):
         raise NotImplementedError
 
-    def check_ignored_tag(self, last_tag: TagData, data: str) -> None:
-        if self.is_tag_match(last_tag, self.get_tags_to_ignore() + self.get_tags_with_suppressed_validation()):
+    def is_embedded_text(self) -> bool:
+        return any(te.td.tag == 'div' and 'class' in te.td.attrs and 'text--embed' in te.td.attrs['class']
+                   for te in self.tag_hierarchy)
+
+    def feed(self, data: str) -> None:
+        """Process the next chunk of the document (call `close()` once the whole document has been fed)."""
+        if self.exited_early:
             return
-        raise ValueError(f"Unknown tag: {last_tag.tag} {last_tag.attrs} D=`{data}`")
 
-    @staticmethod
-    def is_tag_match(td: TagData, td_list: List[TagData]) -> bool:
-        x = 1
-        for ignored_tag_data in td_list:
-            is_same_tag: bool = (td.tag == ignored_tag_data.tag)
-            if not is_same_tag:
-                continue
-
-            has_same_attrs: bool = True
-            if ignored_tag_data.attrs is None:
-                has_same_attrs = not td.attrs
-            else:
-                for attr, val in ignored_tag_data.attrs.items():
-                    if attr not in td.attrs:
-                        has_same_attrs = False
-                        break
-
-                    def verify_chunk(v: Union[str, Pattern], td: TagData) -> bool:
-                        v_target = td.attrs[attr]
-                        if isinstance(v, str):
-                            return v in v_target
-                        elif isinstance(v, Pattern):
-                            return v.search(v_target) is not None
-                        else:
-                            raise TypeError(f"type(v): {type(v)}")
-
-                    if isinstance(val, str) or isinstance(val, Pattern):
-                        has_same_attrs = has_same_attrs and verify_chunk(val, td)
-                    elif isinstance(val, set):
-                        has_same_attrs = has_same_attrs and all(verify_chunk(v, td) for v in val)
-                    else:
-                        raise ValueError(f'Invalid attr value: {attr} -> {val}')
-            if is_same_tag and has_same_attrs:
-                return True
-        return False
+        if self.lxml_tokenizer is not None:
+            try:
+                self.lxml_tokenizer.feed(data)
+            except EarlyExit:
+                self.discard_rest()
+            return
 
-    def is_ignored_tag(self, td: TagData = None) -> bool:
-        return self.is_tag_match(td, self.get_tags_to_ignore())
+        # `HTMLParser` emits the text found at the end of the data fed so far, even if it continues in the next
+        # chunk - feed only complete text nodes, so that the output doesn't depend on the chunk boundaries.
+        data = self.pending_data + data
+        cut = data.rfind('<')
+        if cut <= 0:
+            self.pending_data = data
+            return
+        self.pending_data = data[cut:]
 
-    def is_ignored_in_hierarchy(self) -> bool:
-        return any(te.status == TagStatus.IGNORED for te in self.tag_hierarchy)
+        try:
+            super().feed(data[:cut])
+        except EarlyExit:
+            self.discard_rest()
 
-    def is_embedded_text(self) -> bool:
-        return any(
-            te.td.tag == 'div' and 'class' in te.td.attrs and 'text--embed' in te.td.attrs['class']
-            for te in self.tag_hierarchy
-        )
+    def discard_rest(self) -> None:
+        self.exited_early = True
+        self.rawdata = ''
+        self.pending_data = ""
 
-    def feed(self, data: str) -> None:
-        super().feed(data)
+    def close(self) -> None:
+        """Process any buffered data and finalise the output."""
+        if self.closed:
+            return
+        self.closed = True
+
+        if not self.exited_early:
+            try:
+                if self.lxml_tokenizer is not None:
+                    self.lxml_tokenizer.close()
+                else:
+                    super().feed(self.pending_data)
+                    self.pending_data = ""
+                    super().close()
+            except EarlyExit:
+                self.discard_rest()
+
+        self.finalize_output()
+
+    def finalize_output(self) -> None:
+        """Post-process the gathered data (metadata, verification and the content pipeline)."""
+        self.output.content = self.output.content_buffer.getvalue()
         self.postprocess_metadata()
 
         self.output.verify_data()
@@ -395,25 +441,13 @@ class ArticleHTMLParser(HTMLParser, ABC):
 
         self.remove_extra_metadata()
 
-        def remove_nbsps(s: str) -> str:
-            return s.replace("\u00a0", " ")
-
-        self.output.content = remove_nbsps(self.output.content)
-        self.output.content = self.output.content.rstrip()
-        self.output.content = self.output.content.replace("„", '"')
-        self.output.content = self.output.content.replace("”", '"')
-        # Remove "orphaned" italics markers.
-        self.output.content = re.sub(r"////", "", self.output.content)
-        # Remove excessive newlines.
-        self.output.content = re.sub(r"\n{2,}", "\n\n", self.output.content)
-        # Fix multiple consecutive spaces (unless at the beginning of a line - as part of DokuWiki list syntax).
-        self.output.content = re.sub(r"(?<!\n) {2,}", " ", self.output.content)
-        # Remove spaces before punctuation.
-        self.output.content = re.sub(r" (?=[,\.;])", "", self.output.content)
-        # Remove newlines before lowercase latters.
-        self.output.content = re.sub(r"\n+(?=[a-z])", "", self.output.content)
-        # Remove newlines between list and preceeding paragraph.
-        self.output.content = re.sub(r"\n+(?= {2}\*)", "\n", self.output.content)
+        self.output.content = self.get_content_pipeline()(self.output.content)
+
+    def parse(self, data: str) -> OutputData:
+        """Process the whole document at once."""
+        self.feed(data)
+        self.close()
+        return self.output
 
     def postprocess_metadata(self) -> None:
 
@@ -1,5 +1,5 @@
 from abc import ABC
-from typing import List
+from typing import Tuple
 
 from articles_processor.parsers.base_parser import ArticleHTMLParser, TagData
 
@@ -15,11 +15,13 @@ class DefaultHTMLParser(ArticleHTMLParser, ABC):
     def process_endtag(self):
         pass
 
-    def get_tags_to_ignore(self) -> List[TagData]:
-        return []
+    @classmethod
+    def get_tags_to_ignore(cls) -> Tuple[TagData, ...]:
+        return ()
 
-    def get_tags_with_suppressed_validation(self) -> List[TagData]:
-        return super().get_tags_with_suppressed_validation() + []
+    @classmethod
+    def get_tags_with_suppressed_validation(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_with_suppressed_validation()
 
     def process_data(self):
         return
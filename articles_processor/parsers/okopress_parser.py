@@ -3,20 +3,29 @@ import logging
 import re
 from abc import ABC
 from datetime import datetime
-from typing import ClassVar, List
+from typing import ClassVar, Tuple
 
-from articles_processor.parsers.base_parser import ArticleHTMLParser, TagData
+from articles_processor.parsers.base_parser import ArticleHTMLParser, TagClass, TagData, matches_any
 
 
 class OKOPressHTMLParser(ArticleHTMLParser, ABC):
+    site_hosts: ClassVar[Tuple[str, ...]] = ('oko.press',)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    non_paragraph_classes: ClassVar[Tuple[str, ...]] = ('mt-1', 'lg:mr-2')
+    "Substrings of the `class` attribute of the `<p>` tags which aren't text paragraphs."
+    non_text_span_classes: ClassVar[Tuple[str, ...]] = ('sr-only', 'select-none', 'ml-3.5')
+    "Substrings of the `class` attribute of the `<span>` tags which aren't text."
+
+    content_tags: ClassVar[Tuple[TagClass, ...]] = (
+        TagClass('div', 'mt-16'),
+    )
+
     @staticmethod
     def is_contnet_tag(tag_data: TagData) -> bool:
-        return (tag_data.tag == 'div'
-                and 'class' in tag_data.attrs
-                and 'mt-16' in tag_data.attrs['class'])
+        return matches_any(tag_data, OKOPressHTMLParser.content_tags)
 
     @staticmethod
     def is_article_lead(tag_data: TagData) -> bool:
@@ -26,8 +35,7 @@ class OKOPressHTMLParser(ArticleHTMLParser, ABC):
     def is_text_paragraph(tag_data: TagData) -> bool:
         return (tag_data.tag == 'p'
                 and 'class' in tag_data.attrs
-                and not any(chunk in tag_data.attrs['class']
-                            for chunk in ['mt-1', 'lg:mr-2']))
+                and not any(chunk in tag_data.attrs['class'] for chunk in OKOPressHTMLParser.non_paragraph_classes))
 
     @staticmethod
     def is_block_quote(tag_data: TagData) -> bool:
@@ -47,7 +55,7 @@ class OKOPressHTMLParser(ArticleHTMLParser, ABC):
 
     @staticmethod
     def is_header(tag_data: TagData) -> bool:
-        return re.fullmatch(r"h[1-2]", tag_data.tag) is not None
+        return tag_data.tag in {'h1', 'h2'}
         # and not('class' in tag_data.attrs
         #         and 'mt-3' in tag_data.attrs['class']))
 
@@ -73,31 +81,31 @@ class OKOPressHTMLParser(ArticleHTMLParser, ABC):
 
         is_social_media_link: bool = self.is_embedded_text() and current_tag.tag == 'a' and 'href' in current_tag.attrs
         if is_social_media_link:
-            self.output.content += f"EMBED:\n{current_tag.attrs['href']}\n\n"
+            self.output.content_buffer += f"EMBED:\n{current_tag.attrs['href']}\n\n"
 
         # if self.is_question(current_tag):
-        #     self.output.content += "Q: "
+        #     self.output.content_buffer += "Q: "
 
     def process_endtag(self):
         last_tag = self.tag_hierarchy[-1].td
         if self.is_content():
             if self.is_text_paragraph(last_tag) or self.is_article_lead(last_tag):
-                self.output.content += '\n\n'
+                self.output.content_buffer += '\n\n'
             # if self.is_text_paragraph(last_tag) or self.is_question(last_tag):
-            #     self.output.content += '\n\n'
+            #     self.output.content_buffer += '\n\n'
             # if self.is_block_quote(last_tag):
-            #     self.output.content += '\n'
+            #     self.output.content_buffer += '\n'
 
-    tags_to_ignore_recursively: ClassVar[List[TagData]] = [
+    tags_to_ignore_recursively: ClassVar[Tuple[TagData, ...]] = (
         TagData(tag='div', attrs={'class': {'uppercase', 'items-center'}}),
         TagData(tag='div', attrs={'class': 'mt-4'}),
         TagData(tag='span', attrs={'class': 'sr-only'}),
         TagData(tag='div', attrs={'class': 'hidden'}),
         TagData(tag='div', attrs={'class': 'flex flex-col md:flex-row'}),
         TagData(tag='p', attrs={'class': {'uppercase', 'leading-4', 'text-right'}}),
-    ]
+    )
 
-    tags_to_ignore_individually: ClassVar[List[TagData]] = [
+    tags_to_ignore_individually: ClassVar[Tuple[TagData, ...]] = (
         TagData(tag='h3', attrs={}),
         TagData(tag='p', attrs={'class': 'mt-1'}),
         TagData(tag='p', attrs={'class': 'lg:mr-2'}),
@@ -111,17 +119,21 @@ class OKOPressHTMLParser(ArticleHTMLParser, ABC):
         TagData(tag='p', attrs={'class': 'hidden'}),
         TagData(tag='style', attrs={}),
         TagData(tag='div', attrs={'style': ''}),
-    ]
+    )
 
-    def get_tags_to_ignore(self) -> List[TagData]:
+    @classmethod
+    def get_tags_to_ignore(cls) -> Tuple[TagData, ...]:
         return (super().get_tags_to_ignore()
                 + OKOPressHTMLParser.tags_to_ignore_recursively
                 + OKOPressHTMLParser.tags_to_ignore_individually)
 
-    def get_tags_with_suppressed_validation(self) -> List[TagData]:
-        return super().get_tags_with_suppressed_validation() + [
-            TagData(tag='div', attrs={'class': 'mt-16'}),
-        ]
+    tags_with_suppressed_validation: ClassVar[Tuple[TagData, ...]] = (
+        TagData(tag='div', attrs={'class': 'mt-16'}),
+    )
+
+    @classmethod
+    def get_tags_with_suppressed_validation(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_with_suppressed_validation() + OKOPressHTMLParser.tags_with_suppressed_validation
 
     def process_data(self):
         last_tag = self.tag_hierarchy[-1].td
@@ -138,18 +150,18 @@ class OKOPressHTMLParser(ArticleHTMLParser, ABC):
 
         if self.is_content():
             if self.is_text_paragraph(last_tag) or self.is_article_lead(last_tag):
-                if (self.output.content[-1] != '\n'
-                        and not self.output.content.endswith(" ")):
-                    self.output.content += " "
-                self.output.content += last_tag.cleaned_data
+                if (self.output.content_buffer.last_char != '\n'
+                        and not self.output.content_buffer.endswith(" ")):
+                    self.output.content_buffer += " "
+                self.output.content_buffer += last_tag.cleaned_data
                 return
 
             if last_tag.tag == 'div' and last_tag.attrs.get('type') == 'button':
-                self.output.content += f"[BUTTON] {last_tag.cleaned_data}\n"
+                self.output.content_buffer += f"[BUTTON] {last_tag.cleaned_data}\n"
                 return
 
             if self.is_block_quote(last_tag):
-                self.output.content += re.sub(r"^\n\s+", "", last_tag.cleaned_data)
+                self.output.content_buffer += re.sub(r"^\n\s+", "", last_tag.cleaned_data)
                 return
 
             if self.is_header(last_tag):
@@ -157,46 +169,44 @@ class OKOPressHTMLParser(ArticleHTMLParser, ABC):
                     # self.stop_processing = True
                     return
 
-                if self.output.content and self.output.content[-1] != '\n':
-                    self.output.content += "\n\n"
+                if self.output.content_buffer and self.output.content_buffer.last_char != '\n':
+                    self.output.content_buffer += "\n\n"
 
-                self.output.content += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
+                self.output.content_buffer += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
                 return
 
             if last_tag.tag == 'a':
                 if self.is_link_to_another_article(last_tag):
                     href: str = last_tag.attrs['href']
                     self.output.links.append(re.sub("#.*$", "", href))
-                    self.output.content += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
+                    self.output.content_buffer += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
                 else:
-                    self.output.content += last_tag.cleaned_data
+                    self.output.content_buffer += last_tag.cleaned_data
                 return
 
             if (last_tag.tag == 'span' and 'class' in last_tag.attrs
-                    and not any(chunk in last_tag.attrs['class']
-                                for chunk in ['sr-only', 'select-none',
-                                              'ml-3.5'])):
-                self.output.content += last_tag.cleaned_data
+                    and not any(chunk in last_tag.attrs['class'] for chunk in self.non_text_span_classes)):
+                self.output.content_buffer += last_tag.cleaned_data
                 logging.warning(f'span: {last_tag.data}')
                 return
 
             # italics
             if last_tag.tag == 'i':
-                self.output.content += f"//{last_tag.cleaned_data}//"
+                self.output.content_buffer += f"//{last_tag.cleaned_data}//"
                 return
 
             # bold
             if last_tag.tag == 'strong':
-                self.output.content += last_tag.cleaned_data
+                self.output.content_buffer += last_tag.cleaned_data
                 return
 
             # list item
             if last_tag.tag == 'li':
-                self.output.content += f"  * {last_tag.cleaned_data}"
+                self.output.content_buffer += f"  * {last_tag.cleaned_data}"
                 if last_tag.cleaned_data.rstrip().endswith(';'):
-                    self.output.content += '\n'
+                    self.output.content_buffer += '\n'
                 if last_tag.cleaned_data.rstrip().endswith('.'):
-                    self.output.content += '\n\n'
+                    self.output.content_buffer += '\n\n'
                 return
 
             self.check_ignored_tag(last_tag, last_tag.data)
@@ -2,18 +2,22 @@ import json
 import re
 from abc import ABC
 from datetime import datetime
-from typing import ClassVar, List
+from typing import ClassVar, Tuple
 
-from articles_processor.parsers.base_parser import ArticleHTMLParser, TagData
+from articles_processor.parsers.base_parser import ArticleHTMLParser, TagClass, TagData, heading_tags, matches_any
 
 
 # FIXME: work in progress...
 class OnetHTMLParser(ArticleHTMLParser, ABC):
+    site_hosts: ClassVar[Tuple[str, ...]] = ('onet.pl',)
+
+    content_tags: ClassVar[Tuple[TagClass, ...]] = (
+        TagClass('div', 'whitelistPremium'),
+    )
+
     @staticmethod
     def is_contnet_tag(tag_data: TagData) -> bool:
-        return (tag_data.tag == 'div'
-                and 'class' in tag_data.attrs
-                and 'whitelistPremium' in tag_data.attrs['class'])
+        return matches_any(tag_data, OnetHTMLParser.content_tags)
 
     @staticmethod
     def is_article_lead(tag_data: TagData) -> bool:
@@ -45,7 +49,7 @@ class OnetHTMLParser(ArticleHTMLParser, ABC):
 
     @staticmethod
     def is_header(tag_data: TagData) -> bool:
-        return re.fullmatch(r"h\d", tag_data.tag) is not None
+        return tag_data.tag in heading_tags
 
     @staticmethod
     def is_link_to_another_article(tag_data: TagData) -> bool:
@@ -69,42 +73,46 @@ class OnetHTMLParser(ArticleHTMLParser, ABC):
 
         is_social_media_link: bool = self.is_embedded_text() and current_tag.tag == 'a' and 'href' in current_tag.attrs
         if is_social_media_link:
-            self.output.content += f"EMBED:\n{current_tag.attrs['href']}\n\n"
+            self.output.content_buffer += f"EMBED:\n{current_tag.attrs['href']}\n\n"
 
         # if self.is_question(current_tag):
-        #     self.output.content += "Q: "
+        #     self.output.content_buffer += "Q: "
 
     def process_endtag(self):
         last_tag = self.tag_hierarchy[-1].td
         if self.is_content():
             if self.is_text_paragraph(last_tag) or self.is_article_lead(last_tag):
-                self.output.content += '\n\n'
+                self.output.content_buffer += '\n\n'
             # if self.is_text_paragraph(last_tag) or self.is_question(last_tag):
-            #     self.output.content += '\n\n'
+            #     self.output.content_buffer += '\n\n'
             # if self.is_block_quote(last_tag):
-            #     self.output.content += '\n'
+            #     self.output.content_buffer += '\n'
 
-    tags_to_ignore: ClassVar[List[TagData]] = [
+    tags_to_ignore: ClassVar[Tuple[TagData, ...]] = (
         TagData(tag='figure', attrs={'class': 'mainPhoto'}),
         TagData(tag='aside', attrs={'class': 'extraList'}),
         TagData(tag='div', attrs={'class': 'contentShareLeft'}),
         TagData(tag='div', attrs={'class': 'pulsevideo'}),
         TagData(tag='div', attrs={'class': {'placeholder', 'embed'}}),
         TagData(tag='ul', attrs={'class': 'narrow', 'data-scroll': 'bullet'}),
-    ]
+    )
+
+    @classmethod
+    def get_tags_to_ignore(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_to_ignore() + OnetHTMLParser.tags_to_ignore
 
-    def get_tags_to_ignore(self) -> List[TagData]:
-        return super().get_tags_to_ignore() + self.tags_to_ignore
+    tags_with_suppressed_validation: ClassVar[Tuple[TagData, ...]] = (
+        TagData(tag='div', attrs={'id': 'leadContainer'}),
+        TagData(tag='div', attrs={'class': 'detailContentWrapper'}),
+        TagData(tag='div', attrs={'class': 'detailContent'}),
+        TagData(tag='div', attrs={'class': 'articleBody'}),
+        # TagData(tag='div', attrs={'class': 'cg_article_side-audio-wrapper'}),
+        # TagData(tag='div', attrs={'class': 'cg_article_printed_info'}),
+    )
 
-    def get_tags_with_suppressed_validation(self) -> List[TagData]:
-        return super().get_tags_with_suppressed_validation() + [
-            TagData(tag='div', attrs={'id': 'leadContainer'}),
-            TagData(tag='div', attrs={'class': 'detailContentWrapper'}),
-            TagData(tag='div', attrs={'class': 'detailContent'}),
-            TagData(tag='div', attrs={'class': 'articleBody'}),
-            # TagData(tag='div', attrs={'class': 'cg_article_side-audio-wrapper'}),
-            # TagData(tag='div', attrs={'class': 'cg_article_printed_info'}),
-        ]
+    @classmethod
+    def get_tags_with_suppressed_validation(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_with_suppressed_validation() + OnetHTMLParser.tags_with_suppressed_validation
 
     def process_italics_data(self, tag_data: TagData) -> None:
         if 'Dalsza część artykułu pod materiałem wideo' in tag_data.data:
@@ -128,7 +136,7 @@ class OnetHTMLParser(ArticleHTMLParser, ABC):
                     data = last_tag.cleaned_data
                     data = re.sub("\n", " ", data)
                     data = re.sub(" +", " ", data)
-                    self.output.content += data
+                    self.output.content_buffer += data
                 return
 
             if self.is_article_lead(last_tag):
@@ -138,24 +146,24 @@ class OnetHTMLParser(ArticleHTMLParser, ABC):
                 return
 
             if self.is_text_paragraph(last_tag) or self.is_article_lead(last_tag):
-                self.output.content += last_tag.cleaned_data
+                self.output.content_buffer += last_tag.cleaned_data
                 return
 
             # if self.is_block_quote(last_tag):
-            #     self.output.content += re.sub(r"^\n\s+", "", data)
+            #     self.output.content_buffer += re.sub(r"^\n\s+", "", data)
             #     return
 
             if self.is_header(last_tag):
-                self.output.content += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
+                self.output.content_buffer += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
                 return
 
             if last_tag.tag == 'a':
                 if self.is_link_to_another_article(last_tag):
                     href: str = last_tag.attrs['href']
                     self.output.links.append(re.sub("#.*$", "", href))
-                    self.output.content += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
+                    self.output.content_buffer += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
                 else:
-                    self.output.content += last_tag.cleaned_data
+                    self.output.content_buffer += last_tag.cleaned_data
                 return
 
             self.check_ignored_tag(last_tag, last_tag.data)
@@ -1,20 +1,24 @@
 import re
 from abc import ABC
 from datetime import datetime
-from typing import ClassVar, List
+from typing import ClassVar, Tuple
 
-from articles_processor.parsers.base_parser import ArticleHTMLParser, TagData
+from articles_processor.parsers.base_parser import ArticleHTMLParser, TagClass, TagData, heading_tags, matches_any
 
 
 class PapHTMLParser(ArticleHTMLParser, ABC):
+    site_hosts: ClassVar[Tuple[str, ...]] = ('www.pap.pl',)
+
+    content_tags: ClassVar[Tuple[TagClass, ...]] = (
+        TagClass('div', 'cg_article_printed_info'),
+    )
+
     @staticmethod
     def is_contnet_tag(tag_data: TagData) -> bool:
         return ((tag_data.tag == 'article'
                  and 'role' in tag_data.attrs
                  and 'article' in tag_data.attrs['role'])
-                or (tag_data.tag == 'div'
-                    and 'class' in tag_data.attrs
-                    and 'cg_article_printed_info' in tag_data.attrs['class']))
+                or matches_any(tag_data, PapHTMLParser.content_tags))
 
     @staticmethod
     def is_article_lead(tag_data: TagData) -> bool:
@@ -31,7 +35,7 @@ class PapHTMLParser(ArticleHTMLParser, ABC):
 
     @staticmethod
     def is_header(tag_data: TagData) -> bool:
-        return re.fullmatch(r"h\d", tag_data.tag) is not None
+        return tag_data.tag in heading_tags
 
     @staticmethod
     def is_link_to_another_article(tag_data: TagData) -> bool:
@@ -49,22 +53,27 @@ class PapHTMLParser(ArticleHTMLParser, ABC):
         last_tag = self.tag_hierarchy[-1].td
         if self.is_content():
             if self.is_text_paragraph(last_tag) or self.is_article_lead(last_tag):
-                self.output.content += '\n\n'
+                self.output.content_buffer += '\n\n'
             # if self.is_text_paragraph(last_tag) or self.is_question(last_tag):
-            #     self.output.content += '\n\n'
+            #     self.output.content_buffer += '\n\n'
             # if self.is_block_quote(last_tag):
-            #     self.output.content += '\n'
+            #     self.output.content_buffer += '\n'
+
+    tags_to_ignore: ClassVar[Tuple[TagData, ...]] = ()
+
+    @classmethod
+    def get_tags_to_ignore(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_to_ignore() + PapHTMLParser.tags_to_ignore
 
-    tags_to_ignore: ClassVar[List[TagData]] = [
-    ]
+    tags_with_suppressed_validation: ClassVar[Tuple[TagData, ...]] = (
+        TagData(tag='div', attrs={}),
+    )
 
-    def get_tags_to_ignore(self) -> List[TagData]:
-        return super().get_tags_to_ignore() + self.tags_to_ignore
+    @classmethod
+    def get_tags_with_suppressed_validation(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_with_suppressed_validation() + PapHTMLParser.tags_with_suppressed_validation
 
-    def get_tags_with_suppressed_validation(self) -> List[TagData]:
-        return super().get_tags_with_suppressed_validation() + [
-            TagData(tag='div', attrs={}),
-        ]
+    required_output_fields: ClassVar[Tuple[str, ...]] = ArticleHTMLParser.required_output_fields + ('title', 'pub_date')
 
     def handle_data(self, data):
         if m := re.fullmatch(r'\s*(?P<timestamp>\d{4}-\d{2}-\d{2} \d{1,2}:\d{2})\s*', data):
@@ -85,7 +94,7 @@ class PapHTMLParser(ArticleHTMLParser, ABC):
                     data = last_tag.cleaned_data
                     data = re.sub("\n", " ", data)
                     data = re.sub(" +", " ", data)
-                    self.output.content += data
+                    self.output.content_buffer += data
                 return
 
             if self.is_article_lead(last_tag):
@@ -99,24 +108,24 @@ class PapHTMLParser(ArticleHTMLParser, ABC):
                     self.output.author = last_tag.data.replace("Autor: ", "")
                     return
 
-                self.output.content += last_tag.cleaned_data
+                self.output.content_buffer += last_tag.cleaned_data
                 return
 
             if self.is_block_quote(last_tag):
-                self.output.content += re.sub(r"^\n\s+", "", last_tag.cleaned_data)
+                self.output.content_buffer += re.sub(r"^\n\s+", "", last_tag.cleaned_data)
                 return
 
             if self.is_header(last_tag):
-                self.output.content += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
+                self.output.content_buffer += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
                 return
 
             if last_tag.tag == 'a':
                 if self.is_link_to_another_article(last_tag):
                     href: str = last_tag.attrs['href']
                     self.output.links.append(re.sub("#.*$", "", href))
-                    self.output.content += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
+                    self.output.content_buffer += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
                 else:
-                    self.output.content += last_tag.cleaned_data
+                    self.output.content_buffer += last_tag.cleaned_data
                 return
 
             self.check_ignored_tag(last_tag, last_tag.data)
@@ -1,21 +1,23 @@
-import json
 import re
 from abc import ABC
 from datetime import datetime
-from typing import ClassVar, List
+from typing import Any, ClassVar, Tuple
 
-from articles_processor.parsers.base_parser import ArticleHTMLParser, TagData
+from articles_processor.parsers.base_parser import ArticleHTMLParser, TagClass, TagData, heading_tags, matches_any
 
 
 class PolitykaHTMLParser(ArticleHTMLParser, ABC):
+    site_hosts: ClassVar[Tuple[str, ...]] = ('www.polityka.pl',)
+    site_application_names: ClassVar[Tuple[str, ...]] = ('Polityka',)
+
+    content_tags: ClassVar[Tuple[TagClass, ...]] = (
+        TagClass('div', 'cg_article_content'),
+        TagClass('div', 'cg_article_printed_info'),
+    )
+
     @staticmethod
     def is_contnet_tag(tag_data: TagData) -> bool:
-        return ((tag_data.tag == 'div'
-                 and 'class' in tag_data.attrs
-                 and 'cg_article_content' in tag_data.attrs['class'])
-                or (tag_data.tag == 'div'
-                    and 'class' in tag_data.attrs
-                    and 'cg_article_printed_info' in tag_data.attrs['class']))
+        return matches_any(tag_data, PolitykaHTMLParser.content_tags)
 
     @staticmethod
     def is_article_lead(tag_data: TagData) -> bool:
@@ -47,7 +49,7 @@ class PolitykaHTMLParser(ArticleHTMLParser, ABC):
 
     @staticmethod
     def is_header(tag_data: TagData) -> bool:
-        return re.fullmatch(r"h\d", tag_data.tag) is not None
+        return tag_data.tag in heading_tags
 
     @staticmethod
     def is_link_to_another_article(tag_data: TagData) -> bool:
@@ -71,49 +73,55 @@ class PolitykaHTMLParser(ArticleHTMLParser, ABC):
 
         is_social_media_link: bool = self.is_embedded_text() and current_tag.tag == 'a' and 'href' in current_tag.attrs
         if is_social_media_link:
-            self.output.content += f"EMBED:\n{current_tag.attrs['href']}\n\n"
+            self.output.content_buffer += f"EMBED:\n{current_tag.attrs['href']}\n\n"
 
         # if self.is_question(current_tag):
-        #     self.output.content += "Q: "
+        #     self.output.content_buffer += "Q: "
 
     def process_endtag(self):
         last_tag = self.tag_hierarchy[-1].td
         if self.is_content():
             if self.is_text_paragraph(last_tag) or self.is_article_lead(last_tag):
-                self.output.content += '\n\n'
+                self.output.content_buffer += '\n\n'
             # if self.is_text_paragraph(last_tag) or self.is_question(last_tag):
-            #     self.output.content += '\n\n'
+            #     self.output.content_buffer += '\n\n'
             # if self.is_block_quote(last_tag):
-            #     self.output.content += '\n'
+            #     self.output.content_buffer += '\n'
 
-    tags_to_ignore: ClassVar[List[TagData]] = [
+    tags_to_ignore: ClassVar[Tuple[TagData, ...]] = (
         TagData(tag='div', attrs={'class': 'cg_ad_outer'}),
         TagData(tag='script', attrs={'id': 'cg_nav_viewsettings_template'}),
         TagData(tag='script', attrs={'id': 'cg_nav_user_template'}),
         TagData(tag='script', attrs={'id': 'cg_nav_user_fav_list_template'}),
         TagData(tag='div', attrs={'class': 'cg_article_side-multimedia'}),
         TagData(tag='div', attrs={'class': 'cg_article_side-audio_version'}),
-    ]
+    )
+
+    @classmethod
+    def get_tags_to_ignore(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_to_ignore() + PolitykaHTMLParser.tags_to_ignore
+
+    tags_with_suppressed_validation: ClassVar[Tuple[TagData, ...]] = (
+        TagData(tag='div', attrs={'class': 'general-container'}),
+        TagData(tag='div', attrs={'class': 'cg_article_content'}),
+        TagData(tag='div', attrs={'class': 'cg_article_meat'}),
+        TagData(tag='div', attrs={'class': 'cg_article_side-audio-wrapper'}),
+        TagData(tag='div', attrs={'class': 'cg_article_printed_info'}),
+    )
 
-    def get_tags_to_ignore(self) -> List[TagData]:
-        return super().get_tags_to_ignore() + self.tags_to_ignore
+    @classmethod
+    def get_tags_with_suppressed_validation(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_with_suppressed_validation() + PolitykaHTMLParser.tags_with_suppressed_validation
 
-    def get_tags_with_suppressed_validation(self) -> List[TagData]:
-        return super().get_tags_with_suppressed_validation() + [
-            TagData(tag='div', attrs={'class': 'general-container'}),
-            TagData(tag='div', attrs={'class': 'cg_article_content'}),
-            TagData(tag='div', attrs={'class': 'cg_article_meat'}),
-            TagData(tag='div', attrs={'class': 'cg_article_side-audio-wrapper'}),
-            TagData(tag='div', attrs={'class': 'cg_article_printed_info'}),
-        ]
+    def process_json_ld(self, meta: Any) -> None:
+        # The whole (article's) entry is the metadata.
+        self.output.metadata = self.select_json_ld_keys(meta)
 
     def process_data(self):
         last_tag = self.tag_hierarchy[-1].td
 
         if last_tag.tag == "title":
             self.output.title += last_tag.cleaned_data
-        if last_tag.tag == "script" and 'application/ld+json' == last_tag.attrs.get('type', None):
-            self.output.metadata = json.loads(last_tag.data)
 
         if self.is_content():
             if self.is_contnet_tag(last_tag):
@@ -121,7 +129,7 @@ class PolitykaHTMLParser(ArticleHTMLParser, ABC):
                     data = last_tag.cleaned_data
                     data = re.sub("\n", " ", data)
                     data = re.sub(" +", " ", data)
-                    self.output.content += data
+                    self.output.content_buffer += data
                 return
 
             if self.is_article_lead(last_tag):
@@ -131,24 +139,24 @@ class PolitykaHTMLParser(ArticleHTMLParser, ABC):
                 return
 
             if self.is_text_paragraph(last_tag) or self.is_article_lead(last_tag):
-                self.output.content += last_tag.cleaned_data
+                self.output.content_buffer += last_tag.cleaned_data
                 return
 
             # if self.is_block_quote(last_tag):
-            #     self.output.content += re.sub(r"^\n\s+", "", data)
+            #     self.output.content_buffer += re.sub(r"^\n\s+", "", data)
             #     return
 
             if self.is_header(last_tag):
-                self.output.content += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
+                self.output.content_buffer += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
                 return
 
             if last_tag.tag == 'a':
                 if self.is_link_to_another_article(last_tag):
                     href: str = last_tag.attrs['href']
                     self.output.links.append(re.sub("#.*$", "", href))
-                    self.output.content += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
+                    self.output.content_buffer += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
                 else:
-                    self.output.content += last_tag.cleaned_data
+                    self.output.content_buffer += last_tag.cleaned_data
                 return
 
             self.check_ignored_tag(last_tag, last_tag.data)
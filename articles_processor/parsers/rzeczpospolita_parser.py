@@ -1,13 +1,14 @@
-import json
 import re
 from abc import ABC
 from datetime import datetime
-from typing import ClassVar, List
+from typing import Any, ClassVar, Tuple
 
-from articles_processor.parsers.base_parser import ArticleHTMLParser, TagData, get_individual_attr_pattern
+from articles_processor.parsers.base_parser import ArticleHTMLParser, TagData, get_individual_attr_pattern, heading_tags
 
 
 class RzeczpospolitaHTMLParser(ArticleHTMLParser, ABC):
+    site_hosts: ClassVar[Tuple[str, ...]] = ('www.rp.pl',)
+
     @staticmethod
     def is_contnet_tag(tag_data: TagData) -> bool:
         return (tag_data.tag == 'div'
@@ -40,7 +41,7 @@ class RzeczpospolitaHTMLParser(ArticleHTMLParser, ABC):
 
     @staticmethod
     def is_header(tag_data: TagData) -> bool:
-        return re.fullmatch(r"h\d", tag_data.tag) is not None
+        return tag_data.tag in heading_tags
 
     @staticmethod
     def is_link_to_another_article(tag_data: TagData) -> bool:
@@ -64,72 +65,78 @@ class RzeczpospolitaHTMLParser(ArticleHTMLParser, ABC):
 
         is_social_media_link: bool = self.is_embedded_text() and current_tag.tag == 'a' and 'href' in current_tag.attrs
         if is_social_media_link:
-            self.output.content += f"EMBED:\n{current_tag.attrs['href']}\n\n"
+            self.output.content_buffer += f"EMBED:\n{current_tag.attrs['href']}\n\n"
 
         # if self.is_question(current_tag):
-        #     self.output.content += "Q: "
+        #     self.output.content_buffer += "Q: "
 
     def process_endtag(self):
         last_tag = self.tag_hierarchy[-1].td
         if self.is_content():
             if self.is_text_paragraph(last_tag):
-                self.output.content += '\n\n'
+                self.output.content_buffer += '\n\n'
             if self.is_header(last_tag):
-                self.output.content += '\n\n'
+                self.output.content_buffer += '\n\n'
             # if self.is_text_paragraph(last_tag) or self.is_question(last_tag):
-            #     self.output.content += '\n\n'
+            #     self.output.content_buffer += '\n\n'
             # if self.is_block_quote(last_tag):
-            #     self.output.content += '\n'
+            #     self.output.content_buffer += '\n'
 
-    tags_to_ignore: ClassVar[List[TagData]] = [
+    tags_to_ignore: ClassVar[Tuple[TagData, ...]] = (
         TagData(tag='div', attrs={'class': 'intext--video'}),
         TagData(tag='div', attrs={'class': 'subtitle--border'}),
         TagData(tag='div', attrs={'class': get_individual_attr_pattern('article')}),
-    ]
+    )
+
+    @classmethod
+    def get_tags_to_ignore(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_to_ignore() + RzeczpospolitaHTMLParser.tags_to_ignore
+
+    tags_with_suppressed_validation: ClassVar[Tuple[TagData, ...]] = (
+        TagData(tag='div', attrs={'class': 'excerpt'}),
+        TagData(tag='div', attrs={'class': get_individual_attr_pattern('relative')}),
+    )
 
-    def get_tags_to_ignore(self) -> List[TagData]:
-        return super().get_tags_to_ignore() + self.tags_to_ignore
+    @classmethod
+    def get_tags_with_suppressed_validation(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_with_suppressed_validation() + RzeczpospolitaHTMLParser.tags_with_suppressed_validation
 
-    def get_tags_with_suppressed_validation(self) -> List[TagData]:
-        return super().get_tags_with_suppressed_validation() + [
-            TagData(tag='div', attrs={'class': 'excerpt'}),
-            TagData(tag='div', attrs={'class': get_individual_attr_pattern('relative')}),
-        ]
+    def process_json_ld(self, meta: Any) -> None:
+        # The whole (article's) entry is the metadata.
+        self.output.metadata = self.select_json_ld_keys(meta)
 
     def process_data(self):
         last_tag = self.tag_hierarchy[-1].td
 
         if last_tag.tag == "title":
             self.output.title += last_tag.cleaned_data
-        if last_tag.tag == "script" and 'application/ld+json' == last_tag.attrs.get('type', None):
-            self.output.metadata = json.loads(last_tag.data)
 
         if self.is_content():
             if self.is_contnet_tag(last_tag):
                 return
 
             if self.is_text_paragraph(last_tag):
-                self.output.content += last_tag.cleaned_data.strip()
+                self.output.content_buffer += last_tag.cleaned_data.strip()
                 return
 
             data_withouth_nls: str = last_tag.cleaned_data.replace('\n', " ")
 
             # if self.is_block_quote(last_tag):
-            #     self.output.content += re.sub(r"^\n\s+", "", data)
+            #     self.output.content_buffer += re.sub(r"^\n\s+", "", data)
             #     return
 
             if self.is_header(last_tag):
-                # self.output.content += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
-                self.output.content += data_withouth_nls
+                # self.output.content_buffer += f"{self.header_marker}{last_tag.cleaned_data.rstrip()}\n\n"
+                self.output.content_buffer += data_withouth_nls
                 return
 
             if last_tag.tag == 'a':
                 if self.is_link_to_another_article(last_tag):
                     href: str = last_tag.attrs['href']
                     self.output.links.append(re.sub("#.*$", "", href))
-                    self.output.content += f"{data_withouth_nls}[L{len(self.output.links)}]"
+                    self.output.content_buffer += f"{data_withouth_nls}[L{len(self.output.links)}]"
                 else:
-                    self.output.content += data_withouth_nls
+                    self.output.content_buffer += data_withouth_nls
                 return
 
             self.check_ignored_tag(last_tag, last_tag.data)
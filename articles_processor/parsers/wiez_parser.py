@@ -2,24 +2,26 @@ import json
 import re
 from abc import ABC
 from datetime import datetime
-from typing import List, ClassVar
+from typing import List, ClassVar, Tuple
 
-from articles_processor.parsers.base_parser import ArticleHTMLParser, TagData
+from articles_processor.parsers.base_parser import ArticleHTMLParser, TagClass, TagData, heading_tags, matches_any
 
 
 class WiezHTMLParser(ArticleHTMLParser, ABC):
+    site_hosts: ClassVar[Tuple[str, ...]] = ('wiez.pl',)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.curent_blockquote: List[str] = []
 
+    content_tags: ClassVar[Tuple[TagClass, ...]] = (
+        TagClass('div', 'single__post__content'),
+        TagClass('div', 'cell', 'large-11'),
+    )
+
     @staticmethod
     def is_contnet_tag(tag_data: TagData) -> bool:
-        return ((tag_data.tag == 'div'
-                 and 'class' in tag_data.attrs
-                 and 'single__post__content' in tag_data.attrs['class'])
-                or (tag_data.tag == 'div'
-                    and 'class' in tag_data.attrs
-                    and all(val in tag_data.attrs['class'] for val in {'cell', 'large-11'})))
+        return matches_any(tag_data, WiezHTMLParser.content_tags)
 
     @staticmethod
     def is_text_paragraph(tag_data: TagData) -> bool:
@@ -44,7 +46,7 @@ class WiezHTMLParser(ArticleHTMLParser, ABC):
 
     @staticmethod
     def is_header(tag_data: TagData) -> bool:
-        return re.fullmatch(r"h3", tag_data.tag) is not None and not tag_data.attrs
+        return tag_data.tag == 'h3' and not tag_data.attrs
 
     @staticmethod
     def is_link_to_another_article(tag_data: TagData) -> bool:
@@ -59,13 +61,13 @@ class WiezHTMLParser(ArticleHTMLParser, ABC):
 
         is_social_media_link: bool = self.is_embedded_text() and current_tag.tag == 'a' and 'href' in current_tag.attrs
         if is_social_media_link:
-            self.output.content += f"EMBED:\n{current_tag.attrs['href']}\n\n"
+            self.output.content_buffer += f"EMBED:\n{current_tag.attrs['href']}\n\n"
 
         # if tag == 'link' and current_tag.attrs.get('rel') == 'canonical':
         #     self.output.url = current_tag.attrs['href']
 
         # if self.is_question(current_tag):
-        #     self.output.content += "Q: "
+        #     self.output.content_buffer += "Q: "
 
     def process_endtag(self):
         last_tag = self.tag_hierarchy[-1]
@@ -74,38 +76,42 @@ class WiezHTMLParser(ArticleHTMLParser, ABC):
                 and not self.is_ignored_in_hierarchy()
                 and self.is_content()):
             if self.is_block_quote(last_tag.td):
-                self.output.content += f"{self.quote_marker} {self.curent_blockquote[1]}: {self.curent_blockquote[0]}\n\n"
+                self.output.content_buffer += f"{self.quote_marker} {self.curent_blockquote[1]}: {self.curent_blockquote[0]}\n\n"
                 self.curent_blockquote = []
             elif self.is_text_paragraph(last_tag.td) and not self.is_part_of_blockquote():
-                self.output.content += '\n\n'
+                self.output.content_buffer += '\n\n'
 
-    tags_to_ignore_recursively: ClassVar[List[TagData]] = [
+    tags_to_ignore_recursively: ClassVar[Tuple[TagData, ...]] = (
         TagData(tag='aside', attrs={}),
         TagData(tag='figure', attrs={}),
         TagData(tag='span', attrs={'class': 'post__author__name'}),
         TagData(tag='time', attrs={'class': 'single__post__date'}),
         TagData(tag='div', attrs={'class': 'single__post_author-box'}),
         TagData(tag='div', attrs={'class': 'single__post__main-info'}),
-    ]
+    )
 
-    tags_to_ignore_individually: ClassVar[List[TagData]] = [
+    tags_to_ignore_individually: ClassVar[Tuple[TagData, ...]] = (
         TagData(tag='aside', attrs={}),
         TagData(tag='figure', attrs={}),
         TagData(tag='h2', attrs={}),
         TagData(tag='div', attrs={'class': 'quote-socials'}),
         TagData(tag='h1', attrs={'class': 'single__post__title'}),
-    ]
-
-    def get_tags_with_suppressed_validation(self) -> List[TagData]:
-        return super().get_tags_with_suppressed_validation() + [
-            TagData(tag='blockquote', attrs={'class': 'quote-box'}),
-            TagData(tag='div', attrs={'class': 'quote-content'}),
-            TagData(tag='div', attrs={'class': 'quote-text-box'}),
-            TagData(tag='div', attrs={'class': 'single__post'}),
-            TagData(tag='div', attrs={}),
-        ]
-
-    def get_tags_to_ignore(self) -> List[TagData]:
+    )
+
+    tags_with_suppressed_validation: ClassVar[Tuple[TagData, ...]] = (
+        TagData(tag='blockquote', attrs={'class': 'quote-box'}),
+        TagData(tag='div', attrs={'class': 'quote-content'}),
+        TagData(tag='div', attrs={'class': 'quote-text-box'}),
+        TagData(tag='div', attrs={'class': 'single__post'}),
+        TagData(tag='div', attrs={}),
+    )
+
+    @classmethod
+    def get_tags_with_suppressed_validation(cls) -> Tuple[TagData, ...]:
+        return super().get_tags_with_suppressed_validation() + WiezHTMLParser.tags_with_suppressed_validation
+
+    @classmethod
+    def get_tags_to_ignore(cls) -> Tuple[TagData, ...]:
         return (super().get_tags_to_ignore()
                 + WiezHTMLParser.tags_to_ignore_recursively
                 + WiezHTMLParser.tags_to_ignore_individually)
@@ -152,20 +158,20 @@ class WiezHTMLParser(ArticleHTMLParser, ABC):
                 return
 
             if self.is_text_paragraph(last_tag):
-                self.output.content += last_tag.cleaned_data
+                self.output.content_buffer += last_tag.cleaned_data
                 return
 
             if self.is_header(last_tag):
-                self.output.content += f"{self.header_marker} {last_tag.cleaned_data.rstrip()}\n\n"
+                self.output.content_buffer += f"{self.header_marker} {last_tag.cleaned_data.rstrip()}\n\n"
                 return
 
             if last_tag.tag == 'a':
                 if self.is_link_to_another_article(last_tag):
                     href: str = last_tag.attrs['href']
                     self.output.links.append(re.sub("#.*$", "", href))
-                    self.output.content += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
+                    self.output.content_buffer += f"{last_tag.cleaned_data}[L{len(self.output.links)}]"
                 else:
-                    self.output.content += last_tag.cleaned_data
+                    self.output.content_buffer += last_tag.cleaned_data
                 return
 
             self.check_ignored_tag(last_tag, last_tag.data)
@@ -0,0 +1,112 @@
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Match, Pattern, Tuple, Union
+
+Replacement = Union[str, Callable[[Match], str]]
+
+
+@dataclass(frozen=True)
+class LiteralRule:
+    """Replace all occurrences of a string.
+
+    Implemented with `str.replace()`, which (unlike `re.sub()` or `str.translate()`) is a fast, C-level scan.
+    """
+    old: str
+    new: str
+
+
+@dataclass(frozen=True)
+class RegexRule:
+    """Replace all matches of a regular expression (the pattern is compiled once)."""
+    pattern: Union[str, Pattern]
+    replacement: Replacement
+
+    @property
+    def compiled(self) -> Pattern:
+        return re.compile(self.pattern) if isinstance(self.pattern, str) else self.pattern
+
+
+@dataclass(frozen=True)
+class FunctionRule:
+    """Apply an arbitrary `str -> str` function (e.g., `str.rstrip`)."""
+    func: Callable[[str], str]
+
+
+ContentRule = Union[LiteralRule, RegexRule, FunctionRule]
+
+
+class ContentPipeline:
+    """Rules for normalising the article's content, each compiled once into a single pass over the text.
+
+    The rules are applied in order.
+    """
+
+    def __init__(self, rules: Iterable[ContentRule]):
+        self.rules: Tuple[ContentRule, ...] = tuple(rules)
+        self.passes: List[Callable[[str], str]] = [self.compile_rule(rule) for rule in self.rules]
+
+    @staticmethod
+    def compile_rule(rule: ContentRule) -> Callable[[str], str]:
+        if isinstance(rule, LiteralRule):
+            return lambda s: s.replace(rule.old, rule.new)
+        elif isinstance(rule, RegexRule):
+            sub = rule.compiled.sub
+            replacement = rule.replacement
+            return lambda s: sub(replacement, s)
+        elif isinstance(rule, FunctionRule):
+            return rule.func
+        else:
+            raise TypeError(f"Unknown content rule: {rule}")
+
+    def __call__(self, s: str) -> str:
+        for pass_ in self.passes:
+            s = pass_(s)
+        return s
+
+
+def normalize_newlines(m: Match) -> str:
+    """Replacement for `newlines_pattern`, equivalent to applying (in order):
+
+    - remove excessive newlines: `\\n{2,}` -> `\\n\\n`,
+    - remove newlines before lowercase letters: `\\n+(?=[a-z])` -> ``,
+    - remove newlines between list and preceding paragraph: `\\n+(?= {2}\\*)` -> `\\n`.
+    """
+    kind = m.lastgroup
+    if kind == 'joined':
+        return ""
+    if kind == 'list':
+        return "\n"
+    return "\n\n"
+
+
+newlines_pattern: Pattern = re.compile(r"\n(?:(?P<joined>\n*(?=[a-z]))|(?P<list>\n*(?= {2,}\*))|\n\n+)")
+
+
+def normalize_spaces(m: Match) -> str:
+    """Replacement for `spaces_pattern`, equivalent to applying (in order):
+
+    - fix multiple consecutive spaces (unless at the beginning of a line - as part of DokuWiki list syntax):
+      `(?<!\\n) {2,}` -> ` `,
+    - remove spaces before punctuation: ` (?=[,.;])` -> ``.
+    """
+    string = m.string
+    start, end = m.span()
+    is_line_start: bool = start > 0 and string[start - 1] == '\n'
+    spaces: str = "  " if is_line_start and end - start >= 2 else " "
+    if end < len(string) and string[end] in ",.;":
+        spaces = spaces[:-1]
+    return spaces
+
+
+spaces_pattern: Pattern = re.compile(r" (?: +|(?=[,.;]))")
+
+default_content_rules: Tuple[ContentRule, ...] = (
+    LiteralRule("\u00a0", " "),
+    LiteralRule("„", '"'),
+    LiteralRule("”", '"'),
+    FunctionRule(str.rstrip),
+    # Remove "orphaned" italics markers.
+    LiteralRule("////", ""),
+    RegexRule(newlines_pattern, normalize_newlines),
+    RegexRule(spaces_pattern, normalize_spaces),
+)
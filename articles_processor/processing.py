@@ -0,0 +1,238 @@
+"""Processing of a single article: choosing the parser, parsing the (streamed) page and formatting the result."""
+import re
+from enum import StrEnum
+from itertools import chain
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Pattern, Tuple
+
+from articles_processor.charset import sniff_size
+from articles_processor.parser_registry import default_parser_registry
+from articles_processor.parser_types import OutputData
+from articles_processor.parsers.base_parser import ArticleHTMLParser, Tokenizer
+from articles_processor.profiling import ParserProfiler
+from articles_processor.result_cache import ResultCache, hash_file
+from articles_processor.streaming import DecodedChunks, feed_chunks, iter_binary_chunks
+from bibtex.bibtex_key_generator import generate_bibtex_key
+from commons_lib.html_parser import TagTracer
+
+template_path: Path = Path(__file__).parent / "misc_template.txt"
+
+head_end_pattern: Pattern = re.compile(r"<(?:/head|body)(?=[\s>])", re.IGNORECASE)
+head_end_overlap: int = 6
+"Length of the longest prefix of a match of `head_end_pattern` (`</head`)."
+
+
+def fix_meta_charset(parser_input: str) -> str:
+    """<meta> tag with `charset` attr should be a start-end tag."""
+
+    if (m := re.search(r"<meta charset=\"(?P<charset>[\w\-]+)\"\s*>", parser_input)) is not None:
+        parser_input = re.sub(r"<meta charset=\"[\w\-]+\"\s*>",
+                              f"<meta charset=\"{m.group('charset')}\" />",
+                              parser_input)
+    return parser_input
+
+
+def read_head(chunks: Iterator[str], size: int = sniff_size) -> str:
+    """The first chunks of the page joined: the whole `<head>` (the parser is chosen based on its declarations, see
+    `ParserRegistry`), at least `size` characters (so, by default, at least the bytes in which the charset is sniffed,
+    see `detect_charset()`), not ending within a tag.
+
+    The whole page if it has no `</head>` (or `<body>`).
+    """
+    head_chunks: List[str] = []
+    head_size = 0
+    is_head_read = False
+    # The end of the chunks read so far (`</head>` may be split between two chunks).
+    tail = ""
+    for chunk in chunks:
+        head_chunks.append(chunk)
+        head_size += len(chunk)
+        if not is_head_read:
+            is_head_read = head_end_pattern.search(tail + chunk) is not None
+            tail = (tail + chunk)[-head_end_overlap:]
+        if is_head_read and head_size >= size:
+            head = "".join(head_chunks)
+            if head.rfind('<') <= head.rfind('>'):
+                return head
+            head_chunks = [head]
+    return "".join(head_chunks)
+
+
+def get_parser(parser_input: str, tokenizer: Tokenizer = Tokenizer.HTML_PARSER,
+               bibliography_only: bool = False) -> ArticleHTMLParser:
+    return default_parser_registry.get_parser_class(parser_input)(tokenizer=tokenizer,
+                                                                  bibliography_only=bibliography_only)
+
+
+def parse_stream(input_stream: BinaryIO, parser: Optional[ArticleHTMLParser] = None, early_exit: bool = False,
+                 tracer: Optional[TagTracer] = None, cache: Optional[ResultCache] = None,
+                 content_hash: Optional[str] = None, content_type: Optional[str] = None,
+                 profiler: Optional[ParserProfiler] = None, tokenizer: Tokenizer = Tokenizer.HTML_PARSER,
+                 bibliography_only: bool = False) -> OutputData:
+    """Parse the page read (and decoded) chunk by chunk from the stream.
+
+    The charset is detected from the bytes and the HTTP `Content-Type` header (if any, see `detect_charset()`).
+    The `<meta charset>` tag is fixed (see `fix_meta_charset()`) in the head of the page (see `read_head()`), however
+    small the chunks. Unless given, the parser is chosen based on the head, which covers the `<head>` declarations,
+    and created with the given `tokenizer`. The result is looked up in (and stored to) the `cache` if `content_hash`
+    is given.
+    With `bibliography_only`, the content may be missing (see `ArticleHTMLParser.bibliography_only`) - such results
+    are never cached.
+    """
+    input_chunks: Iterator[str] = iter(DecodedChunks(iter_binary_chunks(input_stream), content_type=content_type))
+    head: str = fix_meta_charset(read_head(input_chunks))
+
+    if parser is None:
+        parser = get_parser(head, tokenizer=tokenizer, bibliography_only=bibliography_only)
+    parser.early_exit = early_exit
+    parser.tracer = tracer
+    if profiler is not None:
+        parser.set_profiler(profiler)
+
+    use_cache: bool = cache is not None and content_hash is not None and not parser.bibliography_only
+    if use_cache and (output := cache.load(content_hash, type(parser))) is not None:
+        return output
+
+    output = feed_chunks(parser, chain([head], input_chunks))
+    if use_cache:
+        cache.store(content_hash, type(parser), output)
+    return output
+
+
+def parse_file(input_file_path: Path, early_exit: bool = False, tracer: Optional[TagTracer] = None,
+               cache: Optional[ResultCache] = None, profiler: Optional[ParserProfiler] = None,
+               tokenizer: Tokenizer = Tokenizer.HTML_PARSER, bibliography_only: bool = False) -> OutputData:
+    """Parse the saved page (using the cache unless the parsing is traced or profiled)."""
+    use_cache: bool = cache is not None and tracer is None and profiler is None and not bibliography_only
+    content_hash = hash_file(input_file_path) if use_cache else None
+    with open(input_file_path, "rb") as input_stream:
+        return parse_stream(input_stream, early_exit=early_exit, tracer=tracer, cache=cache, content_hash=content_hash,
+                            profiler=profiler, tokenizer=tokenizer, bibliography_only=bibliography_only)
+
+
+class Publisher(StrEnum):
+    GENERIC = "PUBLISHER"
+
+    WYBORCZA = "Gazeta Wyborcza"
+    POLITYKA = "Polityka"
+    OKO_PRESS = "OKO.press"
+    WIEZ = "Więź"
+    RZECZPOSPOLITA = "Rzeczpospolita"
+    EKAI = "eKAI"
+    GOSC = "Gość Niedzielny"
+    ONET = "Onet"
+    RADIO_ZET = "Radio ZET"
+    TVN24 = "TVN24"
+    DZIENNIK = "Dziennik"
+    PAP = "Polska Agencja Prasowa (PAP)"
+
+
+def get_publisher(url: str) -> Tuple[Publisher, str]:
+    if 'wyborcza.pl' in url:
+        publisher = Publisher.WYBORCZA
+
+        subtypes: Dict[str, str] = {
+            'duzyformat': "Duży Format",
+            'alehistoria': "Ale Historia",
+            'magazyn': "Wolna Sobota",
+
+            'torun': "Toruń",
+            'zakopane': "Zakopane",
+            'wroclaw': "Wrocław",
+            'krakow': "Kraków",
+            'warszawa': "Warszawa",
+            'trojmiasto': "Trójmiasto",
+        }
+
+        m = re.search(r"wyborcza\.pl/(?P<chunk>[^/]+)(?:/|$)", url)
+        if (chunk := m.group('chunk')).isalpha():
+            # if m := re.search(r"https://(?P<city>\w+)\.wyborcza\.pl/", url):
+            #     if (city := m.group('city')) not in subtypes:
+            #         raise ValueError(f"GW city not handled: {city}")
+            if chunk not in subtypes:
+                raise ValueError(f"GW chunk `{chunk}` not handled in {url}")
+            return publisher, f"{publisher} ({subtypes[chunk]})"
+        else:
+            return publisher, str(publisher)
+
+    if 'www.wysokieobcasy.pl' in url:
+        return Publisher.WYBORCZA, f"{Publisher.WYBORCZA} (Wysokie Obcasy)"
+
+    if 'www.polityka.pl' in url:
+        return Publisher.POLITYKA, str(Publisher.POLITYKA)
+
+    if 'oko.press' in url:
+        return Publisher.OKO_PRESS, str(Publisher.OKO_PRESS)
+
+    if 'wiez.pl' in url:
+        return Publisher.WIEZ, str(Publisher.WIEZ)
+
+    if 'rp.pl' in url:
+        return Publisher.RZECZPOSPOLITA, str(Publisher.RZECZPOSPOLITA)
+
+    if 'ekai.pl' in url:
+        return Publisher.EKAI, str(Publisher.EKAI)
+
+    if 'gosc.pl' in url:
+        return Publisher.GOSC, str(Publisher.GOSC)
+
+    if 'onet.pl' in url:
+        return Publisher.ONET, str(Publisher.ONET)
+
+    if 'radiozet.pl' in url:
+        return Publisher.RADIO_ZET, str(Publisher.RADIO_ZET)
+
+    if 'tvn24.pl' in url:
+        return Publisher.TVN24, str(Publisher.TVN24)
+
+    if 'wiadomosci.dziennik.pl' in url:
+        return Publisher.DZIENNIK, str(Publisher.DZIENNIK)
+
+    if 'www.pap.pl' in url:
+        return Publisher.PAP, str(Publisher.PAP)
+
+    return Publisher.GENERIC, Publisher.GENERIC
+    # raise ValueError(f"Undefined publisher for URL: `{url}`")
+
+
+known_publisher_ids: Dict[Publisher, str] = {
+    Publisher.WYBORCZA: 'gw',
+    # Publisher.POLITYKA: 'polityka',
+    Publisher.OKO_PRESS: 'okopress',
+    # Publisher.WIEZ: 'wiez',
+    Publisher.RZECZPOSPOLITA: 'rp',
+    # Publisher.EKAI: 'ekai',
+    # Publisher.GOSC: 'gosc',
+    # Publisher.ONET: 'onet',
+    Publisher.RADIO_ZET: 'radiozet',
+    # Publisher.TVN24: 'tvn24',
+    # Publisher.DZIENNIK: 'dziennik',
+    # Publisher.PAP: 'pap',
+}
+
+
+def load_template(path: Path = template_path) -> str:
+    with open(path) as f:
+        return "".join(f.readlines())
+
+
+def format_article(output: OutputData, template: str) -> str:
+    """The BibTeX entry (see `misc_template.txt`) followed by the parsed article."""
+    publisher_type, publisher_str = get_publisher(output.url)
+    publisher_id = known_publisher_ids.get(publisher_type) or publisher_type
+
+    text = template.format(
+        label=f"{generate_bibtex_key(output.title)}_{publisher_id}_{output.pub_date.strftime('%Y_%m_%d')}",
+        author=output.author,
+        publisher=publisher_str,
+        title=output.title,
+        pubdate=output.pub_date.strftime('%Y-%m-%d'),
+        url=output.url,
+    )
+
+    if publisher_type == Publisher.GOSC:
+        text += "\nUWAGA: Uzupełnij informację o numerze 'Gościa' oraz ew. o diecezji!\n"
+
+    text += "\n------\n"
+    text += output.print(full=False)
+    return text
@@ -0,0 +1,67 @@
+"""Opt-in profiling of the parser's hooks: cumulative time and number of calls of each hook.
+
+Pass a `ParserProfiler` to the parser (or to `parse_stream()` / `parse_file()`); the report is attached to the output
+as `OutputData.profile`. Times are inclusive (e.g., the time of `is_content` is also counted in `handle_starttag`).
+"""
+import time
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, ClassVar, Dict, Tuple
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    total_time: float = 0.0
+    "Cumulative time (in seconds)."
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+@dataclass
+class ProfileReport:
+    phases: Dict[str, PhaseStats] = field(default_factory=dict)
+
+    def __str__(self):
+        lines = [f"{'phase':<20} {'calls':>8} {'total [ms]':>11} {'mean [us]':>10}"]
+        lines += [f"{name:<20} {stats.calls:>8} {stats.total_time * 1e3:>11.2f} {stats.mean_time * 1e6:>10.2f}"
+                  for name, stats in self.phases.items()]
+        return "\n".join(lines)
+
+
+class ParserProfiler:
+    """Wraps the profiled methods of a parser instance (the parser class itself is left intact)."""
+
+    profiled_methods: ClassVar[Tuple[str, ...]] = (
+        'handle_starttag',
+        'handle_data',
+        'is_content',
+        'is_ignored_tag',
+        'decode_json_ld',
+        'finalize_output',
+    )
+
+    def __init__(self):
+        self.report: ProfileReport = ProfileReport()
+
+    def wrap(self, name: str, method: Callable) -> Callable:
+        stats = self.report.phases.setdefault(name, PhaseStats())
+        perf_counter = time.perf_counter
+
+        @wraps(method)
+        def profiled(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats.total_time += perf_counter() - start
+                stats.calls += 1
+
+        return profiled
+
+    def instrument(self, parser) -> None:
+        for name in self.profiled_methods:
+            setattr(parser, name, self.wrap(name, getattr(parser, name)))
+        parser.output.profile = self.report
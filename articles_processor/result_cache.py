@@ -0,0 +1,77 @@
+"""On-disk cache of the parsed articles.
+
+Entries are addressed by the hash of the page's raw bytes and the fingerprint of the parser, i.e., the hash of
+the source code the parser's output depends on - once the parser (or any code it builds upon) changes, its old
+entries are no longer found (and are replaced upon storing the new result).
+"""
+import dataclasses
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import sys
+from functools import cache
+from pathlib import Path
+from typing import Optional, Tuple, Type
+
+from articles_processor.parser_types import ContentBuffer, OutputData
+from articles_processor.parsers.base_parser import ArticleHTMLParser
+
+project_packages: Tuple[str, ...] = ('articles_processor', 'commons_lib')
+
+shared_parser_modules: Tuple[str, ...] = (
+    'articles_processor.parser_types',
+    'articles_processor.postprocessing',
+    'commons_lib.html_parser',
+)
+"Modules used by all the parsers (in addition to the modules of the parser's class and its bases)."
+
+
+def hash_file(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+@cache
+def get_parser_fingerprint(parser_class: Type[ArticleHTMLParser]) -> str:
+    module_names = {c.__module__ for c in parser_class.__mro__ if c.__module__.startswith(project_packages)}
+    module_names.update(shared_parser_modules)
+
+    fingerprint = hashlib.sha256()
+    for module_name in sorted(module_names):
+        fingerprint.update(module_name.encode())
+        fingerprint.update(Path(inspect.getfile(sys.modules[module_name])).read_bytes())
+    return fingerprint.hexdigest()[:16]
+
+
+class ResultCache:
+    def __init__(self, cache_dir: Path):
+        self.cache_dir: Path = cache_dir
+
+    def get_entry_path(self, content_hash: str, parser_class: Type[ArticleHTMLParser]) -> Path:
+        return self.cache_dir / content_hash[:2] / f"{content_hash}-{get_parser_fingerprint(parser_class)}.pickle"
+
+    def load(self, content_hash: str, parser_class: Type[ArticleHTMLParser]) -> Optional[OutputData]:
+        try:
+            with open(self.get_entry_path(content_hash, parser_class), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logging.warning(f"Invalid cache entry for {content_hash}: {e}")
+            return None
+
+    def store(self, content_hash: str, parser_class: Type[ArticleHTMLParser], output: OutputData) -> None:
+        entry_path = self.get_entry_path(content_hash, parser_class)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Entries of the previous versions of the parser are useless.
+        for stale_entry_path in entry_path.parent.glob(f"{content_hash}-*.pickle"):
+            stale_entry_path.unlink(missing_ok=True)
+
+        # Write-then-rename, so that concurrent readers (e.g., batch workers) never see a partial entry.
+        tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(dataclasses.replace(output, content_buffer=ContentBuffer(), profile=None), f)
+        os.replace(tmp_path, entry_path)
@@ -0,0 +1,72 @@
+"""Incremental input of the parsers: the page is decoded and fed to a parser chunk by chunk (e.g., while it is
+still being downloaded), so that the whole page never has to be held in memory (let alone in several copies)."""
+import codecs
+from itertools import chain
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from articles_processor.charset import CharsetSource, DetectedCharset, detect_charset, fallback_charset, sniff_size
+from articles_processor.parser_types import OutputData
+from articles_processor.parsers.base_parser import ArticleHTMLParser
+
+chunk_size: int = 64 * 1024
+
+
+def iter_binary_chunks(stream: BinaryIO, size: int = chunk_size) -> Iterator[bytes]:
+    while chunk := stream.read(size):
+        yield chunk
+
+
+class DecodedChunks:
+    """Chunks of text decoded (incrementally) from chunks of bytes.
+
+    The charset is detected (see `detect_charset()`) from the first `sniff_size` bytes, which are read upon creation.
+    An undeclared page which turns out not to be valid UTF-8 past those bytes is decoded with the fallback charset
+    from there on (`charset` is updated accordingly). Can be iterated once.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], content_type: Optional[str] = None):
+        self.chunks: Iterator[bytes] = iter(chunks)
+        head_chunks = []
+        head_size = 0
+        for chunk in self.chunks:
+            head_chunks.append(chunk)
+            head_size += len(chunk)
+            if head_size >= sniff_size:
+                break
+        self.head: bytes = b"".join(head_chunks)
+        self.detected_charset: DetectedCharset = detect_charset(self.head, content_type=content_type)
+        self.charset: str = self.detected_charset.charset
+        self._decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder(self.charset)()
+
+    def __iter__(self) -> Iterator[str]:
+        head, self.head = self.head[self.detected_charset.bom_length:], b""
+        for chunk in chain((head,), self.chunks):
+            if text := self._decode(chunk):
+                yield text
+        if text := self._decode(b"", final=True):
+            yield text
+
+    def _decode(self, data: bytes, final: bool = False) -> str:
+        pending, _ = self._decoder.getstate()
+        try:
+            return self._decoder.decode(data, final=final)
+        except UnicodeDecodeError:
+            if self.detected_charset.source is not CharsetSource.DEFAULT or self.charset == fallback_charset:
+                raise
+            # Only the head of the page was checked to be valid UTF-8 (see `detect_charset()`).
+            self.charset = fallback_charset
+            self._decoder = codecs.getincrementaldecoder(fallback_charset)()
+            return self._decoder.decode(pending + data, final=final)
+
+
+def feed_chunks(parser: ArticleHTMLParser, chunks: Iterable[str]) -> OutputData:
+    """Feed the document to the parser chunk by chunk and close the parser.
+
+    No further chunks are read once the parser has exited early (see `ArticleHTMLParser.early_exit`).
+    """
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.exited_early:
+            break
+    parser.close()
+    return parser.output
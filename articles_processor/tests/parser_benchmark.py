@@ -0,0 +1,180 @@
+"""Benchmark of the site parsers over the saved articles (and their synthetic, scaled-up versions).
+
+For each article reports the number of tags, tags/second, peak memory and the split of the time between:
+- tokenising: `HTMLParser` (or libxml2, see `--tokenizer`) itself (measured with no-op handlers),
+- dispatch: the parser's handlers (the rest of `feed()`),
+- post-processing: `close()` (metadata, verification and the content pipeline).
+
+The scaled-up versions repeat the inner HTML of the article's (largest) content container `scale` times.
+
+Results are compared with the baseline (`parser_benchmark_baseline.json`), which is updated with `--save`.
+
+Usage (from the repository's root directory):
+    python -m articles_processor.tests.parser_benchmark [--scale 10] [--repeat 5] [--tokenizer lxml] [--save]
+"""
+import argparse
+import json
+import logging
+import platform
+import re
+import time
+import tracemalloc
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Type
+
+from articles_processor.charset import decode_page
+from articles_processor.lxml_tokenizer import LxmlTokenizer
+from articles_processor.parsers.base_parser import ArticleHTMLParser, TagEntry, Tokenizer
+from articles_processor.tests.postprocessing_benchmark import fixture_parsers, fixtures_dir
+
+baseline_path: Path = Path(__file__).parent / "parser_benchmark_baseline.json"
+regression_threshold: float = 0.25
+"Relative slowdown (or memory increase) reported as a regression."
+
+
+def find_content_span(parser_class: Type[ArticleHTMLParser], page: str) -> Optional[Tuple[int, int]]:
+    """Span of the inner HTML of the largest (closed) content tag of the page."""
+    line_starts: List[int] = [0] + [m.end() for m in re.finditer("\n", page)]
+
+    class ContentSpanParser(parser_class):
+        def __init__(self):
+            super().__init__()
+            self.span_starts: Dict[int, int] = {}
+            "Offsets of the start tags' ends, by `TagEntry.tag_no`."
+            self.spans: List[Tuple[int, int]] = []
+
+        def get_offset(self) -> int:
+            line_no, column = self.getpos()
+            return line_starts[line_no - 1] + column
+
+        def push_tag(self, entry: TagEntry) -> None:
+            super().push_tag(entry)
+            if entry.is_content_tag:
+                self.span_starts[entry.tag_no] = self.get_offset() + len(self.get_starttag_text())
+
+        def pop_tag(self) -> TagEntry:
+            entry = super().pop_tag()
+            if entry.is_content_tag:
+                self.spans.append((self.span_starts[entry.tag_no], self.get_offset()))
+            return entry
+
+    parser = ContentSpanParser()
+    parser.parse(page)
+    return max(parser.spans, key=lambda span: span[1] - span[0], default=None)
+
+
+def scale_content(parser_class: Type[ArticleHTMLParser], page: str, scale: int) -> str:
+    span = find_content_span(parser_class, page)
+    if span is None:
+        raise ValueError(f"No content found by {parser_class.__name__}")
+    start, end = span
+    return page[:start] + page[start:end] * scale + page[end:]
+
+
+def load_pages(scale: int) -> Dict[str, Tuple[Type[ArticleHTMLParser], str]]:
+    pages: Dict[str, Tuple[Type[ArticleHTMLParser], str]] = {}
+    for prefix, parser_class in fixture_parsers.items():
+        input_file_path = next(fixtures_dir.glob(f"{prefix}*"))
+        page, _ = decode_page(input_file_path.read_bytes())
+        name = prefix.rstrip('_')
+        pages[name] = (parser_class, page)
+        pages[f"{name} x{scale}"] = (parser_class, scale_content(parser_class, page, scale))
+    return pages
+
+
+def measure(parser_class: Type[ArticleHTMLParser], page: str, repeat: int,
+            tokenizer: Tokenizer = Tokenizer.HTML_PARSER) -> Dict[str, float]:
+    tokenise_time = feed_time = close_time = float('inf')
+    tags = 0
+    for _ in range(repeat):
+        # `HTMLParser`'s handlers do nothing.
+        null_parser = HTMLParser() if tokenizer == Tokenizer.HTML_PARSER else LxmlTokenizer(HTMLParser())
+        start = time.perf_counter()
+        null_parser.feed(page)
+        null_parser.close()
+        tokenise_time = min(tokenise_time, time.perf_counter() - start)
+
+        parser = parser_class(tokenizer=tokenizer)
+        start = time.perf_counter()
+        parser.feed(page)
+        middle = time.perf_counter()
+        parser.close()
+        end = time.perf_counter()
+        feed_time = min(feed_time, middle - start)
+        close_time = min(close_time, end - middle)
+        tags = parser.tag_no
+
+    tracemalloc.start()
+    parser_class(tokenizer=tokenizer).parse(page)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total_time = feed_time + close_time
+    return {
+        'chars': len(page),
+        'tags': tags,
+        'tokenise_ms': tokenise_time * 1000,
+        'dispatch_ms': max(feed_time - tokenise_time, 0) * 1000,
+        'postprocess_ms': close_time * 1000,
+        'total_ms': total_time * 1000,
+        'tags_per_s': tags / total_time,
+        'peak_memory_kib': peak_memory / 1024,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> List[str]:
+    regressions: List[str] = []
+    for name, result in results.items():
+        if (base := baseline.get(name)) is None:
+            continue
+        for key in ['total_ms', 'peak_memory_kib']:
+            if result[key] > base[key] * (1 + regression_threshold):
+                regressions.append(f"{name}: {key} {base[key]:.1f} -> {result[key]:.1f}")
+    return regressions
+
+
+def run_benchmark(scale: int = 10, repeat: int = 5, tokenizer: Tokenizer = Tokenizer.HTML_PARSER,
+                  save: bool = False) -> None:
+    results: Dict[str, Dict[str, float]] = {}
+    header = (f"{'article':<26} {'chars':>9} {'tags':>7} {'tokenise':>9} {'dispatch':>9} {'postproc':>9} "
+              f"{'total':>9} {'tags/s':>9} {'peak KiB':>9}")
+    print(header)
+    for name, (parser_class, page) in load_pages(scale).items():
+        if tokenizer != Tokenizer.HTML_PARSER:
+            name = f"{name} [{tokenizer.name.lower()}]"
+        result = measure(parser_class, page, repeat, tokenizer=tokenizer)
+        results[name] = result
+        print(f"{name:<26} {result['chars']:>9} {result['tags']:>7} {result['tokenise_ms']:>9.1f} "
+              f"{result['dispatch_ms']:>9.1f} {result['postprocess_ms']:>9.1f} {result['total_ms']:>9.1f} "
+              f"{result['tags_per_s']:>9.0f} {result['peak_memory_kib']:>9.0f}")
+    print("(times in ms)")
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    if baseline_path.exists():
+        with open(baseline_path, encoding="UTF-8") as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline)
+        print("\n".join(["Regressions against the baseline:"] + regressions) if regressions
+              else "No regressions against the baseline.")
+
+    if save:
+        with open(baseline_path, "w", encoding="UTF-8") as f:
+            baseline.update({name: {key: round(value, 3) for key, value in result.items()}
+                             for name, result in results.items()})
+            json.dump({'python': platform.python_version(), 'scale': scale, 'results': baseline}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved to {baseline_path}")
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(prog='parser_benchmark')
+    arg_parser.add_argument('--scale', type=int, default=10)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--tokenizer', choices=[t.name.lower() for t in Tokenizer],
+                            default=Tokenizer.HTML_PARSER.name.lower())
+    arg_parser.add_argument('--save', action='store_true', help="store the results as the new baseline")
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(logging.CRITICAL)
+    run_benchmark(scale=args.scale, repeat=args.repeat, tokenizer=Tokenizer[args.tokenizer.upper()], save=args.save)
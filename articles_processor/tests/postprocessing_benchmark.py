@@ -0,0 +1,91 @@
+"""Benchmark of the content post-processing (`ArticleHTMLParser.get_content_pipeline()`).
+
+Compares the pipeline against the original sequence of passes and verifies that both produce identical output
+for the raw content of the saved articles (as well as for its scaled-up versions).
+
+Usage (from the repository's root directory):
+    python -m articles_processor.tests.postprocessing_benchmark
+"""
+import logging
+import re
+import timeit
+from pathlib import Path
+from typing import Dict, Type
+
+from articles_processor.charset import decode_page
+from articles_processor.parsers.agora_parser import WysokieObcasyHTMLParser, WyborczaHTMLParser
+from articles_processor.parsers.base_parser import ArticleHTMLParser
+from articles_processor.parsers.okopress_parser import OKOPressHTMLParser
+from articles_processor.parsers.polityka_parser import PolitykaHTMLParser
+from articles_processor.parsers.rzeczpospolita_parser import RzeczpospolitaHTMLParser
+from articles_processor.parsers.wiez_parser import WiezHTMLParser
+
+fixtures_dir: Path = Path(__file__).parent
+
+fixture_parsers: Dict[str, Type[ArticleHTMLParser]] = {
+    'okopress1_': OKOPressHTMLParser,
+    'polityka1_': PolitykaHTMLParser,
+    'rp1_': RzeczpospolitaHTMLParser,
+    'wiez1_': WiezHTMLParser,
+    'wyborcza1_': WyborczaHTMLParser,
+    'wyborcza2_': WyborczaHTMLParser,
+    'wysokieobcasy1_': WysokieObcasyHTMLParser,
+}
+
+
+def legacy_postprocess_content(content: str) -> str:
+    """The original (pass-by-pass) post-processing of the article's content."""
+    content = content.replace(" ", " ")
+    content = content.rstrip()
+    content = content.replace("„", '"')
+    content = content.replace("”", '"')
+    # Remove "orphaned" italics markers.
+    content = re.sub(r"////", "", content)
+    # Remove excessive newlines.
+    content = re.sub(r"\n{2,}", "\n\n", content)
+    # Fix multiple consecutive spaces (unless at the beginning of a line - as part of DokuWiki list syntax).
+    content = re.sub(r"(?<!\n) {2,}", " ", content)
+    # Remove spaces before punctuation.
+    content = re.sub(r" (?=[,\.;])", "", content)
+    # Remove newlines before lowercase latters.
+    content = re.sub(r"\n+(?=[a-z])", "", content)
+    # Remove newlines between list and preceeding paragraph.
+    content = re.sub(r"\n+(?= {2}\*)", "\n", content)
+    return content
+
+
+def load_raw_contents() -> Dict[str, str]:
+    """Content of each saved article, as gathered by its parser (i.e., before the post-processing)."""
+    raw_contents: Dict[str, str] = {}
+    for prefix, parser_class in fixture_parsers.items():
+        input_file_path = next(fixtures_dir.glob(f"{prefix}*"))
+        parser_input, _ = decode_page(input_file_path.read_bytes())
+
+        parser = parser_class()
+        parser.feed(parser_input)
+        parser.close()
+        raw_contents[prefix.rstrip('_')] = parser.output.content_buffer.getvalue()
+    return raw_contents
+
+
+def run_benchmark(scale: int = 10, repeat: int = 20) -> None:
+    raw_contents = load_raw_contents()
+    raw_contents['all (x{})'.format(scale)] = "\n\n".join(raw_contents.values()) * scale
+
+    pipeline = ArticleHTMLParser.get_content_pipeline()
+
+    print(f"{'article':<20} {'chars':>10} {'legacy [ms]':>12} {'pipeline [ms]':>14}")
+    for name, content in raw_contents.items():
+        if legacy_postprocess_content(content) != pipeline(content):
+            raise AssertionError(f"Different output of the post-processing for: {name}")
+
+        legacy_time = timeit.timeit(lambda: legacy_postprocess_content(content), number=repeat) / repeat
+        pipeline_time = timeit.timeit(lambda: pipeline(content), number=repeat) / repeat
+        print(f"{name:<20} {len(content):>10} {legacy_time * 1000:>12.3f} {pipeline_time * 1000:>14.3f}")
+
+    print("Output identical for all articles.")
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.CRITICAL)
+    run_benchmark()
@@ -1,15 +1,37 @@
+import gzip
+import io
+import json
 import logging
+import random
 import re
+import sys
+import tempfile
+import threading
 import unittest
-from datetime import date
+from datetime import date, datetime
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
-from articles_processor.parser_types import OutputData
+from articles_processor.batch_processor import gather_input_files, process_articles, summarize
+from articles_processor.fetching import Fetcher
+from articles_processor.lxml_tokenizer import LxmlTokenizer
+from articles_processor.parser_registry import HeadInfo, ParserRegistry, default_parser_registry, sniff_head
+from articles_processor.parser_types import OutputData, ContentBuffer, DataError
 from articles_processor.parsers.agora_parser import WysokieObcasyHTMLParser, WyborczaHTMLParser
 from articles_processor.parsers.okopress_parser import OKOPressHTMLParser
+from articles_processor.parsers.pap_parser import PapHTMLParser
 from articles_processor.parsers.polityka_parser import PolitykaHTMLParser
 from articles_processor.parsers.rzeczpospolita_parser import RzeczpospolitaHTMLParser
 from articles_processor.parsers.wiez_parser import WiezHTMLParser
+from articles_processor.parsers.base_parser import ArticleHTMLParser, TagClass, TagData, Tokenizer
+from articles_processor.processing import fix_meta_charset, parse_file, parse_stream, read_head
+from articles_processor.profiling import ParserProfiler
+from articles_processor.result_cache import ResultCache, get_parser_fingerprint, hash_file
+from articles_processor.charset import CharsetSource, DetectedCharset, decode_page, detect_charset, sniff_size
+from articles_processor.streaming import DecodedChunks, feed_chunks, iter_binary_chunks
+from articles_processor.tests.postprocessing_benchmark import fixture_parsers, legacy_postprocess_content
+from commons_lib.html_parser import BasicHTMLParser, TagTracer
 
 
 class TestSum(unittest.TestCase):
@@ -28,6 +50,7 @@ class TestSum(unittest.TestCase):
             parser_input = ''.join(file_content)
         parser = WiezHTMLParser()
         parser.feed(parser_input)
+        parser.close()
         output: OutputData = parser.output
 
         self.assertEqual("Karol Wojtyła, Ekke Overbeek, pedofilia i SB", output.title)
@@ -67,6 +90,7 @@ class TestSum(unittest.TestCase):
             parser_input = ''.join(file_content)
         parser = WysokieObcasyHTMLParser()
         parser.feed(parser_input)
+        parser.close()
         output: OutputData = parser.output
 
         self.assertEqual("Córka współzałożyciela Oddziału Zamkniętego: Czułam, że jestem skazana na uzależnienia",
@@ -143,6 +167,7 @@ class TestSum(unittest.TestCase):
             parser_input = ''.join(file_content)
         parser = OKOPressHTMLParser()
         parser.feed(parser_input)
+        parser.close()
         output: OutputData = parser.output
 
         self.assertEqual("Iustitia: Nie daliśmy się złamać przez 8 lat, wygramy. Walczymy o nowoczesne sądy i nową KRS",
@@ -250,6 +275,7 @@ class TestSum(unittest.TestCase):
             parser_input = ''.join(file_content)
         parser = PolitykaHTMLParser()
         parser.feed(parser_input)
+        parser.close()
         output: OutputData = parser.output
 
         self.assertEqual("Karol Wojtyła wiedział o złu w Kościele. Dorabianie usprawiedliwień jest kolejnym złem",
@@ -290,6 +316,7 @@ class TestSum(unittest.TestCase):
             parser_input = ''.join(file_content)
         parser = WyborczaHTMLParser()
         parser.feed(parser_input)
+        parser.close()
         output: OutputData = parser.output
 
         self.assertEqual("Jacek Dehnel do Marcina Matczaka: Wierzący nie wierzą w niewierzących",
@@ -365,6 +392,7 @@ class TestSum(unittest.TestCase):
             parser_input = ''.join(file_content)
         parser = WyborczaHTMLParser()
         parser.feed(parser_input)
+        parser.close()
         output: OutputData = parser.output
 
         self.assertEqual(
@@ -481,6 +509,7 @@ class TestSum(unittest.TestCase):
             parser_input = ''.join(file_content)
         parser = RzeczpospolitaHTMLParser()
         parser.feed(parser_input)
+        parser.close()
         output: OutputData = parser.output
 
         self.assertEqual("Wojtyła do księdza-pedofila: Każde przestępstwo winno być ukarane",
@@ -532,6 +561,425 @@ class TestSum(unittest.TestCase):
             'https://www.rp.pl/plus-minus/art37480941-wiedzial-wojtyla-wiedziala-sb-ksiadz-pedofil-latami-krzywdzil-chlopcow',
         ], output.links)
 
+    def test_content_buffer(self):
+        buffer = ContentBuffer()
+        self.assertFalse(buffer)
+        self.assertEqual("", buffer.last_char)
+
+        buffer += "Lorem"
+        buffer += ""
+        buffer += " ip"
+        buffer += "s"
+        self.assertTrue(buffer)
+        self.assertEqual("s", buffer.last_char)
+        self.assertTrue(buffer.endswith("m ips"))
+        self.assertFalse(buffer.endswith(" "))
+        self.assertEqual("Lorem ips", buffer.getvalue())
+
+    def test_content_pipeline(self):
+        pipeline = ArticleHTMLParser.get_content_pipeline()
+
+        chunks = ['\n', '\n', ' ', ' ', 'a', 'A', ',', '.', ';', '*', '//', '\u00a0', '„', '”', '  * ']
+        rng = random.Random(0)
+        for _ in range(20000):
+            content = ''.join(rng.choice(chunks) for _ in range(rng.randint(0, 20)))
+            self.assertEqual(legacy_postprocess_content(content), pipeline(content), repr(content))
+
+    def test_early_exit(self):
+        input_file_path: Path = Path(".") / """
+        rp1_Wojtyła do księdza-pedofila Każde przestępstwo winno być ukarane - rp.pl.html
+        """.strip()
+        parser_input = input_file_path.read_text(encoding='utf-8')
+
+        parser = RzeczpospolitaHTMLParser()
+        parser.feed(parser_input)
+        parser.close()
+        early_exit_parser = RzeczpospolitaHTMLParser(early_exit=True)
+        early_exit_parser.feed(parser_input)
+        early_exit_parser.close()
+
+        self.assertEqual(parser.output, early_exit_parser.output)
+        self.assertLess(early_exit_parser.tag_no, parser.tag_no)
+
+    def test_charset_detection(self):
+        meta = b'<head>\n<meta http-equiv="Content-Type"\n content="text/html; charset=ISO-8859-2">'
+        self.assertEqual(DetectedCharset('iso-8859-2', CharsetSource.META), detect_charset(meta))
+        self.assertEqual(DetectedCharset('windows-1250', CharsetSource.HTTP_HEADER),
+                         detect_charset(meta, content_type='text/html; charset="windows-1250"'))
+        self.assertEqual(DetectedCharset('utf-8', CharsetSource.BOM, bom_length=3),
+                         detect_charset(b'\xef\xbb\xbf' + meta, content_type='text/html; charset=windows-1250'))
+        self.assertEqual(DetectedCharset('utf-8', CharsetSource.META), detect_charset(b'<meta charset="utf-8">'))
+        self.assertEqual(DetectedCharset('iso-8859-2', CharsetSource.META),
+                         detect_charset(b'<meta charset="no-such-charset"><meta charset=iso-8859-2>'))
+        self.assertEqual(DetectedCharset('utf-8', CharsetSource.DEFAULT), detect_charset('<p>Zażółć'.encode()))
+        self.assertEqual(DetectedCharset('iso-8859-2', CharsetSource.DEFAULT),
+                         detect_charset('<p>Zażółć'.encode('iso-8859-2')))
+
+        self.assertEqual(("<p>Zażółć</p>", DetectedCharset('utf-8', CharsetSource.BOM, bom_length=3)),
+                         decode_page(b'\xef\xbb\xbf' + "<p>Zażółć</p>".encode()))
+
+        # Undeclared pages which are valid UTF-8 only within the sniffed bytes.
+        page = b'<p>' * sniff_size + "<p>Zażółć</p>".encode('iso-8859-2')
+        self.assertEqual((page.decode('iso-8859-2'), DetectedCharset('iso-8859-2', CharsetSource.DEFAULT)),
+                         decode_page(page))
+        for chunk_size in [1, 1000]:
+            chunks = DecodedChunks(page[i:i + chunk_size] for i in range(0, len(page), chunk_size))
+            self.assertEqual('utf-8', chunks.charset)
+            self.assertEqual(page.decode('iso-8859-2'), "".join(chunks))
+            self.assertEqual('iso-8859-2', chunks.charset)
+
+    def test_chunked_feed(self):
+        input_file_path: Path = Path(".") / """
+        wyborcza1_Jacek Dehnel do Marcina Matczaka Wierzący nie wierzą w niewierzących.html
+        """.strip()
+
+        expected_output = WyborczaHTMLParser().parse(input_file_path.read_text(encoding='iso-8859-2'))
+        for chunk_size in [1, 1000]:
+            with open(input_file_path, "rb") as f:
+                chunks = DecodedChunks(iter_binary_chunks(f, size=chunk_size))
+                self.assertEqual('iso-8859-2', chunks.charset)
+                self.assertEqual(expected_output, feed_chunks(WyborczaHTMLParser(), chunks))
+
+    def test_small_stream_reads(self):
+        class TricklingStream(io.BytesIO):
+            """A stream (e.g., a socket) returning fewer bytes than requested."""
+
+            def read(self, size=-1):
+                return super().read(1000)
+
+        input_file_path: Path = Path(".") / """
+        wyborcza1_Jacek Dehnel do Marcina Matczaka Wierzący nie wierzą w niewierzących.html
+        """.strip()
+        # The `<meta charset>` tag is past the first 1000 bytes.
+        self.assertGreater(input_file_path.read_bytes().index(b'<meta charset='), 1000)
+
+        with open(input_file_path, "rb") as f:
+            expected_output = parse_stream(f)
+        self.assertEqual(expected_output, parse_stream(TricklingStream(input_file_path.read_bytes())))
+
+        # The canonical URL (identifying the parser) is past the charset sniffing window.
+        page = input_file_path.read_bytes().replace(b'<head>', b'<head>' + b'<meta name="x" content="y">' * 700, 1)
+        self.assertGreater(page.index(b'rel="canonical"'), 2 * sniff_size)
+        content_type = 'text/html; charset=iso-8859-2'
+        self.assertEqual(parse_stream(io.BytesIO(page), content_type=content_type),
+                         parse_stream(TricklingStream(page), content_type=content_type))
+        # So is the `<meta charset>` tag (the page isn't valid UTF-8 only past it).
+        self.assertEqual(parse_stream(io.BytesIO(page), content_type=content_type), parse_stream(TricklingStream(page)))
+
+        self.assertEqual('<head><title>1</title><meta charset="utf-8" /></he' + 'ad>',
+                         fix_meta_charset(read_head(iter(['<head><title>1</title><me', 'ta charset="utf-8"', '></he',
+                                                          'ad>', '<p>2</p>']), size=10)))
+        self.assertEqual('<p>1</p><p>2</p>', read_head(iter(['<p>1</p>', '<p>2</p>']), size=1))
+
+    def test_batch_processor(self):
+        input_file_paths = gather_input_files([Path(".")])
+        self.assertEqual(8, len(input_file_paths))
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = process_articles(input_file_paths, Path(output_dir), workers=2)
+
+            self.assertEqual(input_file_paths, [result.input_file_path for result in results])
+            failures = [result.input_file_path.name for result in results if result.failure]
+            self.assertEqual(1, len(failures))
+            self.assertTrue(failures[0].startswith('rp_arch_1_'))
+            for result in results:
+                if not result.failure:
+                    self.assertTrue(result.output_file_path.is_file())
+
+            self.assertIn(f"{DataError.NO_AUTHOR.name}: ", summarize(results, elapsed=1.0))
+
+    def test_parser_registry(self):
+        self.assertEqual(
+            HeadInfo(canonical_url='https://x.wyborcza.pl/a.html', refresh_url='https://wyborcza.pl/b.html',
+                     application_name='Polityka'),
+            sniff_head('<html><head><meta content="Polityka" name="application-name">'
+                       '<meta http-equiv="Refresh" content="0; URL=https://wyborcza.pl/b.html">'
+                       "<link href='https://x.wyborcza.pl/a.html' rel='canonical' />"
+                       '</head><body><link rel="canonical" href="https://oko.press/"></body></html>'))
+
+        self.assertIs(WyborczaHTMLParser, default_parser_registry.find(HeadInfo(canonical_url='https://x.wyborcza.pl/a')))
+        self.assertIs(WysokieObcasyHTMLParser,
+                      default_parser_registry.find(HeadInfo(canonical_url='https://www.wysokieobcasy.pl/a')))
+        self.assertIs(PolitykaHTMLParser, default_parser_registry.find(HeadInfo(application_name='Polityka')))
+        self.assertIsNone(default_parser_registry.find(HeadInfo(canonical_url='https://example.com/wiez.pl/')))
+        with self.assertRaises(ValueError):
+            ParserRegistry([WiezHTMLParser, WiezHTMLParser])
+
+        expected_parsers = {
+            'okopress1_': OKOPressHTMLParser,
+            'polityka1_': PolitykaHTMLParser,
+            'rp1_': RzeczpospolitaHTMLParser,
+            'wiez1_': WiezHTMLParser,
+            'wyborcza1_': WyborczaHTMLParser,
+            'wyborcza2_': WyborczaHTMLParser,
+            'wysokieobcasy1_': WysokieObcasyHTMLParser,
+        }
+        for prefix, parser_class in expected_parsers.items():
+            input_file_path = next(Path(".").glob(f"{prefix}*"))
+            page = input_file_path.read_bytes().decode('utf-8', errors='replace')
+            self.assertIs(parser_class, default_parser_registry.get_parser_class(page))
+
+        with self.assertRaises(NotImplementedError):
+            default_parser_registry.get_parser_class(next(Path(".").glob("rp_arch_1_*")).read_text(encoding='utf-8'))
+
+    def test_result_cache(self):
+        input_file_path = next(Path(".").glob("wiez1_*"))
+        content_hash = hash_file(input_file_path)
+        self.assertNotEqual(get_parser_fingerprint(WiezHTMLParser), get_parser_fingerprint(OKOPressHTMLParser))
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ResultCache(Path(cache_dir))
+            self.assertIsNone(cache.load(content_hash, WiezHTMLParser))
+
+            output = parse_file(input_file_path, cache=cache)
+            self.assertEqual(output, cache.load(content_hash, WiezHTMLParser))
+            self.assertEqual(output, parse_file(input_file_path, cache=cache))
+
+            # An entry of an outdated version of the parser is replaced.
+            entry_path = cache.get_entry_path(content_hash, WiezHTMLParser)
+            stale_entry_path = entry_path.with_name(f"{content_hash}-0000000000000000.pickle")
+            entry_path.rename(stale_entry_path)
+            self.assertIsNone(cache.load(content_hash, WiezHTMLParser))
+            cache.store(content_hash, WiezHTMLParser, output)
+            self.assertEqual([entry_path], list(entry_path.parent.iterdir()))
+
+    def test_fetcher(self):
+        page = '<html><head><meta charset="iso-8859-2"></head><body>Zażółć</body></html>'.encode('iso-8859-2')
+        requests = []
+
+        class StandInHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                requests.append((self.client_address, self.path, dict(self.headers)))
+                if self.path == '/old':
+                    self.send_response(301)
+                    self.send_header('Location', '/page')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                elif self.headers.get('If-None-Match') == '"v1"':
+                    self.send_response(304)
+                    self.send_header('ETag', '"v1"')
+                    self.end_headers()
+                else:
+                    body = gzip.compress(page)
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/html')
+                    self.send_header('Content-Encoding', 'gzip')
+                    self.send_header('ETag', '"v1"')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with tempfile.TemporaryDirectory() as cache_dir, Fetcher(cache_dir=Path(cache_dir)) as fetcher:
+                fetched = fetcher.fetch(f"{base_url}/old")
+                self.assertEqual(f"{base_url}/page", fetched.url)
+                self.assertEqual(page, fetched.content)
+                self.assertFalse(fetched.from_cache)
+
+                fetched = fetcher.fetch(f"{base_url}/old")
+                self.assertTrue(fetched.from_cache)
+                self.assertEqual(page, fetched.content)
+                self.assertEqual('"v1"', requests[-1][2].get('If-None-Match'))
+                self.assertIn('gzip', requests[-1][2].get('Accept-Encoding'))
+
+                # Decoding with another charset uses the fetched bytes.
+                self.assertIn('Zażółć', fetched.decode())
+                self.assertNotIn('Zażółć', fetched.decode('latin-1'))
+                self.assertEqual(4, len(requests))
+
+                # All the requests were sent over a single connection.
+                self.assertEqual(1, len({client_address for client_address, _, _ in requests}))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_tag_tracer(self):
+        trace = io.StringIO()
+        parser = WiezHTMLParser(tracer=TagTracer(output=trace, log=False))
+        parser.feed('<html><body><p class="x">Lorem<br/></p></body></html>')
+        parser.close()
+
+        records = [json.loads(line) for line in trace.getvalue().splitlines()]
+        self.assertEqual(['start', 'start', 'start', 'startend', 'end', 'end', 'end'],
+                         [r['event'] for r in records])
+        self.assertEqual({'event': 'start', 'tag': 'p', 'level': 2, 'status': 'P', 'attrs': {'class': 'x'}},
+                         records[2])
+        self.assertEqual(3, records[3]['level'])
+        self.assertEqual(0, records[-1]['level'])
+
+    def test_parser_profiler(self):
+        parser_input = next(Path(".").glob("rp1_*")).read_text(encoding='utf-8')
+
+        output = RzeczpospolitaHTMLParser().parse(parser_input)
+        profiled_parser = RzeczpospolitaHTMLParser(profiler=ParserProfiler())
+        profiled_output = profiled_parser.parse(parser_input)
+
+        self.assertEqual(output, profiled_output)
+        self.assertIsNone(output.profile)
+        phases = profiled_output.profile.phases
+        self.assertEqual(set(ParserProfiler.profiled_methods), set(phases))
+        self.assertTrue(0 < phases['handle_starttag'].calls <= profiled_parser.tag_no)
+        self.assertEqual(1, phases['finalize_output'].calls)
+        self.assertGreaterEqual(phases['decode_json_ld'].calls, 1)
+        self.assertGreater(phases['handle_data'].total_time, 0)
+        with self.assertRaises(ValueError):
+            profiled_parser.set_profiler(ParserProfiler())
+
+    def test_lxml_tokenizer(self):
+        for prefix, parser_class in fixture_parsers.items():
+            with self.subTest(prefix):
+                parser_input, _ = decode_page(next(Path(".").glob(f"{prefix}*")).read_bytes())
+                expected_output = parser_class().parse(parser_input)
+
+                self.assertEqual(expected_output, parser_class(tokenizer=Tokenizer.LXML).parse(parser_input))
+                self.assertEqual(expected_output,
+                                 parser_class(tokenizer=Tokenizer.LXML, early_exit=True).parse(parser_input))
+
+                parser = parser_class(tokenizer=Tokenizer.LXML)
+                self.assertEqual(expected_output,
+                                 feed_chunks(parser, (parser_input[i:i + 1000]
+                                                      for i in range(0, len(parser_input), 1000))))
+
+    def test_bibliography_only(self):
+        def get_record(output: OutputData):
+            return output.title, output.author, output.pub_date, output.url
+
+        exited_early = set()
+        for prefix, parser_class in fixture_parsers.items():
+            with self.subTest(prefix):
+                parser_input, _ = decode_page(next(Path(".").glob(f"{prefix}*")).read_bytes())
+                expected_output = parser_class().parse(parser_input)
+
+                parser = parser_class(bibliography_only=True)
+                self.assertEqual(get_record(expected_output), get_record(parser.parse(parser_input)))
+                if parser.exited_early:
+                    exited_early.add(prefix)
+                    self.assertLess(parser.tag_no, 200)
+        # Pages with the whole bibliography record in JSON-LD.
+        self.assertTrue({'okopress1_', 'wiez1_', 'wyborcza1_', 'wysokieobcasy1_'} <= exited_early)
+
+    def test_void_elements(self):
+        class EventsRecorder(HTMLParser):
+            def __init__(self):
+                super().__init__()
+                self.events: list = []
+
+            def handle_starttag(self, tag, attrs):
+                self.events.append(('start', tag, attrs))
+
+            def handle_startendtag(self, tag, attrs):
+                self.events.append(('startend', tag, attrs))
+
+            def handle_endtag(self, tag):
+                self.events.append(('end', tag))
+
+        page = ('<html><head><meta charset="utf-8"><link rel="canonical" href="/a"/></head><body><p>'
+                '1<br>2<br/>3<BR />4<img src=x/>5<img alt="1/"/>6<input disabled=""/>7<!-- <br/> -->'
+                '<script>var s = "<img/>";</script></p><hr></body></html>')
+        html_parser = EventsRecorder()
+        html_parser.feed(page)
+        html_parser.close()
+        # `HTMLParser` reports `<br>` as a start tag, `<br/>` as a start-end tag (and the `/` of `src=x/` is
+        # a part of the value) - the lxml tokenizer must report them the same way (however the page is chunked).
+        self.assertEqual([('start', 'br'), ('startend', 'br'), ('startend', 'br'), ('start', 'img'),
+                          ('startend', 'img'), ('startend', 'input'), ('start', 'hr')],
+                         [event[:2] for event in html_parser.events if event[1] in {'br', 'img', 'input', 'hr'}])
+        for chunk_size in [len(page), 1]:
+            with self.subTest(chunk_size):
+                lxml_parser = EventsRecorder()
+                tokenizer = LxmlTokenizer(lxml_parser)
+                for i in range(0, len(page), chunk_size):
+                    tokenizer.feed(page[i:i + chunk_size])
+                tokenizer.close()
+                self.assertEqual(html_parser.events, lxml_parser.events)
+
+    def test_self_closing_meta(self):
+        # Self-closing `<meta/>` tags are start-end tags - the dates of the sites' `<meta>` tags aren't parsed
+        # from them (so a self-closing one without a `content` doesn't fail the page).
+        page = ('<html><head><meta name="pubdate" content="2023/01/02 03:04:05">'
+                '<meta name="lastupdated"/><meta name="lastupdated" content="not a date" />'
+                '</head><body></body></html>')
+        for tokenizer in Tokenizer:
+            with self.subTest(tokenizer):
+                output = WyborczaHTMLParser(tokenizer=tokenizer).parse(page)
+                self.assertEqual(datetime(2023, 1, 2, 3, 4, 5), output.pub_date)
+                self.assertIsNone(output.last_updated)
+
+    def test_tag_classes(self):
+        td = TagData(tag='div', attrs={'class': 'cell  large-11\tpadding'})
+        self.assertEqual(frozenset({'cell', 'large-11', 'padding'}), td.classes)
+        self.assertEqual(frozenset(), TagData(tag='div', attrs={}).classes)
+        self.assertEqual(frozenset(), TagData(tag='div', attrs={'class': {'a', 'b'}}).classes)
+
+        self.assertTrue(TagClass('div', 'cell', 'large-11').matches(td))
+        self.assertTrue(TagClass(['p', 'div'], 'cell').matches(td))
+        self.assertFalse(TagClass('p', 'cell').matches(td))
+        self.assertFalse(TagClass('div', 'cell').matches(TagData(tag='div', attrs={})))
+        # Substrings of the `class` attribute, as the sites' predicates always matched.
+        self.assertTrue(TagClass('div', 'large-1').matches(td))
+        self.assertTrue(OKOPressHTMLParser.is_contnet_tag(TagData(tag='div', attrs={'class': 'xl:mt-16'})))
+        self.assertFalse(OKOPressHTMLParser.is_contnet_tag(TagData(tag='p', attrs={'class': 'mt-16'})))
+        self.assertTrue(WiezHTMLParser.is_contnet_tag(TagData(tag='div', attrs={'class': 'cell xlarge-11'})))
+        self.assertFalse(WiezHTMLParser.is_contnet_tag(TagData(tag='div', attrs={'class': 'cell'})))
+        # `mt-1` excludes the `mt-16` paragraphs as well.
+        self.assertFalse(OKOPressHTMLParser.is_text_paragraph(TagData(tag='p', attrs={'class': 'mt-16'})))
+
+        page = ('<html><body><div class="cg_article_printed_info_details">Tygodnik Polityka 12/2023</div>'
+                '<div class="cg_article_content"><p>Body text</p></div></body></html>')
+        for parser_class, expected_content in [(PolitykaHTMLParser, "Tygodnik Polityka 12/2023Body text"),
+                                               (PapHTMLParser, "Tygodnik Polityka 12/2023")]:
+            with self.subTest(parser_class.__name__):
+                parser = parser_class()
+                parser.feed(page)
+                parser.close()
+                self.assertEqual(expected_content, parser.output.content)
+
+    def test_compact_tags(self):
+        parser = WiezHTMLParser()
+        parser.feed('<html><body><div class="single__post__content"><p>Lorem <i>')
+        p_entry = parser.tag_hierarchy[-1]
+        self.assertFalse(hasattr(p_entry, '__dict__'))
+        self.assertFalse(hasattr(p_entry.td, '__dict__'))
+        # Attribute-less tags share a single (empty) dict.
+        self.assertEqual({}, p_entry.td.attrs)
+        self.assertIs(parser.tag_hierarchy[0].td.attrs, p_entry.td.attrs)
+        self.assertIs(sys.intern('p'), p_entry.td.tag)
+
+    def test_basic_html_parser(self):
+        class LinksParser(BasicHTMLParser):
+            """A scraper-like parser (cf. `RegionGravesHTMLParser`)."""
+
+            def __init__(self):
+                super().__init__()
+                self.output: list = []
+
+            def process_starttag(self):
+                if self.current_tag.td.tag == 'a' and 'box' in self.current_tag.td.classes:
+                    self.output.append([self.current_tag.td.attrs['href']])
+
+            def process_data(self):
+                # Data is passed on regardless of the ignored ancestors.
+                if (self.current_tag.td.tag == 'span' and self.tag_hierarchy[-2].td.tag == 'a'
+                        and not self.is_ignored_in_hierarchy()):
+                    self.output[-1].append(self.current_tag.td.data)
+
+        parser = LinksParser()
+        parser.feed('<div><a class="box" href="/1"><img src="1.png"><span>One</span></a>'
+                    '<button><a class="box" href="/2"><span>Two</span></a></button>'
+                    '<a class="box wide" href="/3"><br/><span>Three</span></a></div></p>')
+        parser.close()
+        self.assertEqual([['/1', 'One'], ['/3', 'Three']], parser.output)
+        self.assertEqual([], parser.tag_hierarchy)
+        self.assertEqual(0, parser.ignored_ancestors)
+
 
 if __name__ == '__main__':
     root = logging.getLogger()
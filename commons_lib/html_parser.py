@@ -1,9 +1,13 @@
+import json
 import logging
-from abc import ABC, abstractmethod
+import sys
+from abc import ABC
 from dataclasses import dataclass
 from enum import auto, Enum
+from functools import cache, cached_property
 from html.parser import HTMLParser
-from typing import List, Optional, Tuple, Dict, Union, Pattern
+from pathlib import Path
+from typing import List, Optional, Tuple, Dict, Union, Pattern, Callable, Iterable, Set, ClassVar, TextIO, FrozenSet
 
 
 def clean_text(s: str) -> str:
@@ -11,12 +15,28 @@ def clean_text(s: str) -> str:
     return s
 
 
-@dataclass
+no_attrs: Dict[str, str] = {}
+"Attributes of all the tags having none (shared, so that no dict is created per tag) - never modify it."
+
+
+@dataclass(slots=True)
 class TagData:
     tag: str
     attrs: Optional[dict]
     data: Optional[str] = None
 
+    @property
+    def class_attr(self) -> Optional[str]:
+        """The `class` attribute (`None` if missing - or if it's a rule's pattern or set, see `TagMatcher`)."""
+        class_attr = self.attrs.get('class') if self.attrs else None
+        return class_attr if isinstance(class_attr, str) else None
+
+    @property
+    def classes(self) -> FrozenSet[str]:
+        """Tokens of the `class` attribute."""
+        class_attr = self.class_attr
+        return frozenset(class_attr.split()) if class_attr else frozenset()
+
     @property
     def cleaned_data(self) -> str:
         return clean_text(self.data) if self.data else ""
@@ -27,20 +47,175 @@ class TagStatus(Enum):
     PROCESSED = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class TagEntry:
     td: TagData
     status: TagStatus
     tag_no: int
     level: int
+    is_content_tag: bool = False
+    "Used by parsers tracking the content of the page (e.g., `ArticleHTMLParser`)."
+
+
+void_elements: FrozenSet[str] = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr',
+})
+"Elements which have no end tag (whether or not written as `<tag/>`)."
+
+heading_tags: FrozenSet[str] = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+
+
+class TagClass:
+    """Rule "tag X (or one of the tags X) whose `class` attribute contains all the strings Y".
+
+    Substrings, not class tokens - e.g., `TagClass('div', 'mt-16')` matches `<div class="xl:mt-16">` as well.
+    """
+
+    def __init__(self, tags: Union[str, Iterable[str]], *classes: str):
+        self.tags: FrozenSet[str] = frozenset({tags} if isinstance(tags, str) else tags)
+        self.classes: FrozenSet[str] = frozenset(classes)
+
+    def matches(self, td: TagData) -> bool:
+        if td.tag not in self.tags or (class_attr := td.class_attr) is None:
+            return False
+        return all(c in class_attr for c in self.classes)
+
+    def __repr__(self):
+        return f"TagClass({sorted(self.tags)}, {sorted(self.classes)})"
+
+
+def matches_any(td: TagData, rules: Tuple[TagClass, ...]) -> bool:
+    return any(rule.matches(td) for rule in rules)
+
+
+AttrsPredicate = Callable[[Optional[dict]], bool]
+
+
+class TagMatcher:
+    """A set of `TagData` rules compiled into predicates grouped by the tag name.
+
+    A rule matches a tag when the tag names are equal and:
+    - rule's `attrs` is `None` -> the tag has no attributes,
+    - otherwise, for each rule's attribute the tag has that attribute and its value contains
+      the given substring (`str`), matches the given pattern (`Pattern`) or fulfills all
+      the conditions from the given `set`.
+    """
+
+    def __init__(self, rules: Iterable[TagData]):
+        self.unconditional_tags: Set[str] = set()
+        "Tags matched regardless of their attributes."
+        self.predicates: Dict[str, List[AttrsPredicate]] = {}
+
+        for rule in rules:
+            if rule.attrs is not None and not rule.attrs:
+                self.unconditional_tags.add(rule.tag)
+            else:
+                self.predicates.setdefault(rule.tag, []).append(self.compile_rule(rule))
+
+        for tag in self.unconditional_tags:
+            self.predicates.pop(tag, None)
+
+    @staticmethod
+    def compile_value_check(value: Union[str, Pattern]) -> Callable[[str], bool]:
+        if isinstance(value, str):
+            return lambda target: value in target
+        elif isinstance(value, Pattern):
+            search = value.search
+            return lambda target: search(target) is not None
+        else:
+            raise TypeError(f"type(v): {type(value)}")
+
+    @classmethod
+    def compile_rule(cls, rule: TagData) -> AttrsPredicate:
+        if rule.attrs is None:
+            return lambda attrs: not attrs
+
+        checks: List[Tuple[str, Tuple[Callable[[str], bool], ...]]] = []
+        for attr, val in rule.attrs.items():
+            if isinstance(val, (str, Pattern)):
+                checks.append((attr, (cls.compile_value_check(val),)))
+            elif isinstance(val, set):
+                checks.append((attr, tuple(cls.compile_value_check(v) for v in val)))
+            else:
+                raise ValueError(f'Invalid attr value: {attr} -> {val}')
+
+        def predicate(attrs: Optional[dict]) -> bool:
+            for attr, value_checks in checks:
+                if attr not in attrs:
+                    return False
+                target = attrs[attr]
+                for value_check in value_checks:
+                    if not value_check(target):
+                        return False
+            return True
+
+        return predicate
+
+    def matches(self, td: TagData) -> bool:
+        if td.tag in self.unconditional_tags:
+            return True
+        predicates = self.predicates.get(td.tag)
+        if predicates is None:
+            return False
+        return any(predicate(td.attrs) for predicate in predicates)
+
+
+class TagTracer:
+    """Trace of the tags processed by a parser (e.g., to debug changes in a site's layout).
+
+    Each event is logged at the DEBUG level (if `log` is set) and/or written to `output` as a JSON line:
+    `{"event": "start" | "end" | "startend", "tag": ..., "level": ..., "status": ..., "attrs": ...}`.
+
+    Parsers hold `tracer = None` by default, so with tracing disabled no trace message is built at all.
+    """
+
+    def __init__(self, output: Optional[TextIO] = None, log: bool = True):
+        self.output: Optional[TextIO] = output
+        self.log: bool = log
+
+    @classmethod
+    def to_file(cls, path: Path, log: bool = False) -> 'TagTracer':
+        return cls(output=open(path, "w", encoding="UTF-8"), log=log)
+
+    def trace(self, event: str, tag: str, level: int, attrs: Optional[dict], status: str = "") -> None:
+        if self.log:
+            tabs: str = "  " * level
+            if event == 'end':
+                logging.debug(f"{tabs}/{tag} {attrs}")
+            else:
+                logging.debug(f"{tabs}{tag}{'(/)' if event == 'startend' else ''} <{status}> {attrs}")
+
+        if self.output is not None:
+            record = {'event': event, 'tag': tag, 'level': level, 'status': status, 'attrs': attrs}
+            self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        if self.output is not None:
+            self.output.close()
+
+    def __enter__(self) -> 'TagTracer':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
 
 class BasicHTMLParser(HTMLParser, ABC):
-    def __init__(self):
+    """The core shared by the HTML parsers: tracking of the tags' hierarchy and of the ignored tags.
+
+    The `handle_*()` methods keep the hierarchy up to date and pass the events to the `dispatch_*()` methods,
+    which (by default) call the `process_*()` hooks for the tags not being ignored.
+    """
+
+    def __init__(self, tracer: Optional[TagTracer] = None):
         super().__init__()
+        self.tracer: Optional[TagTracer] = tracer
+        "Tracing of the processed tags (disabled if `None`)."
         self.level: int = 0
         self.tag_no = 0
         self.tag_hierarchy: List[TagEntry] = []
+        self.ignored_ancestors: int = 0
+        "Number of entries in `tag_hierarchy` with status `IGNORED`."
         self.stop_processing: bool = False
         "No further tags should be (actively) processed."
 
@@ -48,59 +223,101 @@ class BasicHTMLParser(HTMLParser, ABC):
     def current_tag(self) -> Optional[TagEntry]:
         return self.tag_hierarchy[-1] if self.tag_hierarchy else None
 
-    @staticmethod
-    def get_tags_to_ignore() -> List[TagData]:
-        return [
-            TagData(tag='img', attrs={}),
-            TagData(tag='button', attrs={}),
-            TagData(tag='figcaption', attrs={}),
-            TagData(tag='script', attrs={'type': 'text/javascript'}),
-            TagData(tag='script', attrs=None),
-            TagData(tag='picture', attrs=None),
-        ]
-
-    @staticmethod
-    def get_tags_with_suppressed_validation() -> List[TagData]:
+    tags_to_ignore_by_default: ClassVar[Tuple[TagData, ...]] = (
+        TagData(tag='img', attrs={}),
+        TagData(tag='button', attrs={}),
+        TagData(tag='figcaption', attrs={}),
+        TagData(tag='script', attrs={'type': 'text/javascript'}),
+        TagData(tag='script', attrs=None),
+        TagData(tag='picture', attrs=None),
+    )
+
+    tags_with_suppressed_validation_by_default: ClassVar[Tuple[TagData, ...]] = (
+        TagData(tag='i', attrs={}),
+    )
+
+    @classmethod
+    def get_tags_to_ignore(cls) -> Tuple[TagData, ...]:
+        return BasicHTMLParser.tags_to_ignore_by_default
+
+    @classmethod
+    def get_tags_with_suppressed_validation(cls) -> Tuple[TagData, ...]:
         """Tags for which no 'unhandled' error should be issued."""
-        return [
-            TagData(tag='i', attrs={}),
-        ]
+        return BasicHTMLParser.tags_with_suppressed_validation_by_default
+
+    def get_instance_tags_to_ignore(self) -> Tuple[TagData, ...]:
+        """Ignore rules depending on the state of the parser (not cached at the class level)."""
+        return ()
+
+    def get_instance_tags_with_suppressed_validation(self) -> Tuple[TagData, ...]:
+        """Suppressed-validation rules depending on the state of the parser (not cached at the class level)."""
+        return ()
 
     @staticmethod
     def parse_attrs(attrs_as_list: List[Tuple]) -> Dict[str, str]:
-        return {k: v for k, v in attrs_as_list}
+        return dict(attrs_as_list) if attrs_as_list else no_attrs
+
+    def push_tag(self, entry: TagEntry) -> None:
+        if entry.status == TagStatus.IGNORED:
+            self.ignored_ancestors += 1
+        self.tag_hierarchy.append(entry)
+
+    def pop_tag(self) -> TagEntry:
+        entry = self.tag_hierarchy.pop()
+        if entry.status == TagStatus.IGNORED:
+            self.ignored_ancestors -= 1
+        return entry
+
+    def set_tag_status(self, entry: TagEntry, status: TagStatus) -> None:
+        """Change the status of an entry already in `tag_hierarchy` (keeps the counters consistent)."""
+        if entry.status == status:
+            return
+        self.ignored_ancestors += 1 if status == TagStatus.IGNORED else -1
+        entry.status = status
 
     def handle_startendtag(self, tag, attrs):
+        tag = sys.intern(tag)
         self.tag_no += 1
 
-        tabs: str = "".join(self.level * ['  '])
-        status_str: str = "P"
-        logging.debug(f"{tabs}{tag}(/) <{status_str}> {self.parse_attrs(attrs)}")
-
         current_tag = TagData(tag=tag, attrs=self.parse_attrs(attrs))
+        if self.tracer is not None:
+            self.tracer.trace('startend', tag, self.level, current_tag.attrs, status="P")
+
+        self.dispatch_startendtag(current_tag)
 
+    def dispatch_startendtag(self, current_tag: TagData) -> None:
         self.process_startendtag(current_tag)
 
     def process_startendtag(self, tag: TagData) -> None:
         pass
 
     def handle_starttag(self, tag, attrs):
-        super().handle_starttag(tag, attrs)
+        if self.tag_hierarchy and self.tag_hierarchy[-1].td.tag == "img":
+            logging.warning("Closing tag: img")
+            self.pop_tag()
+            self.level -= 1
 
+        # Tags' names are compared with the rules' ones (and kept in `tag_hierarchy`) - a single copy of each.
+        tag = sys.intern(tag)
         current_tag: TagData = TagData(tag=tag, attrs=self.parse_attrs(attrs))
         status: TagStatus = TagStatus.IGNORED if self.is_ignored_tag(current_tag) else TagStatus.PROCESSED
-        tabs: str = "".join(self.level * ['  '])
-        status_str: str = f"{'I' if status == TagStatus.IGNORED else 'P'}{'+R' if self.is_ignored_in_hierarchy() else ''}"
-        logging.debug(f"{tabs}{tag} <{status_str}> {attrs}")
+        if self.tracer is not None:
+            status_str: str = f"{'I' if status == TagStatus.IGNORED else 'P'}{'+R' if self.is_ignored_in_hierarchy() else ''}"
+            self.tracer.trace('start', tag, self.level, current_tag.attrs, status=status_str)
+
         level = self.tag_hierarchy[-1].level + 1 if self.tag_hierarchy else 0
         self.tag_no += 1
-        self.tag_hierarchy.append(TagEntry(td=current_tag,
-                                           status=status,
-                                           tag_no=self.tag_no,
-                                           level=level
-                                           ))
+        self.push_tag(TagEntry(td=current_tag,
+                               status=status,
+                               tag_no=self.tag_no,
+                               level=level
+                               ))
         self.level += 1
 
+        self.dispatch_starttag(current_tag)
+
+    def dispatch_starttag(self, current_tag: TagData) -> None:
+        """Called once the tag has been pushed onto `tag_hierarchy`."""
         if self.is_ignored_in_hierarchy():
             return
 
@@ -111,77 +328,74 @@ class BasicHTMLParser(HTMLParser, ABC):
         pass
 
     def handle_endtag(self, tag):
-        if not (self.stop_processing or self.is_ignored_in_hierarchy()):
-            self.process_endtag()
+        if not self.tag_hierarchy:
+            # A stray end tag.
+            return
+
+        self.dispatch_endtag(tag)
 
         self.level -= 1
-        tabs: str = "".join(self.level * ['  '])
-        logging.debug(f"{tabs}/{tag} {self.tag_hierarchy[-1].td.attrs}")
-        self.tag_hierarchy.pop()
+        if self.tracer is not None:
+            self.tracer.trace('end', tag, self.level, self.tag_hierarchy[-1].td.attrs)
+        self.pop_tag()
+
+    def dispatch_endtag(self, tag: str) -> None:
+        """Called before the tag is popped from `tag_hierarchy`."""
+        if not (self.stop_processing or self.is_ignored_in_hierarchy()):
+            self.process_endtag()
 
     def process_endtag(self):
         pass
 
     def handle_data(self, data):
-        super().handle_data(data)
         if not self.tag_hierarchy:
             return
-        self.tag_hierarchy[-1].td.data = data
+        last_tag = self.tag_hierarchy[-1].td
+        last_tag.data = data
+
+        self.dispatch_data(last_tag)
 
+    def dispatch_data(self, last_tag: TagData) -> None:
         self.process_data()
 
     def process_data(self):
         pass
 
+    @classmethod
+    @cache
+    def get_class_ignored_tags_matcher(cls) -> TagMatcher:
+        return TagMatcher(cls.get_tags_to_ignore())
+
+    @classmethod
+    @cache
+    def get_class_validated_tags_matcher(cls) -> TagMatcher:
+        return TagMatcher(cls.get_tags_to_ignore() + cls.get_tags_with_suppressed_validation())
+
+    @cached_property
+    def ignored_tags_matcher(self) -> TagMatcher:
+        if instance_tags := self.get_instance_tags_to_ignore():
+            return TagMatcher(self.get_tags_to_ignore() + instance_tags)
+        return self.get_class_ignored_tags_matcher()
+
+    @cached_property
+    def validated_tags_matcher(self) -> TagMatcher:
+        """Tags which are either ignored or have their validation suppressed."""
+        instance_tags = self.get_instance_tags_to_ignore() + self.get_instance_tags_with_suppressed_validation()
+        if instance_tags:
+            return TagMatcher(self.get_tags_to_ignore() + self.get_tags_with_suppressed_validation() + instance_tags)
+        return self.get_class_validated_tags_matcher()
+
     def check_ignored_tag(self, last_tag: TagData, data: str) -> None:
-        if self.is_tag_match(last_tag, self.get_tags_to_ignore() + self.get_tags_with_suppressed_validation()):
+        if self.validated_tags_matcher.matches(last_tag):
             return
         raise ValueError(f"Unknown tag: {last_tag.tag} {last_tag.attrs} D=`{data}`")
 
     @staticmethod
     def is_tag_match(td: TagData, td_list: List[TagData]) -> bool:
-        for ignored_tag_data in td_list:
-            is_same_tag: bool = (td.tag == ignored_tag_data.tag)
-            if not is_same_tag:
-                continue
-
-            has_same_attrs: bool = True
-            if ignored_tag_data.attrs is None:
-                has_same_attrs = not td.attrs
-            else:
-                for attr, val in ignored_tag_data.attrs.items():
-                    if attr not in td.attrs:
-                        has_same_attrs = False
-                        break
-
-                    def verify_chunk(v: Union[str, Pattern], td: TagData) -> bool:
-                        v_target = td.attrs[attr]
-                        if isinstance(v, str):
-                            return v in v_target
-                        elif isinstance(v, Pattern):
-                            return v.search(v_target) is not None
-                        else:
-                            raise TypeError(f"type(v): {type(v)}")
-
-                    if isinstance(val, str) or isinstance(val, Pattern):
-                        has_same_attrs = has_same_attrs and verify_chunk(val, td)
-                    elif isinstance(val, set):
-                        has_same_attrs = has_same_attrs and all(verify_chunk(v, td) for v in val)
-                    else:
-                        raise ValueError(f'Invalid attr value: {attr} -> {val}')
-            if is_same_tag and has_same_attrs:
-                return True
-        return False
+        return TagMatcher(td_list).matches(td)
 
     def is_ignored_tag(self, td: TagData = None) -> bool:
-        return self.is_tag_match(td, self.get_tags_to_ignore())
+        return self.ignored_tags_matcher.matches(td)
 
     def is_ignored_in_hierarchy(self) -> bool:
-        return any(te.status == TagStatus.IGNORED for te in self.tag_hierarchy)
-
-    def feed(self, data: str) -> None:
-        super().feed(data)
-        self.postprocess_metadata()
-
-    def postprocess_metadata(self) -> None:
-        pass
+        return self.ignored_ancestors > 0
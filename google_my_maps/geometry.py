@@ -0,0 +1,163 @@
+"""Geometry of the placemarks: simplification of lines (e.g., routes exported from Google Maps directions) with
+a tolerance in metres and a spatial index of points (e.g., for finding duplicates).
+"""
+from array import array
+from collections import defaultdict
+from math import asin, ceil, cos, floor, pi, radians, sin, sqrt
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from google_my_maps.kml_types import Coordinate, Coordinates, Document, Point
+
+earth_radius: float = 6371008.8
+"Mean radius of the Earth (in metres)."
+
+metres_per_degree: float = earth_radius * pi / 180
+"Length of a degree of latitude (in metres)."
+
+route_tolerance: float = 5.0
+"Tolerance (in metres) of the simplification of route directions' lines."
+
+duplicate_distance: float = 50.0
+"Points closer (in metres) than this are reported as possible duplicates."
+
+
+def project(coordinates: Coordinates) -> Tuple[List[float], List[float]]:
+    """The points (longitude, latitude) in metres, projected with an equirectangular projection centred on the line.
+
+    The distortion is negligible for the extent of a route (and a tolerance of a few metres).
+    """
+    ys = coordinates.ys
+    kx = metres_per_degree * cos(radians((min(ys) + max(ys)) / 2))
+    return [x * kx for x in coordinates.xs], [y * metres_per_degree for y in ys]
+
+
+def simplify_line(coordinates: Coordinates, tolerance: float) -> Coordinates:
+    """The line simplified with the Ramer-Douglas-Peucker algorithm.
+
+    A point is kept if it is farther than `tolerance` (in metres) from the segment approximating its part of the line.
+    The endpoints are always kept.
+    """
+    n = len(coordinates)
+    if n < 3 or tolerance <= 0:
+        return coordinates
+
+    xs, ys = project(coordinates)
+    keep = bytearray(n)
+    keep[0] = keep[-1] = 1
+    tolerance_sq = tolerance * tolerance
+
+    # Iterative (instead of recursive), since a line can have tens of thousands of points.
+    stack: List[Tuple[int, int]] = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        ax, ay = xs[first], ys[first]
+        dx, dy = xs[last] - ax, ys[last] - ay
+        segment_sq = dx * dx + dy * dy
+
+        farthest, farthest_sq = -1, tolerance_sq
+        for i in range(first + 1, last):
+            px, py = xs[i] - ax, ys[i] - ay
+            if segment_sq:
+                # The distance to the segment (not to the line), as routes can turn back.
+                t = min(max((px * dx + py * dy) / segment_sq, 0.0), 1.0)
+                px, py = px - t * dx, py - t * dy
+            if (distance_sq := px * px + py * py) > farthest_sq:
+                farthest, farthest_sq = i, distance_sq
+
+        if farthest >= 0:
+            keep[farthest] = 1
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+
+    values = coordinates.values
+    kept = array('d')
+    for i in (i for i, k in enumerate(keep) if k):
+        kept.extend(values[3 * i:3 * i + 3])
+    return Coordinates(kept)
+
+
+def get_distance(a: Coordinate, b: Coordinate) -> float:
+    """Great-circle distance (in metres) between the points (longitude, latitude), by the haversine formula."""
+    lat_a, lat_b = radians(a.y), radians(b.y)
+    h = sin((lat_b - lat_a) / 2) ** 2 + cos(lat_a) * cos(lat_b) * sin(radians(b.x - a.x) / 2) ** 2
+    return 2 * earth_radius * asin(min(1.0, sqrt(h)))
+
+
+class PointIndex:
+    """Spatial index of `Point` placemarks: a grid of cells spanning `cell_size` metres of latitude (and about the same
+    number of degrees of longitude), so that a query only checks the points in the cells around its circle.
+    """
+
+    def __init__(self, cell_size: float = duplicate_distance):
+        self.cell_degrees: float = cell_size / metres_per_degree
+        self.columns: int = ceil(360 / self.cell_degrees)
+        "Number of cells along a parallel (the column index wraps around the antimeridian)."
+        self.column_degrees: float = 360 / self.columns
+        self.cells: Dict[Tuple[int, int], List[Tuple[Coordinate, Point]]] = defaultdict(list)
+        self.size: int = 0
+
+    @classmethod
+    def from_document(cls, document: Document, cell_size: float = duplicate_distance) -> 'PointIndex':
+        index = cls(cell_size)
+        index.add_all(placemark for folder in document.folders.values() for placemark in folder.placemarks
+                      if isinstance(placemark, Point))
+        return index
+
+    def __len__(self) -> int:
+        return self.size
+
+    def get_row(self, lat: float) -> int:
+        return floor(lat / self.cell_degrees)
+
+    def get_column(self, lon: float) -> int:
+        return floor((lon + 180) / self.column_degrees) % self.columns
+
+    def add(self, point: Point) -> None:
+        coordinate = point.coordinates[0]
+        self.cells[self.get_row(coordinate.y), self.get_column(coordinate.x)].append((coordinate, point))
+        self.size += 1
+
+    def add_all(self, points: Iterable[Point]) -> None:
+        for point in points:
+            self.add(point)
+
+    def get_candidates(self, coordinate: Coordinate, radius: float) -> Iterable[Tuple[Coordinate, Point]]:
+        """The points in the cells overlapping the circle's bounding box."""
+        lat_radius = radius / metres_per_degree
+        lon_radius = radius / (metres_per_degree * max(cos(radians(coordinate.y)), 1e-9))
+        rows = range(self.get_row(coordinate.y - lat_radius), self.get_row(coordinate.y + lat_radius) + 1)
+        first_column = floor((coordinate.x - lon_radius + 180) / self.column_degrees)
+        last_column = floor((coordinate.x + lon_radius + 180) / self.column_degrees)
+
+        if len(rows) * min(last_column - first_column + 1, self.columns) > len(self.cells):
+            # Fewer occupied cells than the ones to check (e.g., a large radius).
+            return (entry for entries in self.cells.values() for entry in entries)
+
+        columns = (range(self.columns) if last_column - first_column + 1 >= self.columns
+                   else [c % self.columns for c in range(first_column, last_column + 1)])
+        cells = self.cells
+        return (entry for row in rows for column in columns if (row, column) in cells
+                for entry in cells[row, column])
+
+    def within(self, coordinate: Coordinate, radius: float) -> List[Tuple[float, Point]]:
+        """The points within the radius (in metres) with their distances, the nearest first."""
+        found = [(distance, point) for c, point in self.get_candidates(coordinate, radius)
+                 if (distance := get_distance(coordinate, c)) <= radius]
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def nearest(self, coordinate: Coordinate, max_distance: Optional[float] = None) -> Optional[Tuple[float, Point]]:
+        """The nearest point with its distance (`None` if there is none within `max_distance` metres)."""
+        if not self.size:
+            return None
+        radius = self.cell_degrees * metres_per_degree
+        while True:
+            if max_distance is not None and radius >= max_distance:
+                found = self.within(coordinate, max_distance)
+                return found[0] if found else None
+            # A point found within the radius is the nearest one (the search area is a circle, not the cells).
+            if found := self.within(coordinate, radius):
+                return found[0]
+            if radius > pi * earth_radius:
+                return None
+            radius *= 2
@@ -6,6 +6,7 @@
 # *) After uploading the new map to Google MyMaps, ALWAYS check whether the result has correct image URLs.
 
 from pathlib import Path
+from typing import Optional
 
 from lxml import etree
 
@@ -14,8 +15,9 @@ from google_my_maps.my_parser import MyParser
 from google_my_maps.merger import verify_and_fix_map, merge_maps, refactor_map
 
 
-def export_document(document: Document, output_path: Path) -> None:
-    parser = MyParser()
+def export_document(document: Document, output_path: Path, line_tolerance: Optional[float] = None) -> None:
+    """Save the document (with its lines simplified with the tolerance in metres, unless `line_tolerance` is `None`)."""
+    parser = MyParser(line_tolerance=line_tolerance)
     kml = parser.save_kml(document)
 
     et = etree.ElementTree(kml)
@@ -1,7 +1,8 @@
 import re
+from array import array
 from dataclasses import dataclass, field
 from enum import auto, Enum, StrEnum
-from typing import List, Optional, TypeVar, Dict
+from typing import List, Optional, TypeVar, Dict, Iterable, Iterator, overload
 import lxml.etree
 from lxml.etree import CDATA
 
@@ -117,6 +118,73 @@ class Coordinate:
 MAX_COORDINATE_DIGITS: int = 6
 
 
+class Coordinates:
+    """Coordinates of a placemark's points, stored in a flat `array('d')`: `x0, y0, z0, x1, y1, z1, ...`.
+
+    Routes can have tens of thousands of points, so no `Coordinate` objects are kept; they are created only when
+    a single point is accessed (indexing, iterating). Slicing selects points and returns `Coordinates`.
+    """
+    __slots__ = ('values',)
+
+    def __init__(self, values: Iterable[float] = ()):
+        self.values: array = values if isinstance(values, array) and values.typecode == 'd' else array('d', values)
+        if len(self.values) % 3:
+            raise ValueError(f"The number of values ({len(self.values)}) is not a multiple of 3")
+
+    @classmethod
+    def from_points(cls, points: Iterable[Coordinate]) -> 'Coordinates':
+        values = array('d')
+        for point in points:
+            values.extend((point.x, point.y, point.z))
+        return cls(values)
+
+    @property
+    def xs(self) -> array:
+        return self.values[0::3]
+
+    @property
+    def ys(self) -> array:
+        return self.values[1::3]
+
+    @property
+    def zs(self) -> array:
+        return self.values[2::3]
+
+    def __len__(self) -> int:
+        return len(self.values) // 3
+
+    @overload
+    def __getitem__(self, index: int) -> Coordinate: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'Coordinates': ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            xs, ys, zs = self.xs[index], self.ys[index], self.zs[index]
+            values = array('d', bytes(3 * len(xs) * xs.itemsize))
+            values[0::3], values[1::3], values[2::3] = xs, ys, zs
+            return Coordinates(values)
+        i = range(len(self))[index] * 3
+        return Coordinate(*self.values[i:i + 3])
+
+    def __iter__(self) -> Iterator[Coordinate]:
+        values = iter(self.values)
+        return (Coordinate(x, y, z) for x, y, z in zip(values, values, values))
+
+    def __eq__(self, other):
+        if isinstance(other, Coordinates):
+            return self.values == other.values
+        if isinstance(other, list):
+            return len(self) == len(other) and all(c == o for c, o in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)})"
+
+
 @dataclass
 class Data:
     gx_media_links: Text
@@ -141,10 +209,15 @@ class Placemark:
     name: Text
     style: Optional[Style]
     stylemap: Optional[StyleMap]
-    coordinates: List[Coordinate]
+    coordinates: Coordinates
+    "A list of `Coordinate`s is converted to `Coordinates`."
     description: Optional[Text] = None
     extended_data: Optional[ExtendedData] = None
 
+    def __post_init__(self):
+        if not isinstance(self.coordinates, Coordinates):
+            self.coordinates = Coordinates.from_points(self.coordinates)
+
     @property
     def style_id(self) -> str:
         return self.stylemap.id_ if self.stylemap is not None else self.style.id_
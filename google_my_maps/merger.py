@@ -4,6 +4,7 @@ from typing import List, Dict, Set, Optional, Final
 
 from google_my_maps.kml_types import Document, Point, Folder, Line, Placemark, Style, Text, StyleId, StyleTypes, \
     LineStyle, BalloonStyle, StyleMap, get_stylemap_id_line, get_style_id_line
+from google_my_maps.geometry import route_tolerance, simplify_line, duplicate_distance, PointIndex
 from google_my_maps.my_parser import MyParser, create_placemark_style_id, \
     Folders
 from google_my_maps.marking import StatusColors, Icons, line_width_normal
@@ -61,7 +62,13 @@ def add_predefined_line_styles(map: Document) -> None:
             map.styles_ordering.append(stylemap_id)
 
 
-def verify_and_fix_map(map: Document) -> None:
+def verify_and_fix_map(map: Document, tolerance: float = route_tolerance) -> None:
+    """
+    Verify the placemarks' styles and fix the route directions.
+
+    :param map: The document processed.
+    :param tolerance: Tolerance (in metres) of the simplification of route directions' lines.
+    """
     print(f"[START] Fixing and verifying : \"{map.name}\" ...")
 
     add_predefined_line_styles(map)
@@ -75,7 +82,7 @@ def verify_and_fix_map(map: Document) -> None:
             if is_route_directions(folder):
                 print(f"Fixing route directions: {folder_name}")
                 line = folder.placemarks[0]
-                line.coordinates = line.coordinates[::2]  # Reduce the number of nodes.
+                line.coordinates = simplify_line(line.coordinates, tolerance)  # Reduce the number of nodes.
                 folder.placemarks = [line]  # Remove all waypoints; retain only the line.
                 day_no = int(m.group('day_no'))
                 line.style = None
@@ -300,12 +307,21 @@ def merge_maps(root_map_path: Path, added_maps_paths: List[Path]) -> Document:
         verify_and_fix_map(doc)
         refactor_map(doc)
 
+    # Points of the merged map (the added ones included), for finding duplicates.
+    point_index = PointIndex.from_document(root_doc)
+
     item: Document
     for item in added_docs:
         folder: Folder
         for folder_name, folder in item.folders.items():
             placemark: Placemark
             for placemark in folder.placemarks:
+                if isinstance(placemark, Point):
+                    if found := point_index.nearest(placemark.coordinates[0], max_distance=duplicate_distance):
+                        distance, point = found
+                        print(f"{get_placemark_id(folder=folder, placemark=placemark)} : Possible duplicate of "
+                              f"`{str(point.name).strip()}` ({distance:.0f} m)")
+                    point_index.add(placemark)
                 if placemark.status in [
                     StatusColors.VISITED_P_ONLY,
                     StatusColors.VISITED_A_ONLY,
@@ -1,7 +1,10 @@
 import re
+from array import array
 from enum import Enum, auto, StrEnum
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import List, Dict, Optional, Type, Set
+from typing import List, Dict, Optional, Type, Set, ClassVar, Tuple
 
 import lxml.etree
 from lxml import etree
@@ -9,7 +12,8 @@ from lxml import etree
 from lxml.etree import CDATA
 
 from google_my_maps.kml_types import Document, Style, IconStyle, Icon, LabelStyle, BalloonStyle, StyleMap, LineStyle, \
-    Coordinate, Point, Line, Folder, PlacemarkType, Data, ExtendedData, HotSpot, Text, MAX_COORDINATE_DIGITS
+    Coordinates, Point, Line, Folder, PlacemarkType, Data, ExtendedData, HotSpot, Text, MAX_COORDINATE_DIGITS
+from google_my_maps.geometry import simplify_line
 from google_my_maps.marking import StatusColors, Icons
 
 
@@ -53,21 +57,64 @@ NodeType: Type = {
 }[xml_engine]
 
 
+kml_namespace: str = "http://www.opengis.net/kml/2.2"
+
+trailing_zero_pattern: re.Pattern = re.compile(r"\.0(?=,|\s|$)")
+"Matches `.0` ending a formatted number (within formatted coordinates)."
+
+
+def get_namespace(tag: str) -> str:
+    """The namespace URI of the tag's name (`{uri}name` -> `uri`; empty if the name has no namespace)."""
+    return tag[1:].partition('}')[0] if tag[:1] == '{' else ""
+
+
+class KmlTags:
+    """Qualified names (`{namespace}name`) of the KML elements and the `find()` paths built of them.
+
+    The elements are matched by their qualified names, so the namespace never has to be removed from the parsed tree.
+    """
+
+    names: ClassVar[Tuple[str, ...]] = (
+        'kml', 'Document', 'Folder', 'name', 'description',
+        'Style', 'IconStyle', 'hotSpot', 'color', 'scale', 'Icon', 'href', 'LineStyle', 'width', 'LabelStyle',
+        'BalloonStyle', 'text', 'StyleMap', 'Pair', 'key', 'styleUrl',
+        'Placemark', 'Point', 'LineString', 'tessellate', 'coordinates', 'ExtendedData', 'Data', 'value',
+    )
+
+    def __init__(self, namespace: str = ""):
+        self.namespace: str = namespace
+        prefix = f"{{{namespace}}}" if namespace else ""
+        for name in self.names:
+            setattr(self, name, prefix + name)
+        self.icon_href: str = f"{self.Icon}/{self.href}"
+        self.any_value: str = f".//{self.value}"
+
+    @staticmethod
+    @lru_cache
+    def get(namespace: str) -> 'KmlTags':
+        return KmlTags(namespace)
+
+
 class MyParser:
     INDENT: str = " " * 2
 
-    def __init__(self):
+    def __init__(self, namespace: str = "", line_tolerance: Optional[float] = None):
         self.styles: Dict[str, Style] = {}
         self.style_maps: Dict[str, StyleMap] = {}
+        self.tags: KmlTags = KmlTags.get(namespace)
+        "Names of the parsed elements (set to the namespace of the parsed file by `parse_kml()`)."
+        self.line_tolerance: Optional[float] = line_tolerance
+        "Tolerance (in metres) of the simplification of the lines saved by `save_kml()` (none if `None`)."
 
     def parse_style(self, node: NodeType) -> Style:
+        t = self.tags
         style: Style = Style(id_=node.attrib['id'])
         for child in node:
             match tag := child.tag:
                 # FIXME: Check for other elements in children (other than handled below).
-                case 'IconStyle':
+                case t.IconStyle:
                     hot_spot: Optional[HotSpot] = None
-                    if (hs := child.find('hotSpot')) is not None:
+                    if (hs := child.find(t.hotSpot)) is not None:
                         hot_spot = HotSpot(x=int(hs.attrib['x']),
                                            xunits=hs.attrib['xunits'],
                                            y=int(hs.attrib['y']),
@@ -75,22 +122,22 @@ class MyParser:
                                            )
 
                     style.icon_style = IconStyle(
-                        color=child.find('color').text,
-                        scale=float(child.find('scale').text),
-                        icon=Icon(href=child.find('Icon/href').text),
+                        color=child.find(t.color).text,
+                        scale=float(child.find(t.scale).text),
+                        icon=Icon(href=child.find(t.icon_href).text),
                         hotSpot=hot_spot,
                     )
-                case 'LineStyle':
+                case t.LineStyle:
                     style.line_style = LineStyle(
-                        color=child.find('color').text,
-                        width=float(child.find('width').text),
+                        color=child.find(t.color).text,
+                        width=float(child.find(t.width).text),
                     )
-                case 'LabelStyle':
+                case t.LabelStyle:
                     style.label_style = LabelStyle(
-                        scale=float(child.find('scale').text),
+                        scale=float(child.find(t.scale).text),
                     )
-                case 'BalloonStyle':
-                    text = child.find('text').text
+                case t.BalloonStyle:
+                    text = child.find(t.text).text
                     style.balloon_style = BalloonStyle(
                         text=Text(text)
                     )
@@ -114,13 +161,14 @@ class MyParser:
     #     return text
 
     def parse_stylemap(self, node: NodeType) -> StyleMap:
+        t = self.tags
         normal: Optional[Style] = None
         highlight: Optional[Style] = None
 
         for child in node:
             # FIXME: Check for other elements in children (other than handled below).
-            style = self.styles[child.find('styleUrl').text[1:]]
-            match (key := child.find('key').text):
+            style = self.styles[child.find(t.styleUrl).text[1:]]
+            match (key := child.find(t.key).text):
                 case 'normal':
                     normal = style
                 case 'highlight':
@@ -135,26 +183,27 @@ class MyParser:
         )
 
     def parse_placemark(self, node: NodeType) -> PlacemarkType:
+        t = self.tags
         kwargs = {}
         class_: Optional[Type] = None
 
-        def parse_coordinates(crd_node: NodeType) -> List[Coordinate]:
-            coordinates: List[Coordinate] = []
-            text = crd_node.text.strip()
-            for coord_txt in text.split("\n"):
-                coords = [float(c) for c in coord_txt.split(',')]
-                coordinates.append(Coordinate(*coords))
-            return coordinates
+        def parse_coordinates(crd_node: NodeType) -> Coordinates:
+            # Points are separated by whitespace, their components by commas.
+            points = crd_node.text.split()
+            values = ",".join(points).split(',')
+            if len(values) != 3 * len(points):
+                raise ValueError(f"Expected `x,y,z` coordinates: {crd_node.text.strip()[:100]}")
+            return Coordinates(array('d', map(float, values)))
 
         for child in node:
             match tag := child.tag:
                 # FIXME: Check for other elements in children (other than handled below).
-                case 'name':
+                case t.name:
                     kwargs['name'] = Text(child.text)
-                case 'description':
+                case t.description:
                     kwargs['description'] = Text(child.text)
                     x = 1
-                case 'styleUrl':
+                case t.styleUrl:
                     style_id = child.text[1:]
                     if 'labelson' in style_id:
                         kwargs['style'] = self.styles[style_id]
@@ -162,16 +211,16 @@ class MyParser:
                     else:
                         kwargs['style'] = None
                         kwargs['stylemap'] = self.style_maps[style_id]
-                case 'Point':
+                case t.Point:
                     class_ = Point
-                    kwargs['coordinates'] = parse_coordinates(child.find('coordinates'))
-                case 'LineString':
+                    kwargs['coordinates'] = parse_coordinates(child.find(t.coordinates))
+                case t.LineString:
                     class_ = Line
-                    kwargs['tessellate'] = bool(child.find('tessellate').text)
-                    kwargs['coordinates'] = parse_coordinates(child.find('coordinates'))
-                case 'ExtendedData':
+                    kwargs['tessellate'] = bool(child.find(t.tessellate).text)
+                    kwargs['coordinates'] = parse_coordinates(child.find(t.coordinates))
+                case t.ExtendedData:
                     kwargs['extended_data'] = ExtendedData(
-                        data=Data(gx_media_links=Text(child.find('.//value').text)),
+                        data=Data(gx_media_links=Text(child.find(t.any_value).text)),
                     )
                     #         <ExtendedData>
                     #           <Data name="gx_media_links">
@@ -184,13 +233,14 @@ class MyParser:
         return class_(**kwargs)
 
     def parse_folder(self, node: NodeType) -> Folder:
-        folder: Folder = Folder(name=node.find('name').text)
+        t = self.tags
+        folder: Folder = Folder(name=node.find(t.name).text)
 
         for child in node:
             match (tag := child.tag):
-                case 'name':
+                case t.name:
                     pass
-                case 'Placemark':
+                case t.Placemark:
                     folder.placemarks.append(self.parse_placemark(child))
                 case _:
                     raise NotImplementedError(tag)
@@ -198,64 +248,112 @@ class MyParser:
         return folder
 
     def parse_document(self, node: NodeType) -> Document:
-        document: Document = Document(name=node.find('name').text)
+        t = self.tags
+        document: Document = Document(name=node.find(t.name).text)
 
         for child in node:
             match (tag := child.tag):
-                case 'name':
+                case t.name:
                     pass
-                case 'description':
+                case t.description:
                     document.description = Text(child.text)
-                case 'Style':
+                case t.Style:
                     style = self.parse_style(child)
                     self.styles[style.id_] = style
                     document.add_style(style)
-                case 'StyleMap':
+                case t.StyleMap:
                     stylemap = self.parse_stylemap(child)
                     self.style_maps[stylemap.id_] = stylemap
                     document.add_stylemap(stylemap)
-                case 'Folder':
+                case t.Folder:
                     document.add_folder(self.parse_folder(child))
                 case _:
                     raise NotImplementedError(tag)
 
         return document
 
-    def parse_kml(self, filepath: Path) -> Document:
+    def iterparse_kml(self, filepath: Path) -> Document:
+        """Parse the file as it is read: each `Style`, `StyleMap` and `Placemark` is built once its end tag arrives
+        and is then removed from the tree, so the memory needed for the XML doesn't grow with the map's size.
+        """
+        t = self.tags
+        document: Optional[Document] = None
+        folder: Optional[Folder] = None
+        ancestors: List[NodeType] = []
+
+        for event, elem in ET.iterparse(str(filepath), events=('start', 'end')):
+            tag = elem.tag
+            if event == 'start':
+                if not ancestors:
+                    t = self.tags = KmlTags.get(get_namespace(tag))
+                # The names are filled in once their elements are parsed.
+                if tag == t.Document:
+                    document = Document(name=None)
+                elif tag == t.Folder and ancestors and ancestors[-1].tag == t.Document:
+                    folder = Folder(name=None)
+                ancestors.append(elem)
+                continue
+
+            ancestors.pop()
+            parent_tag = ancestors[-1].tag if ancestors else None
+            if parent_tag == t.Document:
+                match tag:
+                    case t.name:
+                        document.name = elem.text
+                    case t.description:
+                        document.description = Text(elem.text)
+                    case t.Style:
+                        style = self.parse_style(elem)
+                        self.styles[style.id_] = style
+                        document.add_style(style)
+                    case t.StyleMap:
+                        stylemap = self.parse_stylemap(elem)
+                        self.style_maps[stylemap.id_] = stylemap
+                        document.add_stylemap(stylemap)
+                    case t.Folder:
+                        if folder.name is None:
+                            raise ValueError("<Folder> without <name>")
+                        document.add_folder(folder)
+                        folder = None
+                    case _:
+                        raise NotImplementedError(tag)
+            elif parent_tag == t.Folder:
+                match tag:
+                    case t.name:
+                        folder.name = elem.text
+                    case t.Placemark:
+                        folder.placemarks.append(self.parse_placemark(elem))
+                    case _:
+                        raise NotImplementedError(tag)
+            else:
+                # Descendants of the elements above (parsed along with them) or the document itself.
+                continue
+
+            ancestors[-1].remove(elem)
+
+        if document is None or document.name is None:
+            raise ValueError(f"No <Document> (or its <name>) found in {filepath}")
+        return document
+
+    def parse_kml(self, filepath: Path, streaming: bool = True) -> Document:
+        """Parse the KML file (see `iterparse_kml()`; unless `streaming`, the whole tree is loaded first)."""
+        if streaming:
+            return self.iterparse_kml(filepath)
+
         if xml_engine == XmlEngine.LXML:
             # parser = etree.XMLParser(strip_cdata=False)
 
             tree = etree.parse(filepath)
             root = tree.getroot()
             # root = etree.XML('<root><![CDATA[test]]></root>', parser)
-
-            for elem in root.getiterator():
-                # Skip comments and processing instructions,
-                # because they do not have names
-                if not (
-                        isinstance(elem, etree._Comment)
-                        or isinstance(elem, etree._ProcessingInstruction)
-                ):
-                    # Remove a namespace URI in the element's name
-                    elem.tag = lxml.etree.QName(elem).localname
-
-            ns = root.nsmap[None]
         elif xml_engine == XmlEngine.XML:
             tree = ET.parse(filepath)
             root = tree.getroot()
-
-            uri_pattern = re.compile(r"\{http://.*?}")
-
-            def remove_uri_from_tags(node: NodeType):
-                node.tag = uri_pattern.sub("", node.tag)
-                for elem in node:
-                    remove_uri_from_tags(elem)
-
-            remove_uri_from_tags(root)
         else:
             raise NotImplementedError(f"The given engine ({xml_engine}) is not (yet?) supported.")
 
-        return self.parse_document(root.find('Document'))
+        self.tags = KmlTags.get(get_namespace(root.tag))
+        return self.parse_document(root.find(self.tags.Document))
 
         # >>> print(tree.docinfo.xml_version)
         # >>> print(tree.docinfo.doctype)
@@ -264,10 +362,17 @@ class MyParser:
     def float_to_str(f: float) -> str:
         return re.sub(r"\.0$", "", str(f))
 
+    @staticmethod
+    def coordinates_to_str(coordinates: Coordinates, separator: str) -> str:
+        """The points as `x,y,z` (rounded, formatted as by `float_to_str()`) joined with the (whitespace) separator."""
+        values = map(str, map(round, coordinates.values, repeat(MAX_COORDINATE_DIGITS, len(coordinates.values))))
+        points = separator.join(map(",".join, zip(values, values, values)))
+        return trailing_zero_pattern.sub("", points)
+
     def save_kml(self, document: Document, level: int = 1) -> etree.Element:
 
         kml = etree.Element('kml')
-        kml.set('xmlns', "http://www.opengis.net/kml/2.2")
+        kml.set('xmlns', kml_namespace)
 
         document_elem = etree.SubElement(kml, 'Document')
         document_name = etree.SubElement(document_elem, 'name')
@@ -349,12 +454,12 @@ class MyParser:
             coordinates_elem = etree.SubElement(placemark_class_elem, 'coordinates')
             level += 1
 
-            def coord_as_str(coord: float) -> str:
-                return self.float_to_str(round(coord, MAX_COORDINATE_DIGITS))
-
-            coordinates_elem.text = "\n" + "\n".join(
-                f"{self.INDENT * level}{coord_as_str(c.x)},{coord_as_str(c.y)},{coord_as_str(c.z)}"
-                for c in placemark.coordinates) + "\n" + self.INDENT * (level - 1)
+            coordinates = placemark.coordinates
+            if isinstance(placemark, Line) and self.line_tolerance is not None:
+                coordinates = simplify_line(coordinates, self.line_tolerance)
+            coordinates_elem.text = (f"\n{self.INDENT * level}"
+                                     + self.coordinates_to_str(coordinates, f"\n{self.INDENT * level}")
+                                     + "\n" + self.INDENT * (level - 1))
 
     def save_folder(self, folder: Folder, elem: NodeType, level: int) -> None:
         folder_elem = etree.SubElement(elem, 'Folder')
@@ -4,9 +4,10 @@ from pathlib import Path
 from lxml import etree
 from lxml.etree import CDATA
 
-from google_my_maps.my_parser import MyParser
+from google_my_maps.geometry import simplify_line, PointIndex, get_distance
+from google_my_maps.my_parser import MyParser, kml_namespace
 from google_my_maps.kml_types import Document, Style, IconStyle, Icon, LabelStyle, BalloonStyle, StyleMap, LineStyle, \
-    Folder, Point, Coordinate, Line, Text
+    Folder, Point, Coordinate, Coordinates, Line, Text
 
 
 # class TextMatcher:
@@ -28,6 +29,53 @@ class TestStringMethods(unittest.TestCase):
         self.assertNotEqual(Text(CDATA("<h3>$[name]</h3>")),
                             Text("text"))
 
+    def test_coordinates(self):
+        coordinates = Coordinates([1, 2, 3, 4, 5, 6, 7, 8, 9])
+
+        self.assertEqual(3, len(coordinates))
+        self.assertEqual(Coordinate(4, 5, 6), coordinates[1])
+        self.assertEqual(Coordinate(7, 8, 9), coordinates[-1])
+        self.assertEqual([Coordinate(1, 2, 3), Coordinate(7, 8, 9)], coordinates[::2])
+        self.assertEqual(Coordinates([7, 8, 9, 4, 5, 6]), coordinates[:0:-1])
+        self.assertEqual(Coordinates.from_points(coordinates), coordinates)
+        self.assertEqual("1,2,3\n  4.5,5.123457,6",
+                         MyParser.coordinates_to_str(Coordinates([1, 2, 3, 4.5, 5.12345678, 6.0]), "\n  "))
+
+        with self.assertRaises(ValueError):
+            Coordinates([1, 2])
+
+    def test_simplify_line(self):
+        # Points on a straight line (~11 m apart) with a corner and a 1 m (i.e., within the tolerance) deviation.
+        line = Coordinates.from_points(
+            [Coordinate(20.0, 50.0 + i * 1e-4, 0) for i in range(10)]
+            + [Coordinate(20.0 + i * 1e-4, 50.0009 + (1e-5 if i == 5 else 0), 0) for i in range(1, 10)]
+        )
+
+        self.assertEqual([Coordinate(20.0, 50.0, 0), Coordinate(20.0, 50.0009, 0), Coordinate(20.0009, 50.0009, 0)],
+                         simplify_line(line, tolerance=5))
+        self.assertIn(Coordinate(20.0 + 5 * 1e-4, 50.0009 + 1e-5, 0), simplify_line(line, tolerance=0.5))
+        self.assertEqual(line, simplify_line(line, tolerance=0))
+        self.assertEqual(line[:2], simplify_line(line[:2], tolerance=5))
+
+    def test_point_index(self):
+        def point(name: str, x: float, y: float) -> Point:
+            return Point(name=Text(name), style=None, stylemap=None, coordinates=[Coordinate(x, y, 0)])
+
+        # ~11 m and ~111 m north of the first point, and points on both sides of the antimeridian.
+        points = [point("A", 20.0, 50.0), point("B", 20.0, 50.0001), point("C", 20.0, 50.001),
+                  point("D", 179.9999, 0.0), point("E", -179.9999, 0.0)]
+        index = PointIndex(cell_size=50)
+        index.add_all(points)
+
+        self.assertEqual(5, len(index))
+        self.assertAlmostEqual(11.1, get_distance(points[0].coordinates[0], points[1].coordinates[0]), places=1)
+        self.assertEqual([points[0], points[1]], [p for _, p in index.within(Coordinate(20.0, 50.0, 0), 50)])
+        self.assertEqual(points[1], index.nearest(Coordinate(20.0, 50.0002, 0))[1])
+        self.assertEqual(points[2], index.nearest(Coordinate(20.0, 50.01, 0))[1])
+        self.assertIsNone(index.nearest(Coordinate(20.0, 50.01, 0), max_distance=100))
+        self.assertEqual([points[4], points[3]], [p for _, p in index.within(Coordinate(-179.99995, 0.0, 0), 50)])
+        self.assertIsNone(PointIndex().nearest(Coordinate(20.0, 50.0, 0)))
+
     def test_parse_style(self):
         parser = MyParser()
         xml = """
@@ -133,6 +181,43 @@ class TestStringMethods(unittest.TestCase):
 
         self.assertEqual(expected_output, parser.parse_placemark(node))
 
+    def test_parse_placemark_namespaced(self):
+        stylemap1 = StyleMap(id_="sm1", normal=Style(id_="s1"), highlight=Style(id_="s2"))
+
+        parser = MyParser(namespace=kml_namespace)
+        parser.style_maps = {
+            stylemap1.id_: stylemap1,
+        }
+
+        xml = f"""
+      <Placemark xmlns="{kml_namespace}">
+        <name>Point 1</name>
+        <styleUrl>#{stylemap1.id_}</styleUrl>
+        <Point>
+          <coordinates>
+            1,2,3
+          </coordinates>
+        </Point>
+      </Placemark>
+        """
+        node = etree.fromstring(xml)
+
+        expected_output = Point(
+            name=Text("Point 1"),
+            style=None,
+            stylemap=stylemap1,
+            coordinates=[
+                Coordinate(1, 2, 3)
+            ],
+        )
+
+        self.assertEqual(expected_output, parser.parse_placemark(node))
+        # The tags are matched with their namespace, the tree is left intact.
+        self.assertEqual(f"{{{kml_namespace}}}Point", node[2].tag)
+
+        with self.assertRaises(NotImplementedError):
+            MyParser().parse_placemark(node)
+
     def test_parse_placemark_line(self):
         stylemap1 = StyleMap(id_="sm1", normal=Style(id_="s1"), highlight=Style(id_="s2"))
 
@@ -292,6 +377,17 @@ class TestStringMethods(unittest.TestCase):
         self.assertEqual(expected_document.folders_ordering, parsed_document.folders_ordering)
         self.assertEqual(expected_document.styles_ordering, parsed_document.styles_ordering)
 
+    def test_streaming_parsing(self):
+        streamed_document = MyParser().parse_kml(Path("sample.kml"))
+        loaded_document = MyParser().parse_kml(Path("sample.kml"), streaming=False)
+
+        self.assertEqual(loaded_document.name, streamed_document.name)
+        self.assertEqual(loaded_document.description, streamed_document.description)
+        self.assertEqual(loaded_document.style_maps, streamed_document.style_maps)
+        self.assertEqual(loaded_document.folders, streamed_document.folders)
+        self.assertEqual(loaded_document.folders_ordering, streamed_document.folders_ordering)
+        self.assertEqual(loaded_document.styles_ordering, streamed_document.styles_ordering)
+
 
 if __name__ == '__main__':
     unittest.main()